@@ -1,10 +1,25 @@
 import os
+import sys
+import gzip
 import json
+import functools
+import time
 import logging
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import requests
-from flask import Flask, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 # ---------------------------
 # Config
@@ -12,6 +27,7 @@ from flask import Flask, request, jsonify
 
 MCP_HOST = os.getenv("MCP_HOST", "127.0.0.1")
 MCP_PORT = int(os.getenv("MCP_PORT", "8000"))
+MCP_THREADS = int(os.getenv("MCP_THREADS", "16"))
 
 TODOIST_TOKEN = os.getenv("TODOIST_TOKEN")
 if not TODOIST_TOKEN:
@@ -23,13 +39,52 @@ TODOIST_HEADERS = {
     "Content-Type": "application/json",
 }
 
+TODOIST_POOL_SIZE = int(os.getenv("TODOIST_POOL_SIZE", "32"))
+TODOIST_TIMEOUT = (3.05, 15)
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "16"))
+GET_CACHE_TTL_SECONDS = float(os.getenv("GET_CACHE_TTL_SECONDS", "5"))
+GET_CACHE_MAX_ENTRIES = 256
+
 JSON_SCHEMA_URL = "https://json-schema.org/draft/2020-12/schema"
 
+# ---------------------------
+# JSON codec
+# ---------------------------
+
+def _json_loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _json_dumps_text(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Route jsonify through orjson when it is installed."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 # ---------------------------
 # Flask app & logging
 # ---------------------------
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 log = logging.getLogger("mcp")
 if not log.handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -38,253 +93,441 @@ if not log.handlers:
 # Tool definitions (MCP: inputSchema)
 # ---------------------------
 
-TOOLS = [
-    {
-        "name": "get_active_tasks",
-        "title": "Get Active Tasks",
-        "description": "Retrieve all active tasks, optionally filtered.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Get Active Tasks Parameters",
-            "description": "Parameters for retrieving active tasks.",
-            "properties": {
-                "label": {"type": "string", "description": "Label to filter tasks by."},
-                "filter": {"type": "string", "description": "Custom filter string for tasks."}
-            },
-            "required": []
-        }
-    },
-    {
-        "name": "create_task",
-        "title": "Create Task",
-        "description": "Create a new task or subtask.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Create Task Parameters",
-            "description": "Parameters for creating a new task.",
-            "properties": {
-                "content": {"type": "string", "description": "The content of the task."},
-                "description": {"type": "string", "description": "A detailed description of the task."},
-                "labels": {"type": "array", "items": {"type": "string"}, "description": "Labels to apply to the task."},
-                "priority": {"type": "integer", "description": "Priority 1-4 (4 highest)."},
-                "due_string": {"type": "string", "description": "Human-friendly due date (e.g., 'today', 'next Monday')."},
-                "parent_id": {"type": "string", "description": "Parent task ID if creating a subtask."}
-            },
-            "required": ["content"]
-        }
-    },
-    {
-        "name": "get_task",
-        "title": "Get Task",
-        "description": "Retrieve a single task by ID.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Get Task Parameters",
-            "description": "Parameters for retrieving a single task.",
-            "properties": {"id": {"type": "string", "description": "The ID of the task to retrieve."}},
-            "required": ["id"]
-        }
-    },
-    {
-        "name": "update_task",
-        "title": "Update Task",
-        "description": "Update an existing task.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Update Task Parameters",
-            "description": "Parameters for updating an existing task.",
-            "properties": {
-                "id": {"type": "string", "description": "The ID of the task to update."},
-                "content": {"type": "string", "description": "New content."},
-                "description": {"type": "string", "description": "New detailed description."},
-                "labels": {"type": "array", "items": {"type": "string"}, "description": "New labels."},
-                "priority": {"type": "integer", "description": "New priority 1-4 (4 highest)."},
-                "due_string": {"type": "string", "description": "Human-friendly due date."}
-            },
-            "required": ["id"]
-        }
-    },
-    {
-        "name": "close_task",
-        "title": "Close Task",
-        "description": "Complete a task.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Close Task Parameters",
-            "description": "Parameters for completing a task.",
-            "properties": {"id": {"type": "string", "description": "The ID of the task to close."}},
-            "required": ["id"]
-        }
-    },
-    {
-        "name": "reopen_task",
-        "title": "Reopen Task",
-        "description": "Reopen a completed task.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Reopen Task Parameters",
-            "description": "Parameters for reopening a task.",
-            "properties": {"id": {"type": "string", "description": "The ID of the task to reopen."}},
-            "required": ["id"]
-        }
-    },
-    {
-        "name": "delete_task",
-        "title": "Delete Task",
-        "description": "Delete a task.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Delete Task Parameters",
-            "description": "Parameters for deleting a task.",
-            "properties": {"id": {"type": "string", "description": "The ID of the task to delete."}},
-            "required": ["id"]
-        }
-    },
-    {
-        "name": "get_all_labels",
-        "title": "Get All Labels",
-        "description": "Retrieve all labels.",
-        "inputSchema": {"$schema": JSON_SCHEMA_URL, "type": "object", "title": "Get All Labels Parameters", "description": "Parameters for retrieving all labels.", "properties": {}, "required": []}
-    },
-    {
-        "name": "create_label",
-        "title": "Create Label",
-        "description": "Create a new label.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Create Label Parameters",
-            "description": "Parameters for creating a new label.",
-            "properties": {
-                "name": {"type": "string", "description": "The name of the label."},
-                "order": {"type": "integer", "description": "Sort order in the UI."},
-                "color": {"type": "string", "description": "Label color."},
-                "favorite": {"type": "boolean", "description": "Whether the label is a favorite."}
-            },
-            "required": ["name"]
-        }
-    },
-    {
-        "name": "update_label",
-        "title": "Update Label",
-        "description": "Update an existing label.",
-        "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Update Label Parameters",
-            "description": "Parameters for updating an existing label.",
-            "properties": {
-                "id": {"type": "string", "description": "The ID of the label to update."},
-                "name": {"type": "string", "description": "New name."},
-                "order": {"type": "integer", "description": "New sort order."},
-                "color": {"type": "string", "description": "New color."},
-                "favorite": {"type": "boolean", "description": "Whether the label is a favorite."}
-            },
-            "required": ["id"]
-        }
-    },
-    {
-        "name": "delete_label",
-        "title": "Delete Label",
-        "description": "Delete a label.",
+_BASE_SCHEMA = {"$schema": JSON_SCHEMA_URL, "type": "object"}
+
+def _tool(name: str, title: str, description: str, params_title: str, params_description: str,
+          properties: Dict[str, Any], required: List[str]) -> Dict[str, Any]:
+    # Shared schema keys come from one template; names and property keys are
+    # interned so every repeated occurrence is the same string object.
+    return {
+        "name": sys.intern(name),
+        "title": title,
+        "description": description,
         "inputSchema": {
-            "$schema": JSON_SCHEMA_URL,
-            "type": "object",
-            "title": "Delete Label Parameters",
-            "description": "Parameters for deleting a label.",
-            "properties": {"id": {"type": "string", "description": "The ID of the label to delete."}},
-            "required": ["id"]
-        }
+            **_BASE_SCHEMA,
+            "title": params_title,
+            "description": params_description,
+            "properties": {sys.intern(k): v for k, v in properties.items()},
+            "required": [sys.intern(k) for k in required],
+        },
     }
-]
+
+def _id_property(what: str) -> Dict[str, Any]:
+    return {"id": {"type": "string", "description": f"The ID of the {what}."}}
+
+TOOLS = (
+    _tool(
+        "get_active_tasks", "Get Active Tasks", "Retrieve all active tasks, optionally filtered.",
+        "Get Active Tasks Parameters", "Parameters for retrieving active tasks.",
+        {
+            "label": {"type": "string", "description": "Label to filter tasks by."},
+            "filter": {"type": "string", "description": "Custom filter string for tasks."}
+        },
+        [],
+    ),
+    _tool(
+        "create_task", "Create Task", "Create a new task or subtask.",
+        "Create Task Parameters", "Parameters for creating a new task.",
+        {
+            "content": {"type": "string", "description": "The content of the task."},
+            "description": {"type": "string", "description": "A detailed description of the task."},
+            "labels": {"type": "array", "items": {"type": "string"}, "description": "Labels to apply to the task."},
+            "priority": {"type": "integer", "description": "Priority 1-4 (4 highest)."},
+            "due_string": {"type": "string", "description": "Human-friendly due date (e.g., 'today', 'next Monday')."},
+            "parent_id": {"type": "string", "description": "Parent task ID if creating a subtask."}
+        },
+        ["content"],
+    ),
+    _tool(
+        "get_task", "Get Task", "Retrieve a single task by ID.",
+        "Get Task Parameters", "Parameters for retrieving a single task.",
+        _id_property("task to retrieve"),
+        ["id"],
+    ),
+    _tool(
+        "update_task", "Update Task", "Update an existing task.",
+        "Update Task Parameters", "Parameters for updating an existing task.",
+        {
+            "id": {"type": "string", "description": "The ID of the task to update."},
+            "content": {"type": "string", "description": "New content."},
+            "description": {"type": "string", "description": "New detailed description."},
+            "labels": {"type": "array", "items": {"type": "string"}, "description": "New labels."},
+            "priority": {"type": "integer", "description": "New priority 1-4 (4 highest)."},
+            "due_string": {"type": "string", "description": "Human-friendly due date."}
+        },
+        ["id"],
+    ),
+    _tool(
+        "close_task", "Close Task", "Complete a task.",
+        "Close Task Parameters", "Parameters for completing a task.",
+        _id_property("task to close"),
+        ["id"],
+    ),
+    _tool(
+        "reopen_task", "Reopen Task", "Reopen a completed task.",
+        "Reopen Task Parameters", "Parameters for reopening a task.",
+        _id_property("task to reopen"),
+        ["id"],
+    ),
+    _tool(
+        "delete_task", "Delete Task", "Delete a task.",
+        "Delete Task Parameters", "Parameters for deleting a task.",
+        _id_property("task to delete"),
+        ["id"],
+    ),
+    _tool(
+        "get_all_labels", "Get All Labels", "Retrieve all labels.",
+        "Get All Labels Parameters", "Parameters for retrieving all labels.",
+        {},
+        [],
+    ),
+    _tool(
+        "create_label", "Create Label", "Create a new label.",
+        "Create Label Parameters", "Parameters for creating a new label.",
+        {
+            "name": {"type": "string", "description": "The name of the label."},
+            "order": {"type": "integer", "description": "Sort order in the UI."},
+            "color": {"type": "string", "description": "Label color."},
+            "favorite": {"type": "boolean", "description": "Whether the label is a favorite."}
+        },
+        ["name"],
+    ),
+    _tool(
+        "update_label", "Update Label", "Update an existing label.",
+        "Update Label Parameters", "Parameters for updating an existing label.",
+        {
+            "id": {"type": "string", "description": "The ID of the label to update."},
+            "name": {"type": "string", "description": "New name."},
+            "order": {"type": "integer", "description": "New sort order."},
+            "color": {"type": "string", "description": "New color."},
+            "favorite": {"type": "boolean", "description": "Whether the label is a favorite."}
+        },
+        ["id"],
+    ),
+    _tool(
+        "delete_label", "Delete Label", "Delete a label.",
+        "Delete Label Parameters", "Parameters for deleting a label.",
+        _id_property("label to delete"),
+        ["id"],
+    ),
+    _tool(
+        "batch", "Batch", "Run several independent tool calls concurrently; results keep call order.",
+        "Batch Parameters", "Parameters for running several tool calls at once.",
+        {
+            "calls": {
+                "type": "array",
+                "description": "Tool calls to run, each {name, arguments}.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string", "description": "Tool name (batch cannot be nested)."},
+                        "arguments": {"type": "object", "description": "Arguments for the tool."}
+                    },
+                    "required": ["name"]
+                }
+            }
+        },
+        ["calls"],
+    ),
+)
+
+# ---------------------------
+# Argument validation
+# ---------------------------
+
+_JSON_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Any], None]:
+    # Resolve the schema into flat (key, check) lists once so each call is a
+    # straight run of dict lookups. Covers the subset of JSON Schema TOOLS uses.
+    required = tuple(schema.get("required") or ())
+    checks = []
+    for key, prop in (schema.get("properties") or {}).items():
+        type_check = _JSON_TYPE_CHECKS.get(prop.get("type"))
+        if type_check is None:
+            continue
+        item_check = _JSON_TYPE_CHECKS.get((prop.get("items") or {}).get("type"))
+        checks.append((key, prop["type"], type_check, item_check))
+
+    def validate(params: Any) -> None:
+        if not isinstance(params, dict):
+            raise ValueError("Invalid arguments: expected an object")
+        for key in required:
+            if key not in params:
+                raise ValueError(f"Invalid arguments: '{key}' is required")
+        for key, type_name, type_check, item_check in checks:
+            if key not in params:
+                continue
+            value = params[key]
+            if not type_check(value):
+                raise ValueError(f"Invalid arguments: '{key}' must be {type_name}")
+            if item_check is not None and not all(item_check(item) for item in value):
+                raise ValueError(f"Invalid arguments: '{key}' has invalid items")
+
+    return validate
+
+_VALIDATORS: Dict[str, Callable[[Any], None]] = {t["name"]: _compile_validator(t["inputSchema"]) for t in TOOLS}
+
+# tools/list is static, so serialize it once instead of on every discovery call
+_TOOLS_JSON_BYTES = _json_dumps_bytes({"tools": TOOLS})
 
 # ---------------------------
 # Todoist forwarding
 # ---------------------------
 
-def _todoist_request(method: str, path: str, params: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None):
+def _build_session(retry: Retry) -> requests.Session:
+    # Pooled sessions so keep-alive connections to api.todoist.com are
+    # reused instead of re-handshaking per request.
+    session = requests.Session()
+    session.headers.update(TODOIST_HEADERS)
+    # Large task lists compress well; keep this explicit rather than relying
+    # on the requests default so the intent survives client changes.
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    adapter = HTTPAdapter(pool_connections=TODOIST_POOL_SIZE, pool_maxsize=TODOIST_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+# Reads and deletes are idempotent, so any transient failure is safe to retry.
+SESSION = _build_session(
+    Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "DELETE"]),
+        raise_on_status=False,
+    )
+)
+# POSTs create tasks and labels: a 5xx or a dropped response may come after
+# Todoist already created the object, so only retry when the request was
+# never processed (connect errors, 429) to avoid duplicates.
+WRITE_SESSION = _build_session(
+    Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[429],
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+)
+
+# Short-lived cache for idempotent GETs; cached values are treated as read-only.
+_GET_CACHE: "OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[float, Any]]" = OrderedDict()
+_GET_CACHE_LOCK = threading.Lock()
+
+def _get_cache_key(path: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return path, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+def _get_cache_lookup(key: Tuple[str, Tuple[Tuple[str, str], ...]]) -> Tuple[bool, Any]:
+    with _GET_CACHE_LOCK:
+        entry = _GET_CACHE.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at >= GET_CACHE_TTL_SECONDS:
+            del _GET_CACHE[key]
+            return False, None
+        return True, value
+
+def _get_cache_store(key: Tuple[str, Tuple[Tuple[str, str], ...]], value: Any) -> None:
+    with _GET_CACHE_LOCK:
+        _GET_CACHE[key] = (time.monotonic(), value)
+        _GET_CACHE.move_to_end(key)
+        while len(_GET_CACHE) > GET_CACHE_MAX_ENTRIES:
+            _GET_CACHE.popitem(last=False)
+
+def _invalidate_get_cache(prefix: str) -> None:
+    with _GET_CACHE_LOCK:
+        for key in [k for k in _GET_CACHE if k[0].startswith(prefix)]:
+            del _GET_CACHE[key]
+
+RPC_SERVER_ERROR = -32000
+RPC_RATE_LIMITED = -32001
+
+class TodoistError(ValueError):
+    """Upstream failure carrying the JSON-RPC code and HTTP status."""
+
+    def __init__(self, message: str, code: int = RPC_SERVER_ERROR, status: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+class TodoistResponse(NamedTuple):
+    # Parsed JSON plus the raw body text, so tool results can reuse the
+    # upstream JSON instead of re-encoding the parsed object.
+    data: Any
+    body: Optional[str]
+
+_EMPTY_RESPONSE = TodoistResponse(None, None)
+
+def _todoist_request(method: str, path: str, params: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None) -> TodoistResponse:
+    cache_key = None
+    if method == "GET" and GET_CACHE_TTL_SECONDS > 0:
+        cache_key = _get_cache_key(path, params)
+        hit, cached = _get_cache_lookup(cache_key)
+        if hit:
+            return cached
+    result = _todoist_fetch(method, path, params=params, json_data=json_data)
+    if cache_key is not None:
+        _get_cache_store(cache_key, result)
+    return result
+
+def _todoist_fetch(method: str, path: str, params: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None) -> TodoistResponse:
     url = TODOIST_BASE_URL + path
     try:
         if method == "GET":
-            resp = requests.get(url, headers=TODOIST_HEADERS, params=params, timeout=15)
+            resp = SESSION.get(url, params=params, timeout=TODOIST_TIMEOUT)
         elif method == "POST":
-            resp = requests.post(url, headers=TODOIST_HEADERS, json=json_data, timeout=15)
+            resp = WRITE_SESSION.post(url, json=json_data, timeout=TODOIST_TIMEOUT)
         elif method == "DELETE":
-            resp = requests.delete(url, headers=TODOIST_HEADERS, timeout=15)
+            resp = SESSION.delete(url, timeout=TODOIST_TIMEOUT)
         else:
             raise ValueError(f"Unsupported method: {method}")
         resp.raise_for_status()
-        if resp.status_code == 204 or not resp.content:
-            return None
+        body = resp.content
+        if resp.status_code == 204 or not body:
+            return _EMPTY_RESPONSE
         try:
-            return resp.json()
+            return TodoistResponse(_json_loads(body), body.decode("utf-8"))
         except ValueError:
-            return None
+            return _EMPTY_RESPONSE
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        code = RPC_RATE_LIMITED if status == 429 else RPC_SERVER_ERROR
+        raise TodoistError(f"Todoist API error: HTTP {status}", code=code, status=status) from e
+    except requests.exceptions.Timeout as e:
+        raise TodoistError(f"Todoist request timed out: {method} {path}") from e
     except requests.exceptions.RequestException as e:
-        # Map network/API errors into JSON-RPC error path
-        raise ValueError(str(e)) from e
+        # Map remaining network errors into the JSON-RPC error path without
+        # stringifying the full exception (it can embed request details)
+        raise TodoistError(f"Todoist request failed: {type(e).__name__}") from e
+
+def _without_id(params: Dict[str, Any]) -> Dict[str, Any]:
+    # Single pass that skips the id; the caller's dict is left untouched.
+    return {k: v for k, v in params.items() if k != "id"}
+
+def _update_task(params: Dict[str, Any]):
+    return _todoist_request("POST", "tasks/" + params["id"], json_data=_without_id(params))
+
+def _update_label(params: Dict[str, Any]):
+    return _todoist_request("POST", "labels/" + params["id"], json_data=_without_id(params))
+
+_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "get_active_tasks": lambda p: _todoist_request("GET", "tasks", params=p),
+    "create_task": lambda p: _todoist_request("POST", "tasks", json_data=p),
+    "get_task": lambda p: _todoist_request("GET", "tasks/" + p["id"]),
+    "update_task": _update_task,
+    "close_task": lambda p: _todoist_request("POST", "tasks/" + p["id"] + "/close"),
+    "reopen_task": lambda p: _todoist_request("POST", "tasks/" + p["id"] + "/reopen"),
+    "delete_task": lambda p: _todoist_request("DELETE", "tasks/" + p["id"]),
+    "get_all_labels": lambda p: _todoist_request("GET", "labels"),
+    "create_label": lambda p: _todoist_request("POST", "labels", json_data=p),
+    "update_label": _update_label,
+    "delete_label": lambda p: _todoist_request("DELETE", "labels/" + p["id"]),
+}
+
+# Mutating tools drop cached GETs under the path prefix they touch
+_CACHE_INVALIDATES = {
+    "create_task": "tasks",
+    "update_task": "tasks",
+    "close_task": "tasks",
+    "reopen_task": "tasks",
+    "delete_task": "tasks",
+    "create_label": "labels",
+    "update_label": "labels",
+    "delete_label": "labels",
+}
+
+def execute_tool_response(tool_name: str, params: Dict[str, Any]) -> TodoistResponse:
+    fn = _DISPATCH.get(tool_name)
+    if fn is None:
+        raise ValueError(f"Unknown tool: {tool_name}")
+    # Reject malformed arguments locally instead of paying a Todoist round-trip
+    validator = _VALIDATORS.get(tool_name)
+    if validator is not None:
+        validator(params)
+    result = fn(params)
+    prefix = _CACHE_INVALIDATES.get(tool_name)
+    if prefix is not None:
+        _invalidate_get_cache(prefix)
+    return result
 
 def execute_tool(tool_name: str, params: Dict[str, Any]):
-    if tool_name == "get_active_tasks":
-        return _todoist_request("GET", "tasks", params=params)
-    if tool_name == "create_task":
-        return _todoist_request("POST", "tasks", json_data=params)
-    if tool_name == "get_task":
-        return _todoist_request("GET", f"tasks/{params['id']}")
-    if tool_name == "update_task":
-        p = dict(params)
-        task_id = p.pop("id")
-        return _todoist_request("POST", f"tasks/{task_id}", json_data=p)
-    if tool_name == "close_task":
-        return _todoist_request("POST", f"tasks/{params['id']}/close")
-    if tool_name == "reopen_task":
-        return _todoist_request("POST", f"tasks/{params['id']}/reopen")
-    if tool_name == "delete_task":
-        return _todoist_request("DELETE", f"tasks/{params['id']}")
-    if tool_name == "get_all_labels":
-        return _todoist_request("GET", "labels")
-    if tool_name == "create_label":
-        return _todoist_request("POST", "labels", json_data=params)
-    if tool_name == "update_label":
-        p = dict(params)
-        lid = p.pop("id")
-        return _todoist_request("POST", f"labels/{lid}", json_data=p)
-    if tool_name == "delete_label":
-        return _todoist_request("DELETE", f"labels/{params['id']}")
-    raise ValueError(f"Unknown tool: {tool_name}")
+    return execute_tool_response(tool_name, params).data
+
+def _run_batch_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    # Never raises: each entry reports its own success or error
+    name = call.get("name")
+    try:
+        if name == "batch":
+            raise ValueError("Nested batch calls are not supported")
+        data = execute_tool(name, call.get("arguments") or {})
+        return {"name": name, "ok": True, "result": data}
+    except TodoistError as e:
+        return {"name": name, "ok": False, "error": {"code": e.code, "message": str(e)}}
+    except ValueError as e:
+        return {"name": name, "ok": False, "error": {"code": RPC_SERVER_ERROR, "message": str(e)}}
+
+def _batch_tool(params: Dict[str, Any]) -> TodoistResponse:
+    calls = params["calls"]
+    if not calls:
+        return TodoistResponse([], None)
+    with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(calls))) as pool:
+        return TodoistResponse(list(pool.map(_run_batch_call, calls)), None)
+
+_DISPATCH["batch"] = _batch_tool
 
 # ---------------------------
 # JSON helpers
 # ---------------------------
 
+def _rpc_ok(id_val: Any, result_obj: Dict[str, Any]) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": id_val, "result": result_obj}
+
+def _rpc_error(code: int, message: str, id_val: Any) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": id_val, "error": {"code": code, "message": message}}
+
 def _json_ok(id_val: Any, result_obj: Dict[str, Any]):
-    return jsonify({"jsonrpc": "2.0", "id": id_val, "result": result_obj}), 200
+    return jsonify(_rpc_ok(id_val, result_obj)), 200
 
 def _json_error(code: int, message: str, id_val: Any):
     # Always HTTP 200 for JSON-RPC layer
-    return jsonify({"jsonrpc": "2.0", "id": id_val, "error": {"code": code, "message": message}}), 200
-
-def _pack_tool_result(result: Any):
-    # structuredContent must be an object; wrap lists
-    if result is None:
-        structured = {"ok": True}
-        text = "OK"
-    elif isinstance(result, dict):
-        structured = result
-        text = json.dumps(result, ensure_ascii=False)
-    else:
-        structured = {"items": result}
-        text = json.dumps(result, ensure_ascii=False)
+    return jsonify(_rpc_error(code, message, id_val)), 200
+
+# Results are only ever serialized, never mutated, so the None case can be
+# one shared object.
+_OK_TOOL_RESULT = {
+    "content": [{"type": "text", "text": "OK"}],
+    "structuredContent": {"ok": True},
+    "isError": False
+}
+
+@functools.singledispatch
+def _pack_tool_result(result: Any, body: Optional[str] = None):
+    # structuredContent must be an object; wrap lists. The upstream body is
+    # already the JSON text of result, so reuse it when present.
     return {
-        "content": [{"type": "text", "text": text}],
-        "structuredContent": structured,
+        "content": [{"type": "text", "text": body if body is not None else _json_dumps_text(result)}],
+        "structuredContent": {"items": result},
+        "isError": False
+    }
+
+@_pack_tool_result.register(type(None))
+def _pack_none_result(result: None, body: Optional[str] = None):
+    return _OK_TOOL_RESULT
+
+@_pack_tool_result.register(dict)
+def _pack_dict_result(result: Dict[str, Any], body: Optional[str] = None):
+    return {
+        "content": [{"type": "text", "text": body if body is not None else _json_dumps_text(result)}],
+        "structuredContent": result,
         "isError": False
     }
 
@@ -292,24 +535,48 @@ def _pack_tool_result(result: Any):
 # Handlers
 # ---------------------------
 
+# Health probes hit this often; the body never changes
+_HEALTH_BODY = _json_dumps_bytes({
+    "status": "ok",
+    "hint": "POST JSON-RPC 2.0 to /mcp (or /)",
+})
+
+GZIP_MIN_BYTES = 1024
+
+@app.after_request
+def _gzip_response(response: Response):
+    # Large JSON (tools/list, task lists) shrinks several-fold; level 1 keeps
+    # the CPU cost low.
+    if (
+        response.direct_passthrough
+        or response.status_code != 200
+        or "Content-Encoding" in response.headers
+        or "gzip" not in (request.headers.get("Accept-Encoding") or "").lower()
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=1))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
 @app.route("/", methods=["GET"])
 @app.route("/mcp", methods=["GET"])
 @app.route("/mcp/", methods=["GET"])
 def health():
-    return jsonify({
-        "status": "ok",
-        "hint": "POST JSON-RPC 2.0 to /mcp (or /)",
-    }), 200
+    return Response(_HEALTH_BODY, status=200, mimetype="application/json")
 
-def _handle_jsonrpc(data: Dict[str, Any]):
+def _dispatch_jsonrpc(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     method = data.get("method")
     rpc_id = data.get("id", None)
     params = data.get("params", {}) or {}
 
-    # Notifications (no id) -> 204 with empty body
+    # Notifications (no id) produce no response object
     if rpc_id is None:
         # Accept common notifications
-        return ("", 204)
+        return None
 
     # initialize
     if method == "initialize":
@@ -327,35 +594,69 @@ def _handle_jsonrpc(data: Dict[str, Any]):
             "serverInfo": {"name": "todoist_mcp", "version": "1.0.0"},
             "instructions": "Todoist MCP: use tools/list to discover tools, then tools/call with {name, arguments}.",
         }
-        return _json_ok(rpc_id, result)
+        return _rpc_ok(rpc_id, result)
 
     # tools/list
     if method in ("tools/list", "listTools"):
-        return _json_ok(rpc_id, {"tools": TOOLS})
+        return _rpc_ok(rpc_id, {"tools": TOOLS})
 
     # tools/call
     if method in ("tools/call", "callTool"):
         try:
             tool_name = params.get("name") or params.get("toolName") or params.get("tool_name")
             tool_params = params.get("arguments") or params.get("parameters") or {}
-            result = execute_tool(tool_name, tool_params)
-            return _json_ok(rpc_id, _pack_tool_result(result))
+            response = execute_tool_response(tool_name, tool_params)
+            return _rpc_ok(rpc_id, _pack_tool_result(response.data, response.body))
+        except TodoistError as e:
+            return _rpc_error(e.code, str(e), rpc_id)
         except ValueError as e:
-            return _json_error(-32000, str(e), rpc_id)
+            return _rpc_error(RPC_SERVER_ERROR, str(e), rpc_id)
 
     # Optional: resources & prompts (empty)
     if method == "resources/list":
-        return _json_ok(rpc_id, {"resources": []})
+        return _rpc_ok(rpc_id, {"resources": []})
     if method == "prompts/list":
-        return _json_ok(rpc_id, {"prompts": []})
+        return _rpc_ok(rpc_id, {"prompts": []})
 
     # Unknown method
-    return _json_error(-32601, f"Method not found: {method}", rpc_id)
+    return _rpc_error(-32601, f"Method not found: {method}", rpc_id)
+
+def _tools_list_response(rpc_id: Any):
+    body = b'{"jsonrpc":"2.0","id":' + _json_dumps_bytes(rpc_id) + b',"result":' + _TOOLS_JSON_BYTES + b"}"
+    return Response(body, status=200, mimetype="application/json")
+
+def _handle_jsonrpc(data: Dict[str, Any]):
+    rpc_id = data.get("id", None)
+    if rpc_id is not None and data.get("method") in ("tools/list", "listTools"):
+        return _tools_list_response(rpc_id)
+    payload = _dispatch_jsonrpc(data)
+    if payload is None:
+        # Notifications (no id) -> 204 with empty body
+        return ("", 204)
+    return jsonify(payload), 200
+
+def _dispatch_batch_entry(data: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(data, dict) or data.get("jsonrpc") != "2.0":
+        return _rpc_error(-32600, "Invalid Request", None)
+    return _dispatch_jsonrpc(data)
+
+def _handle_batch(items: List[Any]):
+    if not items:
+        return _json_error(-32600, "Invalid Request", None)
+    # Independent calls run concurrently so N Todoist round-trips cost
+    # roughly the slowest one instead of their sum.
+    workers = min(BATCH_MAX_WORKERS, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        responses = [r for r in pool.map(_dispatch_batch_entry, items) if r is not None]
+    if not responses:
+        # A batch of only notifications gets no body
+        return ("", 204)
+    return jsonify(responses), 200
 
 def _handle_legacy(data: Dict[str, Any]):
     action = data.get("action")
     if action == "list_tools":
-        return jsonify({"tools": TOOLS}), 200
+        return Response(_TOOLS_JSON_BYTES, status=200, mimetype="application/json")
     if action == "call_tool":
         try:
             result = execute_tool(data.get("tool_name"), data.get("parameters", {}) or {})
@@ -364,20 +665,27 @@ def _handle_legacy(data: Dict[str, Any]):
             return jsonify({"error": str(e)}), 200
     return jsonify({"error": "Invalid request"}), 200
 
+_JSON_CONTENT_TYPES = ("application/json", "text/plain")
+
 def _handle_request():
     ct = (request.content_type or "").lower()
-    raw = request.get_data(as_text=True)
 
     # Parse JSON for application/json, text/plain, or missing content-type
-    if ("application/json" in ct) or ("text/plain" in ct) or (ct == ""):
-        try:
-            data = json.loads(raw) if raw else {}
-        except Exception as e:
-            # Parse error (-32700)
-            return _json_error(-32700, f"Parse error: {e}", None)
-    else:
+    if ct and not ct.startswith(_JSON_CONTENT_TYPES):
         return jsonify({"error": "Unsupported Content-Type", "content_type": ct}), 415
 
+    # Raw bytes go straight to the decoder; no intermediate str copy
+    raw = request.get_data(cache=False)
+    try:
+        data = _json_loads(raw) if raw else {}
+    except Exception as e:
+        # Parse error (-32700)
+        return _json_error(-32700, f"Parse error: {e}", None)
+
+    # JSON-RPC batch?
+    if isinstance(data, list):
+        return _handle_batch(data)
+
     # JSON-RPC?
     if isinstance(data, dict) and data.get("jsonrpc") == "2.0":
         return _handle_jsonrpc(data)
@@ -395,6 +703,25 @@ def mcp_entry():
 # Main
 # ---------------------------
 
+def _prewarm_connection():
+    # Open a keep-alive connection (TCP + TLS) before the first tool call.
+    try:
+        SESSION.get(TODOIST_BASE_URL + "labels", timeout=5)
+    except requests.exceptions.RequestException as e:
+        log.warning(f"Todoist connection pre-warm failed: {e}")
+
+def _serve():
+    # Prefer a production WSGI server when installed. waitress is used over
+    # gunicorn because this prototype is run from PowerShell on Windows.
+    try:
+        from waitress import serve
+    except ImportError:
+        log.info("waitress not installed; falling back to the Flask development server")
+        app.run(host=MCP_HOST, port=MCP_PORT, debug=False, threaded=True)
+        return
+    serve(app, host=MCP_HOST, port=MCP_PORT, threads=MCP_THREADS)
+
 if __name__ == "__main__":
     log.info(f"Starting MCP server on http://{MCP_HOST}:{MCP_PORT}")
-    app.run(host=MCP_HOST, port=MCP_PORT, debug=False, threaded=True)
+    threading.Thread(target=_prewarm_connection, name="todoist-prewarm", daemon=True).start()
+    _serve()
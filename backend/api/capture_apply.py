@@ -1,10 +1,13 @@
 import copy
-import uuid
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import MultipleResultsFound
+from sqlalchemy.orm.attributes import set_committed_value
 
+from common.ids import new_uuid, short_id
 from common.models import (
     ActionBatch,
     ActionBatchStatus,
@@ -26,6 +29,8 @@ from common.models import (
     WorkItemVersion,
 )
 
+_STATUS_ONLY_WORK_ITEM_FIELDS = frozenset({"status", "completed_at", "archived_at", "source_inbox_item_id", "updated_at"})
+
 
 def run_action_batch_view_payload(batch: ActionBatch) -> Dict[str, Any]:
     return {
@@ -213,8 +218,9 @@ async def run_record_work_item_action_batch(
     status: ActionBatchStatus = ActionBatchStatus.applied,
     after_summary: Optional[str] = None,
 ) -> ActionBatch:
+    now = helpers["utc_now"]()
     action_batch = ActionBatch(
-        id=f"abt_{uuid.uuid4().hex[:12]}",
+        id=short_id("abt"),
         user_id=user_id,
         conversation_event_id=conversation_event_id,
         source_message=source_message,
@@ -223,23 +229,23 @@ async def run_record_work_item_action_batch(
         applied_item_ids_json=[record["work_item_id"] for record in version_records],
         before_summary=None,
         after_summary=after_summary or run_action_batch_summary(version_records),
-        undo_window_expires_at=helpers["utc_now"]() + timedelta(hours=24)
+        undo_window_expires_at=now + timedelta(hours=24)
         if status == ActionBatchStatus.applied
         else None,
-        created_at=helpers["utc_now"](),
+        created_at=now,
     )
     db.add(action_batch)
     for record in version_records:
         db.add(
             WorkItemVersion(
-                id=f"wiv_{uuid.uuid4().hex[:12]}",
+                id=short_id("wiv"),
                 user_id=user_id,
                 work_item_id=record["work_item_id"],
                 action_batch_id=action_batch.id,
                 operation=record["operation"],
                 before_json=record.get("before_json") if isinstance(record.get("before_json"), dict) else {},
                 after_json=record.get("after_json") if isinstance(record.get("after_json"), dict) else {},
-                created_at=helpers["utc_now"](),
+                created_at=now,
             )
         )
     return action_batch
@@ -257,8 +263,9 @@ async def run_record_reminder_action_batch(
     status: ActionBatchStatus = ActionBatchStatus.applied,
     after_summary: Optional[str] = None,
 ) -> ActionBatch:
+    now = helpers["utc_now"]()
     action_batch = ActionBatch(
-        id=f"abt_{uuid.uuid4().hex[:12]}",
+        id=short_id("abt"),
         user_id=user_id,
         conversation_event_id=conversation_event_id,
         source_message=source_message,
@@ -279,23 +286,23 @@ async def run_record_reminder_action_batch(
             ],
             fallback="Applied reminder changes",
         ),
-        undo_window_expires_at=helpers["utc_now"]() + timedelta(hours=24)
+        undo_window_expires_at=now + timedelta(hours=24)
         if status == ActionBatchStatus.applied
         else None,
-        created_at=helpers["utc_now"](),
+        created_at=now,
     )
     db.add(action_batch)
     for record in version_records:
         db.add(
             ReminderVersion(
-                id=f"rmv_{uuid.uuid4().hex[:12]}",
+                id=short_id("rmv"),
                 user_id=user_id,
                 reminder_id=record["reminder_id"],
                 action_batch_id=action_batch.id,
                 operation=record["operation"],
                 before_json=record.get("before_json") if isinstance(record.get("before_json"), dict) else {},
                 after_json=record.get("after_json") if isinstance(record.get("after_json"), dict) else {},
-                created_at=helpers["utc_now"](),
+                created_at=now,
             )
         )
     return action_batch
@@ -376,6 +383,30 @@ async def run_resolve_parent_work_item_id(
     return None
 
 
+async def _bulk_update_status_only_work_items(db, items: List[WorkItem]) -> None:
+    # Items whose only pending changes are the same status transition share one UPDATE
+    # instead of flushing one row at a time at commit.
+    buckets: Dict[tuple, List[WorkItem]] = {}
+    for item in items:
+        changed = {attr.key for attr in sa_inspect(item).attrs if attr.history.has_changes()}
+        if not changed or not changed <= _STATUS_ONLY_WORK_ITEM_FIELDS:
+            continue
+        values = tuple(sorted((key, getattr(item, key)) for key in changed))
+        buckets.setdefault(values, []).append(item)
+    for values, bucket in buckets.items():
+        if len(bucket) < 2:
+            continue
+        for item in bucket:
+            for key, value in values:
+                set_committed_value(item, key, value)
+        await db.execute(
+            update(WorkItem)
+            .where(WorkItem.id.in_([item.id for item in bucket]))
+            .values(dict(values))
+            .execution_options(synchronize_session=False)
+        )
+
+
 async def run_apply_capture(
     db,
     user_id: str,
@@ -392,11 +423,13 @@ async def run_apply_capture(
     enqueue_summary: bool = True,
 ) -> tuple:
     applied = helpers["AppliedChanges"]()
-    inbox_item_id = f"inb_{uuid.uuid4().hex[:12]}"
+    now = helpers["utc_now"]()
+    inbox_item_id = short_id("inb")
     touched_task_ids: List[str] = []
     touched_reminder_ids: List[str] = []
     version_records: List[Dict[str, Any]] = []
     reminder_version_records: List[Dict[str, Any]] = []
+    event_rows: List[Dict[str, Any]] = []
     session = None
     if session_id is None and "_get_or_create_session" in helpers:
         session = await helpers["_get_or_create_session"](db=db, user_id=user_id, chat_id=chat_id)
@@ -411,7 +444,7 @@ async def run_apply_capture(
             client_msg_id=client_msg_id,
             message_raw=message,
             message_norm=message.strip(),
-            received_at=helpers["utc_now"](),
+            received_at=now,
         )
     )
     await db.flush()
@@ -419,7 +452,7 @@ async def run_apply_capture(
     if source not in {helpers["settings"].TELEGRAM_DEFAULT_SOURCE, "telegram"}:
         conversation_source = ConversationSource.system if source == "system" else ConversationSource.web
     conversation_event = ConversationEvent(
-        id=f"cev_{uuid.uuid4().hex[:12]}",
+        id=short_id("cev"),
         user_id=user_id,
         chat_id=chat_id,
         source=conversation_source,
@@ -427,38 +460,60 @@ async def run_apply_capture(
         content_text=message,
         normalized_text=message.strip(),
         metadata_json={"request_id": request_id, "source": source, "client_msg_id": client_msg_id},
-        created_at=helpers["utc_now"](),
+        created_at=now,
     )
     db.add(conversation_event)
 
     entity_map = {}
+    task_entries: List[tuple[Dict[str, Any], str, str, str, str, bool]] = []
+    lookup_task_ids: set[str] = set()
+    lookup_title_norms: set[str] = set()
     for t_data in extraction.get("tasks", []):
         canonical_title = helpers["_canonical_task_title"](t_data.get("title"))
         title_norm = canonical_title.lower().strip()
         action = str(t_data.get("action") or "").strip().lower()
         status_hint = str(t_data.get("status") or "").strip().lower()
         requires_target = action in {"update", "complete", "archive"} or status_hint in {"done", "archived"}
+        target_task_id = t_data.get("target_task_id")
+        if isinstance(target_task_id, str) and target_task_id.strip():
+            lookup_task_ids.add(target_task_id.strip())
+        if not requires_target and action != "create":
+            lookup_title_norms.add(title_norm)
+        task_entries.append((t_data, canonical_title, title_norm, action, status_hint, requires_target))
+
+    # One query loads every targeted or same-titled item up front. Lookups below filter the
+    # in-memory objects on their current state, so items created or retitled earlier in
+    # this loop are seen exactly as an autoflushed per-task query would have seen them.
+    known_items: Dict[str, WorkItem] = {}
+    if lookup_task_ids or lookup_title_norms:
+        known_stmt = select(WorkItem).where(
+            WorkItem.user_id == user_id,
+            WorkItem.status != WorkItemStatus.archived,
+            or_(WorkItem.id.in_(lookup_task_ids), WorkItem.title_norm.in_(lookup_title_norms)),
+        )
+        known_items = {item.id: item for item in (await db.execute(known_stmt)).scalars().all()}
+    loaded_items = list(known_items.values())
+
+    for t_data, canonical_title, title_norm, action, status_hint, requires_target in task_entries:
         existing = None
         target_task_id = t_data.get("target_task_id")
         if isinstance(target_task_id, str) and target_task_id.strip():
-            target_stmt = select(WorkItem).where(
-                WorkItem.user_id == user_id,
-                WorkItem.id == target_task_id.strip(),
-                WorkItem.status != WorkItemStatus.archived,
-            )
-            existing = (await db.execute(target_stmt)).scalar_one_or_none()
+            existing = known_items.get(target_task_id.strip())
+            if existing is not None and existing.status == WorkItemStatus.archived:
+                existing = None
         resolved_kind = run_resolved_work_item_kind(t_data, existing=existing)
         if existing is None and not requires_target and action != "create":
             kind_filter = [WorkItemKind.task, WorkItemKind.subtask]
             if resolved_kind == WorkItemKind.project:
                 kind_filter = [WorkItemKind.project]
-            stmt = select(WorkItem).where(
-                WorkItem.user_id == user_id,
-                WorkItem.title_norm == title_norm,
-                WorkItem.kind.in_(kind_filter),
-                WorkItem.status != WorkItemStatus.archived,
-            )
-            existing = (await db.execute(stmt)).scalar_one_or_none()
+            matches = [
+                item
+                for item in known_items.values()
+                if item.title_norm == title_norm and item.kind in kind_filter and item.status != WorkItemStatus.archived
+            ]
+            if len(matches) > 1:
+                raise MultipleResultsFound("Multiple rows were found when one or none was required")
+            existing = matches[0] if matches else None
             resolved_kind = run_resolved_work_item_kind(t_data, existing=existing)
 
         parent_task_id = t_data.get("parent_task_id")
@@ -483,32 +538,32 @@ async def run_apply_capture(
                 helpers=helpers,
             )
             if resolved_parent_id is None:
-                db.add(
-                    helpers["EventLog"](
-                        id=str(uuid.uuid4()),
-                        request_id=request_id,
-                        user_id=user_id,
-                        event_type="task_action_skipped_missing_parent",
-                        payload_json={
+                event_rows.append(
+                    {
+                        "id": new_uuid(),
+                        "request_id": request_id,
+                        "user_id": user_id,
+                        "event_type": "task_action_skipped_missing_parent",
+                        "payload_json": {
                             "title": t_data.get("title"),
                             "action": action,
                             "parent_task_id": parent_task_id,
                             "parent_title": parent_title,
                         },
-                        created_at=helpers["utc_now"](),
-                    )
+                        "created_at": now,
+                    }
                 )
                 continue
         elif resolved_kind == WorkItemKind.subtask and existing is None:
-            db.add(
-                helpers["EventLog"](
-                    id=str(uuid.uuid4()),
-                    request_id=request_id,
-                    user_id=user_id,
-                    event_type="task_action_skipped_missing_parent",
-                    payload_json={"title": t_data.get("title"), "action": action},
-                    created_at=helpers["utc_now"](),
-                )
+            event_rows.append(
+                {
+                    "id": new_uuid(),
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "event_type": "task_action_skipped_missing_parent",
+                    "payload_json": {"title": t_data.get("title"), "action": action},
+                    "created_at": now,
+                }
             )
             continue
         if existing:
@@ -538,18 +593,18 @@ async def run_apply_capture(
                     existing.due_at = None
             if action == "archive":
                 existing.status = WorkItemStatus.archived
-                existing.archived_at = helpers["utc_now"]()
+                existing.archived_at = now
             elif action == "complete":
                 existing.status = WorkItemStatus.done
-                existing.completed_at = helpers["utc_now"]()
+                existing.completed_at = now
             elif "status" in t_data and t_data.get("status"):
                 existing.status = helpers["_coerce_work_item_status"](t_data.get("status"))
                 if existing.status == WorkItemStatus.done:
-                    existing.completed_at = helpers["utc_now"]()
+                    existing.completed_at = now
                 else:
                     existing.completed_at = None
             existing.source_inbox_item_id = inbox_item_id
-            existing.updated_at = helpers["utc_now"]()
+            existing.updated_at = now
             after_snapshot = helpers["work_item_snapshot"](existing)
             target_entity_id = existing.id
 
@@ -579,15 +634,15 @@ async def run_apply_capture(
             )
         else:
             if requires_target or action in {"noop"}:
-                db.add(
-                    helpers["EventLog"](
-                        id=str(uuid.uuid4()),
-                        request_id=request_id,
-                        user_id=user_id,
-                        event_type="task_action_skipped_missing_target",
-                        payload_json={"title": t_data.get("title"), "action": action},
-                        created_at=helpers["utc_now"](),
-                    )
+                event_rows.append(
+                    {
+                        "id": new_uuid(),
+                        "request_id": request_id,
+                        "user_id": user_id,
+                        "event_type": "task_action_skipped_missing_target",
+                        "payload_json": {"title": t_data.get("title"), "action": action},
+                        "created_at": now,
+                    }
                 )
                 continue
             task_id = helpers["_new_work_item_id"](resolved_kind)
@@ -607,16 +662,13 @@ async def run_apply_capture(
                 snooze_until=None,
                 estimated_minutes=None,
                 source_inbox_item_id=inbox_item_id,
-                created_at=helpers["utc_now"](),
-                updated_at=helpers["utc_now"](),
-                completed_at=helpers["utc_now"]()
-                if str(t_data.get("status") or "").strip().lower() == "done"
-                else None,
-                archived_at=helpers["utc_now"]()
-                if str(t_data.get("status") or "").strip().lower() == "archived"
-                else None,
+                created_at=now,
+                updated_at=now,
+                completed_at=now if status_hint == "done" else None,
+                archived_at=now if status_hint == "archived" else None,
             )
             db.add(created_item)
+            known_items[task_id] = created_item
             entity_map[(EntityType.task, title_norm)] = task_id
             touched_task_ids.append(task_id)
             applied.tasks_created += 1
@@ -629,43 +681,56 @@ async def run_apply_capture(
                     "after_json": helpers["work_item_snapshot"](created_item),
                 }
             )
+    await _bulk_update_status_only_work_items(db, loaded_items)
 
     for l_data in extraction.get("links", []):
         try:
             from_type = EntityType(l_data["from_type"])
             to_type = EntityType(l_data["to_type"])
             link_type = LinkType(l_data["link_type"])
-            from_id = entity_map.get((from_type, l_data["from_title"].lower().strip()))
-            to_id = entity_map.get((to_type, l_data["to_title"].lower().strip()))
+            from_title = l_data["from_title"].strip()
+            to_title = l_data["to_title"].strip()
+            from_id = entity_map.get((from_type, from_title.lower()))
+            to_id = entity_map.get((to_type, to_title.lower()))
             work_item_link_type = helpers["_work_item_link_type_from_legacy"](link_type)
             if from_id and to_id and work_item_link_type is not None:
                 db.add(
                     WorkItemLink(
-                        id=f"lnk_{uuid.uuid4().hex[:12]}",
+                        id=short_id("lnk"),
                         user_id=user_id,
                         from_work_item_id=from_id,
                         to_work_item_id=to_id,
                         link_type=work_item_link_type,
-                        created_at=helpers["utc_now"](),
+                        created_at=now,
                     )
                 )
                 applied.links_created += 1
                 helpers["_append_applied_item"](
                     applied,
                     "link_created",
-                    f"{l_data['from_title'].strip()} {l_data['link_type'].strip()} {l_data['to_title'].strip()}",
+                    f"{from_title} {l_data['link_type'].strip()} {to_title}",
                 )
         except Exception as exc:
-            db.add(
-                helpers["EventLog"](
-                    id=str(uuid.uuid4()),
-                    request_id=request_id,
-                    user_id=user_id,
-                    event_type="link_validation_failed",
-                    payload_json={"entry": l_data, "error": str(exc)},
-                )
+            event_rows.append(
+                {
+                    "id": new_uuid(),
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "event_type": "link_validation_failed",
+                    "payload_json": {"entry": l_data, "error": str(exc)},
+                }
             )
 
+    lookup_reminder_ids = {
+        r_data["target_reminder_id"].strip()
+        for r_data in extraction.get("reminders", [])
+        if isinstance(r_data.get("target_reminder_id"), str) and r_data["target_reminder_id"].strip()
+    }
+    known_reminders: Dict[str, Reminder] = {}
+    if lookup_reminder_ids:
+        reminder_stmt = select(Reminder).where(Reminder.user_id == user_id, Reminder.id.in_(lookup_reminder_ids))
+        known_reminders = {reminder.id: reminder for reminder in (await db.execute(reminder_stmt)).scalars().all()}
+
     for r_data in extraction.get("reminders", []):
         canonical_title = helpers["_canonical_task_title"](r_data.get("title"))
         action = str(r_data.get("action") or "").strip().lower()
@@ -678,11 +743,7 @@ async def run_apply_capture(
         existing_reminder = None
         target_reminder_id = r_data.get("target_reminder_id")
         if isinstance(target_reminder_id, str) and target_reminder_id.strip():
-            reminder_stmt = select(Reminder).where(
-                Reminder.user_id == user_id,
-                Reminder.id == target_reminder_id.strip(),
-            )
-            existing_reminder = (await db.execute(reminder_stmt)).scalar_one_or_none()
+            existing_reminder = known_reminders.get(target_reminder_id.strip())
 
         if existing_reminder:
             before_snapshot = helpers["_reminder_snapshot"](existing_reminder)
@@ -719,11 +780,11 @@ async def run_apply_capture(
             elif "status" in r_data and r_data.get("status"):
                 existing_reminder.status = helpers["_coerce_reminder_status"](r_data.get("status"))
             existing_reminder.last_sent_at = (
-                helpers["utc_now"]() if existing_reminder.status == ReminderStatus.sent else existing_reminder.last_sent_at
+                now if existing_reminder.status == ReminderStatus.sent else existing_reminder.last_sent_at
             )
-            existing_reminder.completed_at = helpers["utc_now"]() if existing_reminder.status == ReminderStatus.completed else None
-            existing_reminder.dismissed_at = helpers["utc_now"]() if existing_reminder.status == ReminderStatus.dismissed else None
-            existing_reminder.updated_at = helpers["utc_now"]()
+            existing_reminder.completed_at = now if existing_reminder.status == ReminderStatus.completed else None
+            existing_reminder.dismissed_at = now if existing_reminder.status == ReminderStatus.dismissed else None
+            existing_reminder.updated_at = now
             after_snapshot = helpers["_reminder_snapshot"](existing_reminder)
             applied.reminders_updated += 1
             if action == "complete" or status_hint == "completed":
@@ -747,29 +808,29 @@ async def run_apply_capture(
             continue
 
         if requires_target or action in {"noop", "complete", "dismiss", "cancel"}:
-            db.add(
-                helpers["EventLog"](
-                    id=str(uuid.uuid4()),
-                    request_id=request_id,
-                    user_id=user_id,
-                    event_type="reminder_action_skipped_missing_target",
-                    payload_json={"title": r_data.get("title"), "action": action},
-                    created_at=helpers["utc_now"](),
-                )
+            event_rows.append(
+                {
+                    "id": new_uuid(),
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "event_type": "reminder_action_skipped_missing_target",
+                    "payload_json": {"title": r_data.get("title"), "action": action},
+                    "created_at": now,
+                }
             )
             continue
 
         remind_at = helpers["_parse_due_at"](r_data.get("remind_at"))
         if remind_at is None:
-            db.add(
-                helpers["EventLog"](
-                    id=str(uuid.uuid4()),
-                    request_id=request_id,
-                    user_id=user_id,
-                    event_type="reminder_action_skipped_missing_schedule",
-                    payload_json={"title": r_data.get("title"), "action": action},
-                    created_at=helpers["utc_now"](),
-                )
+            event_rows.append(
+                {
+                    "id": new_uuid(),
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "event_type": "reminder_action_skipped_missing_schedule",
+                    "payload_json": {"title": r_data.get("title"), "action": action},
+                    "created_at": now,
+                }
             )
             continue
         recurrence_rule = helpers["_validated_recurrence_rule"](r_data.get("recurrence_rule"))
@@ -780,7 +841,7 @@ async def run_apply_capture(
             reminder_kind = ReminderKind.one_off
         reminder_status = helpers["_coerce_reminder_status"](r_data.get("status"))
         reminder = Reminder(
-            id=f"rem_{uuid.uuid4().hex[:12]}",
+            id=short_id("rem"),
             user_id=user_id,
             work_item_id=r_data.get("work_item_id")
             if isinstance(r_data.get("work_item_id"), str) and r_data.get("work_item_id").strip()
@@ -796,11 +857,11 @@ async def run_apply_capture(
             else None,
             remind_at=remind_at,
             recurrence_rule=recurrence_rule,
-            last_sent_at=helpers["utc_now"]() if reminder_status == ReminderStatus.sent else None,
-            completed_at=helpers["utc_now"]() if reminder_status == ReminderStatus.completed else None,
-            dismissed_at=helpers["utc_now"]() if reminder_status == ReminderStatus.dismissed else None,
-            created_at=helpers["utc_now"](),
-            updated_at=helpers["utc_now"](),
+            last_sent_at=now if reminder_status == ReminderStatus.sent else None,
+            completed_at=now if reminder_status == ReminderStatus.completed else None,
+            dismissed_at=now if reminder_status == ReminderStatus.dismissed else None,
+            created_at=now,
+            updated_at=now,
         )
         db.add(reminder)
         applied.reminders_created += 1
@@ -815,20 +876,25 @@ async def run_apply_capture(
         )
         touched_reminder_ids.append(reminder.id)
 
-    await helpers["_remember_recent_tasks"](
-        db=db,
-        user_id=user_id,
-        chat_id=chat_id,
-        task_ids=touched_task_ids,
-        reason="capture_apply",
-    )
-    await helpers["_remember_recent_reminders"](
-        db=db,
-        user_id=user_id,
-        chat_id=chat_id,
-        reminder_ids=touched_reminder_ids,
-        reason="capture_apply",
-    )
+    if event_rows:
+        # Skip/failure events share one executemany INSERT instead of a unit-of-work row each.
+        await db.execute(insert(helpers["EventLog"]), event_rows)
+    if touched_task_ids:
+        await helpers["_remember_recent_tasks"](
+            db=db,
+            user_id=user_id,
+            chat_id=chat_id,
+            task_ids=touched_task_ids,
+            reason="capture_apply",
+        )
+    if touched_reminder_ids:
+        await helpers["_remember_recent_reminders"](
+            db=db,
+            user_id=user_id,
+            chat_id=chat_id,
+            reminder_ids=touched_reminder_ids,
+            reason="capture_apply",
+        )
 
     if version_records:
         work_item_batch = await helpers["_record_work_item_action_batch"](
@@ -910,18 +976,24 @@ async def run_apply_capture(
             touch=False,
         )
 
+    invalidate_plan_cache = bool(commit and chat_id and "_invalidate_today_plan_cache" in helpers)
     if commit:
         await db.commit()
-        if chat_id and "_invalidate_today_plan_cache" in helpers:
-            try:
-                await helpers["_invalidate_today_plan_cache"](user_id, chat_id)
-            except Exception as exc:
-                helpers["logger"].warning(
-                    "Failed to invalidate today plan cache after apply_capture for user %s chat %s: %s",
-                    user_id,
-                    chat_id,
-                    exc,
-                )
     if enqueue_summary:
-        await helpers["_enqueue_summary_job"](user_id=user_id, chat_id=chat_id, inbox_item_id=inbox_item_id)
+        await helpers["_enqueue_summary_job"](
+            user_id=user_id,
+            chat_id=chat_id,
+            inbox_item_id=inbox_item_id,
+            invalidate_plan_cache=invalidate_plan_cache,
+        )
+    elif invalidate_plan_cache:
+        try:
+            await helpers["_invalidate_today_plan_cache"](user_id, chat_id)
+        except Exception as exc:
+            helpers["logger"].warning(
+                "Failed to invalidate today plan cache after apply_capture for user %s chat %s: %s",
+                user_id,
+                chat_id,
+                exc,
+            )
     return inbox_item_id, applied
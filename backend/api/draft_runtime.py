@@ -1,13 +1,98 @@
 import copy
-import uuid
 import re
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import case, select, update
 
+from common.ids import new_uuid, short_id
 from common.models import ActionDraft, EventLog
 
+_TARGETED_TASK_ACTIONS = frozenset({"update", "complete", "archive"})
+_CLOSED_TASK_STATUSES = frozenset({"done", "archived"})
+_TASK_ACTIONS = frozenset({"create", "update", "complete", "archive", "noop"})
+_TASK_STATUSES = frozenset({"open", "blocked", "done", "archived"})
+_TASK_KINDS = frozenset({"project", "task", "subtask"})
+_REMINDER_ACTIONS = frozenset({"create", "update", "complete", "dismiss", "cancel", "noop"})
+_REMINDER_STATUSES = frozenset({"pending", "sent", "completed", "dismissed", "canceled"})
+_REMINDER_KINDS = frozenset({"one_off", "follow_up", "recurring"})
+
+_LINE_BREAK_PATTERN = re.compile(r"\n\s*\n+|\n+")
+_SENTENCE_CLAUSE_SPLIT_PATTERN = re.compile(
+    r"(?<=[.!?])\s+(?=(?:also|and also|then|next|plus|separately)\b)",
+    re.IGNORECASE,
+)
+_CLAUSE_BULLET_PREFIX_PATTERN = re.compile(r"^[\s\-*•]+")
+_NON_ALNUM_PATTERN = re.compile(r"[^A-Za-z0-9]")
+_NOT_PRIORITY_PATTERN = re.compile(r"\bnot\s+urgent\b|\bnot\s+a\s+priority\b")
+_HIGH_PRIORITY_PATTERN = re.compile(r"\b(high|highest|top)\s+priority\b|\burgent\b")
+_MEDIUM_PRIORITY_PATTERN = re.compile(r"\bmedium\s+priority\b")
+_LOW_PRIORITY_PATTERN = re.compile(r"\b(low|lowest)\s+priority\b")
+_SAME_DAY_REFERENCE_PATTERN = re.compile(r"\bsame\s+(?:day|date)\s+as\s+(?P<reference>.+)$")
+_SAME_DAY_PHRASE_PATTERN = re.compile(r"\bsame\s+(?:day|date)\s+as\b")
+_NOT_YET_DONE_PATTERN = re.compile(r"\bwant\s+(?:it|this|that|to)\s+done\b|\bdone\s+eventually\b")
+_COMPLETION_PATTERN = re.compile(r"\bdone\b|\bcomplete(?:d)?\b|\bfinished\b|\bhandled\b|\btook care of\b")
+_ARCHIVE_PATTERN = re.compile(r"\bdelete\b|\bremove\b|\barchive\b|\bdiscard\b|\bget rid of\b")
+_ORDINAL_TOKENS = (
+    ("second", 2),
+    ("2nd", 2),
+    ("third", 3),
+    ("3rd", 3),
+    ("fourth", 4),
+    ("4th", 4),
+    ("fifth", 5),
+    ("5th", 5),
+    ("sixth", 6),
+    ("6th", 6),
+    ("seventh", 7),
+    ("7th", 7),
+    ("eighth", 8),
+    ("8th", 8),
+    ("ninth", 9),
+    ("9th", 9),
+    ("tenth", 10),
+    ("10th", 10),
+    ("first", 1),
+    ("1st", 1),
+    ("two", 2),
+    ("three", 3),
+    ("four", 4),
+    ("five", 5),
+    ("six", 6),
+    ("seven", 7),
+    ("eight", 8),
+    ("nine", 9),
+    ("ten", 10),
+    ("one", 1),
+)
+# Tokens are plain word characters, so one static alternation replaces a search per token;
+# the rank keeps the tuple's precedence when a message contains several ordinals.
+_ORDINAL_TOKEN_PATTERN = re.compile(r"\b(" + "|".join(token for token, _ in _ORDINAL_TOKENS) + r")\b")
+_ORDINAL_TOKEN_RANKS = {token: (rank, value) for rank, (token, value) in enumerate(_ORDINAL_TOKENS)}
+_HASH_ORDINAL_PATTERN = re.compile(r"(?:^|\s)#\s*(\d{1,2})\b")
+_ITEM_ORDINAL_PATTERN = re.compile(r"\bitem\s+(\d{1,2})\b")
+_TOMORROW_PATTERN = re.compile(r"\btomorrow\b")
+_TODAY_PATTERN = re.compile(r"\b(today|tonight)\b")
+_NEXT_WEEK_PATTERN = re.compile(r"\bnext week\b")
+_NEXT_WEEKDAY_PATTERN = re.compile(r"\bnext\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b")
+_WEEKDAY_PATTERNS = tuple(
+    (
+        weekday,
+        re.compile(rf"\bnext\s+{name}\b"),
+        re.compile(rf"\b{name}\b"),
+        re.compile(rf"\b(?:this|on|by|for)\s+{name}\b"),
+    )
+    for weekday, name in enumerate(("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"))
+)
+# Every relative-date pattern above needs one of these words, so a single scan rules out
+# the common message that mentions no date before the per-pattern searches run.
+_RELATIVE_DATE_HINT_PATTERN = re.compile(
+    r"\b(?:tomorrow|today|tonight|next week|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b"
+)
+_IN_MINUTES_PATTERN = re.compile(r"\bin\s+(\d{1,3})\s*(?:minutes?|mins?|min)\b")
+_IN_HOURS_PATTERN = re.compile(r"\bin\s+(\d{1,2})\s*(?:hours?|hrs?|hr)\b")
+
 
 def run_planner_confidence(planned: Any) -> float:
     if not isinstance(planned, dict):
@@ -68,20 +153,16 @@ def run_extraction_action_count(extraction: Dict[str, Any]) -> int:
 
 def _split_action_clauses(message: str) -> List[str]:
     text = message or ""
-    if re.search(r"\n\s*\n+|\n+", text):
-        raw_parts = re.split(r"\n\s*\n+|\n+", text)
+    if _LINE_BREAK_PATTERN.search(text):
+        raw_parts = _LINE_BREAK_PATTERN.split(text)
     else:
-        raw_parts = re.split(
-            r"(?<=[.!?])\s+(?=(?:also|and also|then|next|plus|separately)\b)",
-            text,
-            flags=re.IGNORECASE,
-        )
+        raw_parts = _SENTENCE_CLAUSE_SPLIT_PATTERN.split(text)
     clauses: List[str] = []
     for part in raw_parts:
-        cleaned = re.sub(r"^[\s\-*•]+", "", part or "").strip()
+        cleaned = _CLAUSE_BULLET_PREFIX_PATTERN.sub("", part or "").strip()
         if not cleaned:
             continue
-        if len(re.sub(r"[^A-Za-z0-9]", "", cleaned)) < 4:
+        if len(_NON_ALNUM_PATTERN.sub("", cleaned)) < 4:
             continue
         if cleaned.endswith(":") and len(cleaned.split()) <= 4 and len(raw_parts) > 1:
             continue
@@ -95,26 +176,37 @@ def run_estimated_action_clause_count(message: str) -> int:
     clauses = _split_action_clauses(message)
     if not clauses:
         return 0
-    if re.search(r"\n\s*\n+|\n+", message):
+    if _LINE_BREAK_PATTERN.search(message):
         return len(clauses)
     if len(clauses) >= 3:
         return len(clauses)
     return 1
 
 
-def run_extract_priority_value(message: str, *, helpers: Dict[str, Any]) -> Optional[int]:
+def run_extract_priority_value(
+    message: str,
+    *,
+    helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
+) -> Optional[int]:
     if not isinstance(message, str) or not message.strip():
         return None
-    normalized = helpers["_normalize_query_text"](message)
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
     if not normalized:
         return None
-    if re.search(r"\bnot\s+urgent\b", normalized) or re.search(r"\bnot\s+a\s+priority\b", normalized):
+    return _priority_value_from_normalized(normalized)
+
+
+@lru_cache(maxsize=256)
+def _priority_value_from_normalized(normalized: str) -> Optional[int]:
+    if _NOT_PRIORITY_PATTERN.search(normalized):
         return None
-    if re.search(r"\b(high|highest|top)\s+priority\b", normalized) or re.search(r"\burgent\b", normalized):
+    if _HIGH_PRIORITY_PATTERN.search(normalized):
         return 1
-    if re.search(r"\bmedium\s+priority\b", normalized):
+    if _MEDIUM_PRIORITY_PATTERN.search(normalized):
         return 3
-    if re.search(r"\b(low|lowest)\s+priority\b", normalized):
+    if _LOW_PRIORITY_PATTERN.search(normalized):
         return 4
     return None
 
@@ -131,7 +223,7 @@ def run_extraction_mutation_count(extraction: Dict[str, Any]) -> int:
         if action == "create" and not task.get("target_task_id"):
             total += 1
             continue
-        if action in {"complete", "archive"} or status in {"done", "archived"}:
+        if action in {"complete", "archive"} or status in _CLOSED_TASK_STATUSES:
             total += 1
             continue
         field_count = 0
@@ -181,15 +273,16 @@ def run_estimated_requested_change_count(message: str, *, helpers: Dict[str, Any
     total = 0
     for clause in _split_action_clauses(message):
         clause_total = 0
-        if run_extract_relative_due_date(clause, helpers=helpers):
+        normalized = helpers["_normalize_query_text"](clause)
+        if run_extract_relative_due_date(clause, helpers=helpers, normalized=normalized):
             clause_total += 1
-        if run_extract_same_day_reference_update(clause, {}, helpers=helpers):
+        if run_extract_same_day_reference_update(clause, {}, helpers=helpers, normalized=normalized):
             clause_total += 1
-        if run_extract_priority_value(clause, helpers=helpers) is not None:
+        if run_extract_priority_value(clause, helpers=helpers, normalized=normalized) is not None:
             clause_total += 1
-        if run_is_archive_like_message(clause, helpers=helpers):
+        if run_is_archive_like_message(clause, helpers=helpers, normalized=normalized):
             clause_total += 1
-        elif run_is_completion_like_message(clause, helpers=helpers):
+        elif run_is_completion_like_message(clause, helpers=helpers, normalized=normalized):
             clause_total += 1
         total += max(1, clause_total)
     return total
@@ -206,7 +299,7 @@ def run_unresolved_mutation_titles(extraction: Dict[str, Any], *, helpers: Dict[
                 continue
             action = str(task.get("action") or "").lower()
             status = str(task.get("status") or "").lower()
-            requires_target = action in {"update", "complete", "archive"} or status in {"done", "archived"}
+            requires_target = action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES
             target_task_id = task.get("target_task_id")
             if not requires_target:
                 continue
@@ -244,7 +337,7 @@ def run_has_unresolved_task_target(extraction: Dict[str, Any]) -> bool:
             continue
         action = str(task.get("action") or "").lower()
         status = str(task.get("status") or "").lower()
-        requires_target = action in {"update", "complete", "archive"} or status in {"done", "archived"}
+        requires_target = action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES
         if requires_target and not (isinstance(task.get("target_task_id"), str) and task.get("target_task_id").strip()):
             return True
     return False
@@ -295,8 +388,7 @@ def run_autopilot_decision(message: str, extraction: Dict[str, Any], planned: An
     if not helpers["_has_actionable_entities"](extraction):
         return False, "no_actionable_entities"
     confidence = run_planner_confidence(planned)
-    completion_request = run_is_safe_completion_extraction(extraction)
-    if completion_request and run_is_safe_completion_extraction(extraction):
+    if run_is_safe_completion_extraction(extraction):
         if confidence >= helpers["AUTOPILOT_COMPLETION_CONFIDENCE"]:
             return True, "completion_high_confidence"
         return False, "completion_low_confidence"
@@ -357,9 +449,10 @@ def _run_apply_intent_fallbacks(
             return _run_maybe_clause_split_recovery(message, extraction, grounding, helpers=helpers, initial_count=initial_count)
         return extraction
 
-    inferred_due_date = run_extract_relative_due_date(message, helpers=helpers)
-    inferred_priority = run_extract_priority_value(message, helpers=helpers)
-    same_day_update = run_extract_same_day_reference_update(message, grounding, helpers=helpers)
+    normalized = helpers["_normalize_query_text"](message)
+    inferred_due_date = run_extract_relative_due_date(message, helpers=helpers, normalized=normalized)
+    inferred_priority = run_extract_priority_value(message, helpers=helpers, normalized=normalized)
+    same_day_update = run_extract_same_day_reference_update(message, grounding, helpers=helpers, normalized=normalized)
     if same_day_update:
         if inferred_priority is not None:
             same_day_update["priority"] = inferred_priority
@@ -367,7 +460,7 @@ def _run_apply_intent_fallbacks(
         return extraction
 
     if inferred_due_date or inferred_priority is not None:
-        displayed_match = run_extract_displayed_ordinal_task(message, grounding, helpers=helpers)
+        displayed_match = run_extract_displayed_ordinal_task(message, grounding, helpers=helpers, normalized=normalized)
         best_candidate = displayed_match or helpers["_best_task_reference_candidate"](message, grounding, open_only=True)
         if best_candidate:
             task_update = {
@@ -382,8 +475,8 @@ def _run_apply_intent_fallbacks(
             extraction["tasks"] = [task_update]
             return extraction
 
-    if run_is_archive_like_message(message, helpers=helpers):
-        displayed_match = run_extract_displayed_ordinal_task(message, grounding, helpers=helpers)
+    if run_is_archive_like_message(message, helpers=helpers, normalized=normalized):
+        displayed_match = run_extract_displayed_ordinal_task(message, grounding, helpers=helpers, normalized=normalized)
         if displayed_match:
             extraction["tasks"] = [
                 {
@@ -406,8 +499,8 @@ def _run_apply_intent_fallbacks(
             ]
             return extraction
 
-    if run_is_completion_like_message(message, helpers=helpers):
-        displayed_match = run_extract_displayed_ordinal_task(message, grounding, helpers=helpers)
+    if run_is_completion_like_message(message, helpers=helpers, normalized=normalized):
+        displayed_match = run_extract_displayed_ordinal_task(message, grounding, helpers=helpers, normalized=normalized)
         if displayed_match:
             extraction["tasks"] = [
                 {
@@ -542,14 +635,16 @@ def run_extract_same_day_reference_update(
     grounding: Dict[str, Any],
     *,
     helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     if not isinstance(grounding, dict):
         return None
-    normalized = helpers["_normalize_query_text"](message)
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
     if not normalized:
         return None
 
-    match = re.search(r"\bsame\s+(?:day|date)\s+as\s+(?P<reference>.+)$", normalized)
+    match = _SAME_DAY_REFERENCE_PATTERN.search(normalized)
     if not match:
         return None
 
@@ -629,44 +724,50 @@ def _grounding_task_due_date(task_id: str, grounding: Dict[str, Any]) -> Optiona
     return None
 
 
-def run_is_completion_like_message(message: str, *, helpers: Dict[str, Any]) -> bool:
+def run_is_completion_like_message(
+    message: str,
+    *,
+    helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
+) -> bool:
     if not isinstance(message, str) or not message.strip():
         return False
     if "?" in message:
         return False
-    normalized = helpers["_normalize_query_text"](message)
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
     if not normalized:
         return False
-    if re.search(r"\bsame\s+(?:day|date)\s+as\b", normalized):
-        return False
-    if re.search(r"\bwant\s+(?:it|this|that|to)\s+done\b", normalized):
+    return _is_completion_like_normalized(normalized)
+
+
+@lru_cache(maxsize=256)
+def _is_completion_like_normalized(normalized: str) -> bool:
+    if _SAME_DAY_PHRASE_PATTERN.search(normalized):
         return False
-    if re.search(r"\bdone\s+eventually\b", normalized):
+    if _NOT_YET_DONE_PATTERN.search(normalized):
         return False
-    completion_patterns = (
-        r"\bdone\b",
-        r"\bcomplete(?:d)?\b",
-        r"\bfinished\b",
-        r"\bhandled\b",
-        r"\btook care of\b",
-    )
-    return any(re.search(pattern, normalized) for pattern in completion_patterns)
+    return bool(_COMPLETION_PATTERN.search(normalized))
 
 
-def run_is_archive_like_message(message: str, *, helpers: Dict[str, Any]) -> bool:
+def run_is_archive_like_message(
+    message: str,
+    *,
+    helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
+) -> bool:
     if not isinstance(message, str) or not message.strip():
         return False
-    normalized = helpers["_normalize_query_text"](message)
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
     if not normalized:
         return False
-    archive_patterns = (
-        r"\bdelete\b",
-        r"\bremove\b",
-        r"\barchive\b",
-        r"\bdiscard\b",
-        r"\bget rid of\b",
-    )
-    return any(re.search(pattern, normalized) for pattern in archive_patterns)
+    return _is_archive_like_normalized(normalized)
+
+
+@lru_cache(maxsize=256)
+def _is_archive_like_normalized(normalized: str) -> bool:
+    return bool(_ARCHIVE_PATTERN.search(normalized))
 
 
 def run_extract_displayed_ordinal_task(
@@ -674,6 +775,7 @@ def run_extract_displayed_ordinal_task(
     grounding: Dict[str, Any],
     *,
     helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     if not isinstance(grounding, dict):
         return None
@@ -681,53 +783,21 @@ def run_extract_displayed_ordinal_task(
     if not isinstance(rows, list) or not rows:
         return None
     raw_message = str(message or "")
-    normalized = helpers["_normalize_query_text"](message)
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
     if not normalized:
         return None
 
-    ordinal_tokens = [
-        ("second", 2),
-        ("2nd", 2),
-        ("third", 3),
-        ("3rd", 3),
-        ("fourth", 4),
-        ("4th", 4),
-        ("fifth", 5),
-        ("5th", 5),
-        ("sixth", 6),
-        ("6th", 6),
-        ("seventh", 7),
-        ("7th", 7),
-        ("eighth", 8),
-        ("8th", 8),
-        ("ninth", 9),
-        ("9th", 9),
-        ("tenth", 10),
-        ("10th", 10),
-        ("first", 1),
-        ("1st", 1),
-        ("two", 2),
-        ("three", 3),
-        ("four", 4),
-        ("five", 5),
-        ("six", 6),
-        ("seven", 7),
-        ("eight", 8),
-        ("nine", 9),
-        ("ten", 10),
-        ("one", 1),
-    ]
     ordinal = None
-    for token, value in ordinal_tokens:
-        if re.search(rf"\b{re.escape(token)}\b", normalized):
-            ordinal = value
-            break
+    matched_tokens = _ORDINAL_TOKEN_PATTERN.findall(normalized)
+    if matched_tokens:
+        ordinal = min(_ORDINAL_TOKEN_RANKS[token] for token in matched_tokens)[1]
     if ordinal is None:
-        match = re.search(r"(?:^|\s)#\s*(\d{1,2})\b", raw_message)
+        match = _HASH_ORDINAL_PATTERN.search(raw_message)
         if match:
             ordinal = int(match.group(1))
     if ordinal is None:
-        match = re.search(r"\bitem\s+(\d{1,2})\b", normalized)
+        match = _ITEM_ORDINAL_PATTERN.search(normalized)
         if match:
             ordinal = int(match.group(1))
     if ordinal is None:
@@ -745,34 +815,31 @@ def run_extract_displayed_ordinal_task(
     return None
 
 
-def run_extract_relative_due_date(message: str, *, helpers: Dict[str, Any]) -> Optional[str]:
-    normalized = helpers["_normalize_query_text"](message)
-    if not normalized:
+def run_extract_relative_due_date(
+    message: str,
+    *,
+    helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
+) -> Optional[str]:
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
+    if not normalized or not _RELATIVE_DATE_HINT_PATTERN.search(normalized):
         return None
     today = helpers["_local_today"]()
-    if re.search(r"\btomorrow\b", normalized):
+    if _TOMORROW_PATTERN.search(normalized):
         return (today + timedelta(days=1)).isoformat()
-    if re.search(r"\b(today|tonight)\b", normalized):
+    if _TODAY_PATTERN.search(normalized):
         return today.isoformat()
-    if re.search(r"\bnext week\b", normalized):
+    if _NEXT_WEEK_PATTERN.search(normalized):
         return (today + timedelta(days=7)).isoformat()
 
-    weekday_map = {
-        "monday": 0,
-        "tuesday": 1,
-        "wednesday": 2,
-        "thursday": 3,
-        "friday": 4,
-        "saturday": 5,
-        "sunday": 6,
-    }
-    for name, weekday in weekday_map.items():
-        if re.search(rf"\bnext\s+{name}\b", normalized):
+    for weekday, next_pattern, name_pattern, anchored_pattern in _WEEKDAY_PATTERNS:
+        if next_pattern.search(normalized):
             days_until_next_week_start = 7 - today.weekday()
             delta_days = days_until_next_week_start + weekday
             return (today + timedelta(days=delta_days)).isoformat()
-        if re.search(rf"\b{name}\b", normalized):
-            if not re.search(rf"\b(?:this|on|by|for)\s+{name}\b", normalized):
+        if name_pattern.search(normalized):
+            if not anchored_pattern.search(normalized):
                 continue
             delta_days = (weekday - today.weekday()) % 7
             if delta_days == 0:
@@ -781,18 +848,19 @@ def run_extract_relative_due_date(message: str, *, helpers: Dict[str, Any]) -> O
     return None
 
 
-def run_has_strict_relative_due_override(message: str, *, helpers: Dict[str, Any]) -> bool:
-    normalized = helpers["_normalize_query_text"](message)
+def run_has_strict_relative_due_override(
+    message: str,
+    *,
+    helpers: Dict[str, Any],
+    normalized: Optional[str] = None,
+) -> bool:
+    if normalized is None:
+        normalized = helpers["_normalize_query_text"](message)
     if not normalized:
         return False
-    if re.search(r"\bnext week\b", normalized):
+    if _NEXT_WEEK_PATTERN.search(normalized):
         return True
-    return bool(
-        re.search(
-            r"\bnext\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
-            normalized,
-        )
-    )
+    return bool(_NEXT_WEEKDAY_PATTERN.search(normalized))
 
 
 def run_resolve_relative_due_date_overrides(
@@ -803,13 +871,14 @@ def run_resolve_relative_due_date_overrides(
 ) -> Dict[str, Any]:
     if not isinstance(extraction, dict):
         return helpers["_empty_extraction"]()
-    inferred_due_date = run_extract_relative_due_date(message, helpers=helpers)
-    if not inferred_due_date:
-        return extraction
-    force_due_override = run_has_strict_relative_due_override(message, helpers=helpers)
     raw_tasks = extraction.get("tasks")
     if not isinstance(raw_tasks, list) or not raw_tasks:
         return extraction
+    normalized = helpers["_normalize_query_text"](message)
+    inferred_due_date = run_extract_relative_due_date(message, helpers=helpers, normalized=normalized)
+    if not inferred_due_date:
+        return extraction
+    force_due_override = run_has_strict_relative_due_override(message, helpers=helpers, normalized=normalized)
     if len([task for task in raw_tasks if isinstance(task, dict)]) > 1 and run_estimated_requested_change_count(message, helpers=helpers) >= 2:
         return extraction
     normalized_tasks: List[Any] = []
@@ -831,6 +900,57 @@ def run_resolve_relative_due_date_overrides(
     return out
 
 
+def run_sanitize_extraction(
+    message: str,
+    extraction: Dict[str, Any],
+    grounding: Dict[str, Any],
+    *,
+    helpers: Dict[str, Any],
+    sanitize_create: bool = True,
+    sanitize_reminders: bool = True,
+) -> Dict[str, Any]:
+    raw_tasks = extraction.get("tasks") if isinstance(extraction, dict) else None
+    raw_reminders = extraction.get("reminders") if isinstance(extraction, dict) else None
+    # Chit-chat extractions carry no tasks or reminders, and every pass below returns
+    # them unchanged.
+    if raw_tasks == [] and raw_reminders == []:
+        return extraction
+    # An explicitly empty task list passes through every task pass unchanged; skip them
+    # and the candidate indexing they share.
+    if not isinstance(raw_tasks, list) or raw_tasks:
+        prepared = helpers["_prepare_completion_candidates"](grounding)
+        extraction = helpers["_sanitize_completion_extraction"](extraction, grounding, prepared=prepared)
+        if sanitize_create:
+            extraction = helpers["_sanitize_create_extraction"](extraction)
+        extraction = helpers["_sanitize_targeted_task_actions"](message, extraction, grounding, prepared=prepared)
+    if sanitize_reminders:
+        extraction = helpers["_sanitize_targeted_reminder_actions"](message, extraction, grounding)
+        extraction = helpers["_apply_displayed_task_reference_extraction"](extraction, grounding)
+    return helpers["_resolve_relative_due_date_overrides"](message, extraction)
+
+
+def _clean_str(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    stripped = value.strip()
+    return stripped or None
+
+
+def _int_in_range(value: Any, low: int, high: int) -> Optional[int]:
+    return value if isinstance(value, int) and low <= value <= high else None
+
+
+def _clean_due_date(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    due_date = value.strip()[:10]
+    try:
+        date.fromisoformat(due_date)
+    except ValueError:
+        return None
+    return due_date
+
+
 def run_actions_to_extraction(actions: Any, *, helpers: Dict[str, Any]) -> Dict[str, Any]:
     extraction: Dict[str, Any] = helpers["_empty_extraction"]()
     if not isinstance(actions, list):
@@ -841,100 +961,75 @@ def run_actions_to_extraction(actions: Any, *, helpers: Dict[str, Any]) -> Dict[
         entity_type = action.get("entity_type")
         op = action.get("action")
         if entity_type == "task":
-            title = action.get("title")
-            if not isinstance(title, str) or not title.strip():
+            title = _clean_str(action.get("title"))
+            if title is None:
                 continue
-            task_item: Dict[str, Any] = {"title": title.strip()}
+            task_item: Dict[str, Any] = {"title": title}
             kind = action.get("kind")
-            if isinstance(kind, str) and kind in {"project", "task", "subtask"}:
+            if isinstance(kind, str) and kind in _TASK_KINDS:
                 task_item["kind"] = kind
-            if isinstance(op, str) and op in {"create", "update", "complete", "archive", "noop"}:
+            if isinstance(op, str) and op in _TASK_ACTIONS:
                 task_item["action"] = op
                 if op == "complete":
                     task_item["status"] = "done"
                 elif op == "archive":
                     task_item["status"] = "archived"
             status = action.get("status")
-            if isinstance(status, str) and status in {"open", "blocked", "done", "archived"}:
+            if isinstance(status, str) and status in _TASK_STATUSES:
                 task_item["status"] = status
-            target_task_id = action.get("target_task_id")
-            if isinstance(target_task_id, str) and target_task_id.strip():
-                task_item["target_task_id"] = target_task_id.strip()
-            parent_task_id = action.get("parent_task_id")
-            if isinstance(parent_task_id, str) and parent_task_id.strip():
-                task_item["parent_task_id"] = parent_task_id.strip()
-            parent_title = action.get("parent_title")
-            if isinstance(parent_title, str) and parent_title.strip():
-                task_item["parent_title"] = parent_title.strip()
-            priority = action.get("priority")
-            if isinstance(priority, int) and 1 <= priority <= 4:
-                task_item["priority"] = priority
-            impact_score = action.get("impact_score")
-            if isinstance(impact_score, int) and 1 <= impact_score <= 5:
-                task_item["impact_score"] = impact_score
-            urgency_score = action.get("urgency_score")
-            if isinstance(urgency_score, int) and 1 <= urgency_score <= 5:
-                task_item["urgency_score"] = urgency_score
-            notes = action.get("notes")
-            if isinstance(notes, str) and notes.strip():
-                task_item["notes"] = notes.strip()
-            due_date = action.get("due_date")
-            if isinstance(due_date, str):
-                try:
-                    date.fromisoformat(due_date.strip()[:10])
-                    task_item["due_date"] = due_date.strip()[:10]
-                except ValueError:
-                    pass
+            for key in ("target_task_id", "parent_task_id", "parent_title"):
+                value = _clean_str(action.get(key))
+                if value is not None:
+                    task_item[key] = value
+            for key, high in (("priority", 4), ("impact_score", 5), ("urgency_score", 5)):
+                score = _int_in_range(action.get(key), 1, high)
+                if score is not None:
+                    task_item[key] = score
+            notes = _clean_str(action.get("notes"))
+            if notes is not None:
+                task_item["notes"] = notes
+            due_date = _clean_due_date(action.get("due_date"))
+            if due_date is not None:
+                task_item["due_date"] = due_date
             extraction["tasks"].append(task_item)
         elif entity_type in {"goal", "problem"}:
-            title = action.get("title")
-            if not isinstance(title, str) or not title.strip():
+            title = _clean_str(action.get("title"))
+            if title is None:
                 continue
-            task_item: Dict[str, Any] = {"title": title.strip(), "kind": "project"}
-            if isinstance(op, str) and op in {"create", "update", "complete", "archive", "noop"}:
+            task_item: Dict[str, Any] = {"title": title, "kind": "project"}
+            if isinstance(op, str) and op in _TASK_ACTIONS:
                 task_item["action"] = op
                 if op == "complete":
                     task_item["status"] = "done"
                 elif op == "archive":
                     task_item["status"] = "archived"
             status = action.get("status")
-            if isinstance(status, str) and status in {"open", "blocked", "done", "archived"}:
+            if isinstance(status, str) and status in _TASK_STATUSES:
                 task_item["status"] = status
-            target_task_id = action.get("target_task_id") or action.get("target_goal_id") or action.get("target_problem_id")
-            if isinstance(target_task_id, str) and target_task_id.strip():
-                task_item["target_task_id"] = target_task_id.strip()
-            due_date = action.get("due_date")
-            if isinstance(due_date, str):
-                try:
-                    date.fromisoformat(due_date.strip()[:10])
-                    task_item["due_date"] = due_date.strip()[:10]
-                except ValueError:
-                    pass
+            target_task_id = _clean_str(
+                action.get("target_task_id") or action.get("target_goal_id") or action.get("target_problem_id")
+            )
+            if target_task_id is not None:
+                task_item["target_task_id"] = target_task_id
+            due_date = _clean_due_date(action.get("due_date"))
+            if due_date is not None:
+                task_item["due_date"] = due_date
             extraction["tasks"].append(task_item)
         elif entity_type == "link":
             link = {
-                "from_type": action.get("from_type"),
-                "from_title": action.get("from_title"),
-                "to_type": action.get("to_type"),
-                "to_title": action.get("to_title"),
-                "link_type": action.get("link_type"),
+                key: _clean_str(action.get(key))
+                for key in ("from_type", "from_title", "to_type", "to_title", "link_type")
             }
-            if all(isinstance(v, str) and v.strip() for v in link.values()):
-                extraction["links"].append({k: v.strip() for k, v in link.items()})
+            if all(value is not None for value in link.values()):
+                extraction["links"].append(link)
         elif entity_type == "reminder":
-            title = action.get("title")
-            target_reminder_id = action.get("target_reminder_id")
-            if not isinstance(title, str) or not title.strip():
-                if isinstance(target_reminder_id, str) and target_reminder_id.strip():
-                    title = target_reminder_id.strip()
-                else:
-                    message = action.get("message") or action.get("notes")
-                    if isinstance(message, str) and message.strip():
-                        title = message.strip()
-            if not isinstance(title, str) or not title.strip():
+            target_reminder_id = _clean_str(action.get("target_reminder_id"))
+            message = _clean_str(action.get("message") or action.get("notes"))
+            title = _clean_str(action.get("title")) or target_reminder_id or message
+            if title is None:
                 continue
-            reminder_item: Dict[str, Any] = {"title": title.strip()}
-            if isinstance(op, str) and op in {"create", "update", "complete", "dismiss", "cancel", "noop"}:
+            reminder_item: Dict[str, Any] = {"title": title}
+            if isinstance(op, str) and op in _REMINDER_ACTIONS:
                 reminder_item["action"] = op
                 if op == "complete":
                     reminder_item["status"] = "completed"
@@ -943,46 +1038,55 @@ def run_actions_to_extraction(actions: Any, *, helpers: Dict[str, Any]) -> Dict[
                 elif op == "cancel":
                     reminder_item["status"] = "canceled"
             status = action.get("status")
-            if isinstance(status, str) and status in {"pending", "sent", "completed", "dismissed", "canceled"}:
+            if isinstance(status, str) and status in _REMINDER_STATUSES:
                 reminder_item["status"] = status
-            if isinstance(target_reminder_id, str) and target_reminder_id.strip():
-                reminder_item["target_reminder_id"] = target_reminder_id.strip()
-            message = action.get("message") or action.get("notes")
-            if isinstance(message, str) and message.strip():
-                reminder_item["message"] = message.strip()
-            remind_at = action.get("remind_at")
-            if isinstance(remind_at, str) and remind_at.strip():
-                reminder_item["remind_at"] = remind_at.strip()
+            if target_reminder_id is not None:
+                reminder_item["target_reminder_id"] = target_reminder_id
+            if message is not None:
+                reminder_item["message"] = message
+            remind_at = _clean_str(action.get("remind_at"))
+            if remind_at is not None:
+                reminder_item["remind_at"] = remind_at
             kind = action.get("kind")
-            if isinstance(kind, str) and kind in {"one_off", "follow_up", "recurring"}:
+            if isinstance(kind, str) and kind in _REMINDER_KINDS:
                 reminder_item["kind"] = kind
-            recurrence_rule = action.get("recurrence_rule")
-            if isinstance(recurrence_rule, str) and recurrence_rule.strip():
-                reminder_item["recurrence_rule"] = recurrence_rule.strip()
-            work_item_id = action.get("work_item_id")
-            if isinstance(work_item_id, str) and work_item_id.strip():
-                reminder_item["work_item_id"] = work_item_id.strip()
-            person_id = action.get("person_id")
-            if isinstance(person_id, str) and person_id.strip():
-                reminder_item["person_id"] = person_id.strip()
+            for key in ("recurrence_rule", "work_item_id", "person_id"):
+                value = _clean_str(action.get(key))
+                if value is not None:
+                    reminder_item[key] = value
             extraction["reminders"].append(reminder_item)
     return extraction
 
 
+_NO_OPEN_DRAFT_MARKER = "none"
+_NO_OPEN_DRAFT_MARKER_TTL_SECONDS = 300
+
+
+def _open_draft_flag_key(user_id: str, chat_id: str) -> str:
+    return f"drf_open:{user_id}:{chat_id}"
+
+
+async def _clear_open_draft_flag(user_id: str, chat_id: str, *, helpers: Dict[str, Any]) -> None:
+    try:
+        await helpers["redis_client"].delete(_open_draft_flag_key(user_id, chat_id))
+    except Exception as exc:
+        helpers["logger"].warning("Failed to clear open draft flag for user %s chat %s: %s", user_id, chat_id, exc)
+
+
 async def run_get_open_action_draft(user_id: str, chat_id: str, db, *, helpers: Dict[str, Any]):
+    # Read-only on the per-turn path: stale drafts are filtered out here and marked
+    # expired when superseded (run_create_action_draft) or by the worker's draft sweep.
+    # Most chats have no open draft, so a DB miss is remembered in Redis; only the
+    # "none" marker short-circuits, and any other state (missing key, draft id,
+    # Redis error) falls through to the query.
+    redis_client = helpers["redis_client"]
+    flag_key = _open_draft_flag_key(user_id, chat_id)
+    try:
+        if await redis_client.get(flag_key) == _NO_OPEN_DRAFT_MARKER:
+            return None
+    except Exception as exc:
+        helpers["logger"].warning("Open draft flag lookup failed for user %s chat %s: %s", user_id, chat_id, exc)
     now = helpers["_draft_now"]()
-    expire_stmt = (
-        update(ActionDraft)
-        .where(
-            ActionDraft.user_id == user_id,
-            ActionDraft.chat_id == chat_id,
-            ActionDraft.status == "draft",
-            ActionDraft.expires_at < now,
-        )
-        .values(status="expired", updated_at=now)
-    )
-    await db.execute(expire_stmt)
-
     stmt = (
         select(ActionDraft)
         .where(
@@ -995,7 +1099,12 @@ async def run_get_open_action_draft(user_id: str, chat_id: str, db, *, helpers:
         .limit(1)
     )
     draft = (await db.execute(stmt)).scalar_one_or_none()
-    await db.commit()
+    if draft is None:
+        try:
+            # NX so a draft id written by a concurrent create is never overwritten.
+            await redis_client.set(flag_key, _NO_OPEN_DRAFT_MARKER, ex=_NO_OPEN_DRAFT_MARKER_TTL_SECONDS, nx=True)
+        except Exception as exc:
+            helpers["logger"].warning("Failed to cache missing open draft for user %s chat %s: %s", user_id, chat_id, exc)
     return draft
 
 
@@ -1017,12 +1126,12 @@ async def run_create_action_draft(
             ActionDraft.chat_id == chat_id,
             ActionDraft.status == "draft",
         )
-        .values(status="discarded", updated_at=now)
+        .values(status=case((ActionDraft.expires_at < now, "expired"), else_="discarded"), updated_at=now)
     )
     await db.execute(clear_stmt)
 
     draft = ActionDraft(
-        id=f"drf_{uuid.uuid4().hex[:12]}",
+        id=short_id("drf"),
         user_id=user_id,
         chat_id=chat_id,
         source_message=message,
@@ -1036,7 +1145,7 @@ async def run_create_action_draft(
     db.add(draft)
     db.add(
         EventLog(
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="action_draft_created",
@@ -1045,6 +1154,14 @@ async def run_create_action_draft(
         )
     )
     await db.commit()
+    try:
+        await helpers["redis_client"].setex(
+            _open_draft_flag_key(user_id, chat_id),
+            helpers["ACTION_DRAFT_TTL_SECONDS"],
+            draft.id,
+        )
+    except Exception as exc:
+        helpers["logger"].warning("Failed to replace open draft marker for user %s chat %s: %s", user_id, chat_id, exc)
     if "_invalidate_today_plan_cache" in helpers:
         try:
             await helpers["_invalidate_today_plan_cache"](user_id, chat_id)
@@ -1074,7 +1191,7 @@ async def run_discard_action_draft(draft, user_id: str, request_id: str, db, *,
     draft.updated_at = helpers["_draft_now"]()
     db.add(
         EventLog(
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="action_draft_discarded",
@@ -1083,6 +1200,7 @@ async def run_discard_action_draft(draft, user_id: str, request_id: str, db, *,
         )
     )
     await db.commit()
+    await _clear_open_draft_flag(user_id, draft.chat_id, helpers=helpers)
     if "_get_or_create_session" in helpers and "_update_session_state" in helpers:
         session = await helpers["_get_or_create_session"](db=db, user_id=user_id, chat_id=draft.chat_id)
         await helpers["_update_session_state"](
@@ -1113,14 +1231,9 @@ async def run_revise_action_draft(draft, user_id: str, request_id: str, edit_tex
         else:
             helpers["_merge_grounding_task_refs"](grounding, "recent_task_refs", clarification_candidates)
             helpers["_merge_grounding_task_refs"](grounding, "tasks", clarification_candidates)
-    extraction = await helpers["adapter"].extract_structured_updates(revised_message, grounding=grounding)
+    extraction = await helpers["_extract_structured_updates"](user_id, revised_message, grounding)
     extraction = helpers["_apply_intent_fallbacks"](revised_message, extraction, grounding)
-    extraction = helpers["_sanitize_completion_extraction"](extraction, grounding)
-    extraction = helpers["_sanitize_create_extraction"](extraction)
-    extraction = helpers["_sanitize_targeted_task_actions"](revised_message, extraction, grounding)
-    extraction = helpers["_sanitize_targeted_reminder_actions"](revised_message, extraction, grounding)
-    extraction = helpers["_apply_displayed_task_reference_extraction"](extraction, grounding)
-    extraction = helpers["_resolve_relative_due_date_overrides"](revised_message, extraction)
+    extraction = helpers["_sanitize_extraction"](revised_message, extraction, grounding)
     if clarification_kind == "reminder_schedule":
         extraction = await _run_apply_reminder_schedule_clarification(
             prior_extraction,
@@ -1132,10 +1245,9 @@ async def run_revise_action_draft(draft, user_id: str, request_id: str, edit_tex
         )
     if isinstance(clarification_candidates, list) and clarification_candidates:
         selected_candidate = helpers["_select_clarification_candidate"](edit_text, clarification_candidates)
-        if selected_candidate and (
-            not helpers["_has_actionable_entities"](extraction) or helpers["_unresolved_mutation_titles"](extraction)
-        ):
-            base_extraction = extraction if helpers["_has_actionable_entities"](extraction) else prior_extraction
+        extraction_actionable = helpers["_has_actionable_entities"](extraction)
+        if selected_candidate and (not extraction_actionable or helpers["_unresolved_mutation_titles"](extraction)):
+            base_extraction = extraction if extraction_actionable else prior_extraction
             if clarification_kind == "reminder_candidates":
                 extraction = helpers["_fill_clarified_reminder_target"](base_extraction, selected_candidate)
             else:
@@ -1146,11 +1258,12 @@ async def run_revise_action_draft(draft, user_id: str, request_id: str, edit_tex
     helpers["_draft_set_awaiting_edit_input"](draft, False)
     if helpers["_has_actionable_entities"](extraction) and not helpers["_unresolved_mutation_titles"](extraction):
         helpers["_draft_set_clarification_state"](draft, None)
-    draft.updated_at = helpers["_draft_now"]()
-    draft.expires_at = helpers["_draft_now"]() + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
+    draft_now = helpers["_draft_now"]()
+    draft.updated_at = draft_now
+    draft.expires_at = draft_now + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
     db.add(
         EventLog(
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="action_draft_revised",
@@ -1268,13 +1381,13 @@ def _parse_relative_reminder_schedule_reply(edit_text: str, *, helpers: Dict[str
     if now_local.tzinfo is None:
         now_local = now_local.replace(tzinfo=timezone.utc)
 
-    minute_match = re.search(r"\bin\s+(\d{1,3})\s*(?:minutes?|mins?|min)\b", normalized)
+    minute_match = _IN_MINUTES_PATTERN.search(normalized)
     if minute_match:
         minutes = int(minute_match.group(1))
         if 1 <= minutes <= 720:
             return (now_local + timedelta(minutes=minutes)).astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
-    hour_match = re.search(r"\bin\s+(\d{1,2})\s*(?:hours?|hrs?|hr)\b", normalized)
+    hour_match = _IN_HOURS_PATTERN.search(normalized)
     if hour_match:
         hours = int(hour_match.group(1))
         if 1 <= hours <= 72:
@@ -1332,7 +1445,7 @@ async def run_confirm_action_draft(draft, user_id: str, chat_id: str, request_id
     draft.updated_at = helpers["_draft_now"]()
     db.add(
         EventLog(
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="action_draft_confirmed",
@@ -1341,17 +1454,17 @@ async def run_confirm_action_draft(draft, user_id: str, chat_id: str, request_id
         )
     )
     await db.commit()
-    if "_invalidate_today_plan_cache" in helpers:
-        try:
-            await helpers["_invalidate_today_plan_cache"](user_id, chat_id)
-        except Exception as exc:
-            helpers["logger"].warning(
-                "Failed to invalidate today plan cache after confirming draft %s for user %s chat %s: %s",
-                draft.id,
-                user_id,
-                chat_id,
-                exc,
-            )
+    # Clear the draft flag and the stale today plan before replying, in one DEL, so the
+    # next turn or /today already sees the applied changes.
+    stale_keys = [_open_draft_flag_key(user_id, chat_id)]
+    if "_plan_cache_key" in helpers:
+        stale_keys.append(helpers["_plan_cache_key"](user_id, chat_id))
+    try:
+        await helpers["redis_client"].delete(*stale_keys)
+    except Exception as exc:
+        helpers["logger"].warning(
+            "Failed to clear draft flag and today plan cache for user %s chat %s: %s", user_id, chat_id, exc
+        )
     if "_get_or_create_session" in helpers and "_update_session_state" in helpers:
         session = await helpers["_get_or_create_session"](db=db, user_id=user_id, chat_id=chat_id)
         await helpers["_update_session_state"](
@@ -1362,29 +1475,54 @@ async def run_confirm_action_draft(draft, user_id: str, chat_id: str, request_id
             pending_draft_id=None,
             pending_clarification=None,
         )
-    summary_enqueued = True
-    summary_error: Optional[str] = None
+    # The changes are committed; queueing the summary should not hold up the user's reply.
+    helpers["_spawn_background_task"](
+        helpers["_post_confirm_side_effects"](
+            draft_id=draft.id,
+            user_id=user_id,
+            chat_id=chat_id,
+            request_id=request_id,
+            inbox_item_id=inbox_item_id,
+        )
+    )
+    return applied
+
+
+async def run_post_confirm_side_effects(
+    draft_id: str,
+    user_id: str,
+    chat_id: str,
+    request_id: str,
+    inbox_item_id: str,
+    *,
+    helpers: Dict[str, Any],
+) -> None:
     try:
-        await helpers["_enqueue_summary_job"](user_id=user_id, chat_id=chat_id, inbox_item_id=inbox_item_id)
+        await helpers["_enqueue_summary_job"](
+            user_id=user_id,
+            chat_id=chat_id,
+            inbox_item_id=inbox_item_id,
+        )
+        return
     except Exception as exc:
-        summary_enqueued = False
         summary_error = str(exc)
-        helpers["logger"].error("Failed to enqueue memory summary for draft %s: %s", draft.id, exc)
-
-    if not summary_enqueued:
-        db.add(
-            EventLog(
-                id=str(uuid.uuid4()),
-                request_id=request_id,
-                user_id=user_id,
-                event_type="action_apply_background_enqueue_failure",
-                payload_json={
-                    "draft_id": draft.id,
-                    "summary_enqueued": summary_enqueued,
-                    "summary_error": summary_error,
-                },
-                created_at=helpers["utc_now"](),
+        helpers["logger"].error("Failed to enqueue memory summary for draft %s: %s", draft_id, exc)
+    try:
+        async with helpers["AsyncSessionLocal"]() as db:
+            db.add(
+                EventLog(
+                    id=new_uuid(),
+                    request_id=request_id,
+                    user_id=user_id,
+                    event_type="action_apply_background_enqueue_failure",
+                    payload_json={
+                        "draft_id": draft_id,
+                        "summary_enqueued": False,
+                        "summary_error": summary_error,
+                    },
+                    created_at=helpers["utc_now"](),
+                )
             )
-        )
-        await db.commit()
-    return applied
+            await db.commit()
+    except Exception as exc:
+        helpers["logger"].error("Failed to record enqueue failure for draft %s: %s", draft_id, exc)
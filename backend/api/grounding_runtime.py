@@ -1,17 +1,78 @@
+import asyncio
+import hashlib
+import heapq
 import json
 import re
 import uuid
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import and_, select
 
+from common.ids import new_uuid, short_id
 from common.models import EntityType, RecentContextItem, Reminder, ReminderStatus, WorkItem, WorkItemKind, WorkItemStatus
 
+_GROUNDING_TERM_PATTERN = re.compile(r"[a-zA-Z0-9]{3,}")
+_GROUNDING_STOPWORDS = frozenset({"the", "and", "for", "with", "that", "this", "from", "have", "need"})
+_EXTRACTION_LOCK_POLL_SECONDS = 0.2
+_EXTRACTION_LOCK_MAX_POLLS = 25
+# Grounding reads only these columns; selecting them skips attributes_json, timestamps and
+# identity-map bookkeeping for up to 80 work items and 40 reminders per turn.
+_GROUNDING_WORK_ITEM_COLUMNS = (
+    WorkItem.id,
+    WorkItem.title,
+    WorkItem.notes,
+    WorkItem.status,
+    WorkItem.priority,
+    WorkItem.due_at,
+    WorkItem.parent_id,
+)
+_GROUNDING_REMINDER_COLUMNS = (
+    Reminder.id,
+    Reminder.title,
+    Reminder.status,
+    Reminder.kind,
+    Reminder.message,
+    Reminder.remind_at,
+    Reminder.recurrence_rule,
+    Reminder.work_item_id,
+    Reminder.person_id,
+)
+
 
 def run_grounding_terms(message: str) -> set[str]:
-    terms = set(re.findall(r"[a-zA-Z0-9]{3,}", (message or "").lower()))
-    return {t for t in terms if t not in {"the", "and", "for", "with", "that", "this", "from", "have", "need"}}
+    return set(_GROUNDING_TERM_PATTERN.findall((message or "").lower())) - _GROUNDING_STOPWORDS
+
+
+def _term_hits_by_row(texts: List[str], terms: set[str]) -> List[set[str]]:
+    # Search each term once across all rows joined by newlines (terms never contain one)
+    # instead of once per row, then map match offsets back to rows.
+    hits: List[set[str]] = [set() for _ in texts]
+    if not terms or not texts:
+        return hits
+    starts: List[int] = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    starts.append(offset)
+    blob = "\n".join(texts)
+    for term in terms:
+        pos = blob.find(term)
+        while pos != -1:
+            row = bisect_right(starts, pos) - 1
+            hits[row].add(term)
+            pos = blob.find(term, starts[row + 1])
+    return hits
+
+
+def _term_overlap_scores(primary_texts: List[str], secondary_texts: List[str], terms: set[str]) -> List[int]:
+    """Score 3 per term in the primary text, otherwise 1 if it appears in the secondary text."""
+    primary_hits = _term_hits_by_row(primary_texts, terms)
+    secondary_hits = _term_hits_by_row(secondary_texts, terms)
+    return [3 * len(primary) + len(secondary - primary) for primary, secondary in zip(primary_hits, secondary_hits)]
 
 
 async def run_build_extraction_grounding(
@@ -24,7 +85,7 @@ async def run_build_extraction_grounding(
 ) -> Dict[str, Any]:
     task_rows = (
         await db.execute(
-            select(WorkItem)
+            select(*_GROUNDING_WORK_ITEM_COLUMNS)
             .where(
                 WorkItem.user_id == user_id,
                 WorkItem.kind.in_([WorkItemKind.project, WorkItemKind.task, WorkItemKind.subtask]),
@@ -33,7 +94,7 @@ async def run_build_extraction_grounding(
             .order_by(WorkItem.updated_at.desc())
             .limit(80)
         )
-    ).scalars().all()
+    ).all()
     parent_ids = {
         task.parent_id
         for task in task_rows
@@ -43,12 +104,12 @@ async def run_build_extraction_grounding(
     if parent_ids:
         parent_rows = (
             await db.execute(
-                select(WorkItem).where(
+                select(WorkItem.id, WorkItem.title).where(
                     WorkItem.user_id == user_id,
                     WorkItem.id.in_(parent_ids),
                 )
             )
-        ).scalars().all()
+        ).all()
         parent_titles_by_id = {
             parent.id: helpers["_canonical_task_title"](parent.title)
             for parent in parent_rows
@@ -56,17 +117,15 @@ async def run_build_extraction_grounding(
         }
     prepared = []
     terms = helpers["_grounding_terms"](message)
+    visible_titles = [helpers["_canonical_task_title"](task.title) for task in task_rows]
+    task_overlaps = _term_overlap_scores(
+        [title.lower() for title in visible_titles],
+        [(task.notes or "").lower() for task in task_rows],
+        terms,
+    )
     for idx, task in enumerate(task_rows):
-        visible_title = helpers["_canonical_task_title"](task.title)
-        title_l = visible_title.lower()
-        notes_l = (task.notes or "").lower()
-        overlap = 0
-        if terms:
-            for term in terms:
-                if term in title_l:
-                    overlap += 3
-                elif term in notes_l:
-                    overlap += 1
+        visible_title = visible_titles[idx]
+        overlap = task_overlaps[idx]
         status = task.status.value if hasattr(task.status, "value") else str(task.status)
         status_boost = 2 if status == "open" else 0
         recency_boost = max(0, 10 - idx)
@@ -87,13 +146,21 @@ async def run_build_extraction_grounding(
                 },
             )
         )
-    prepared.sort(key=lambda item: item[0], reverse=True)
     max_items = 12 if terms else 8
-    tasks = [item[1] for item in prepared[:max_items]]
+    tasks = [item[1] for item in heapq.nlargest(max_items, prepared, key=lambda item: item[0])]
     recent_refs: List[Dict[str, Any]] = []
     now = helpers["utc_now"]()
+    # Outer join so context rows whose work item is gone still count toward the recent window.
     recent_stmt = (
-        select(RecentContextItem)
+        select(RecentContextItem.entity_id, RecentContextItem.reason, *_GROUNDING_WORK_ITEM_COLUMNS)
+        .outerjoin(
+            WorkItem,
+            and_(
+                WorkItem.id == RecentContextItem.entity_id,
+                WorkItem.user_id == user_id,
+                WorkItem.kind.in_([WorkItemKind.project, WorkItemKind.task, WorkItemKind.subtask]),
+            ),
+        )
         .where(
             RecentContextItem.user_id == user_id,
             RecentContextItem.chat_id == chat_id,
@@ -103,12 +170,15 @@ async def run_build_extraction_grounding(
         .order_by(RecentContextItem.surfaced_at.desc())
         .limit(24)
     )
-    recent_rows = (await db.execute(recent_stmt)).scalars().all()
+    recent_rows = (await db.execute(recent_stmt)).all()
     recent_task_ids: List[str] = []
     displayed_meta_by_ordinal: Dict[int, Dict[str, Any]] = {}
     latest_display_batch_id: Optional[str] = None
+    task_by_id: Dict[str, Any] = {}
     seen: set[str] = set()
     for row in recent_rows:
+        if row.id is not None:
+            task_by_id[row.id] = row
         parsed_reason = helpers["_parse_recent_display_reason"](row.reason)
         if parsed_reason:
             view_name, batch_id, ordinal = parsed_reason
@@ -130,24 +200,11 @@ async def run_build_extraction_grounding(
             recent_task_ids.append(row.entity_id)
         if len(recent_task_ids) >= 8:
             break
-    displayed_task_ids = [meta["id"] for _, meta in sorted(displayed_meta_by_ordinal.items())]
-    combined_task_ids: List[str] = []
-    seen_combined: set[str] = set()
-    for task_id in recent_task_ids + displayed_task_ids:
-        if isinstance(task_id, str) and task_id and task_id not in seen_combined:
-            seen_combined.add(task_id)
-            combined_task_ids.append(task_id)
     displayed_refs: List[Dict[str, Any]] = []
-    if combined_task_ids:
-        recent_tasks_stmt = select(WorkItem).where(
-            WorkItem.user_id == user_id,
-            WorkItem.id.in_(combined_task_ids),
-            WorkItem.kind.in_([WorkItemKind.project, WorkItemKind.task, WorkItemKind.subtask]),
-        )
-        recent_tasks = (await db.execute(recent_tasks_stmt)).scalars().all()
+    if task_by_id:
         extra_parent_ids = {
             task.parent_id
-            for task in recent_tasks
+            for task in task_by_id.values()
             if isinstance(getattr(task, "parent_id", None), str)
             and task.parent_id.strip()
             and task.parent_id not in parent_titles_by_id
@@ -155,12 +212,12 @@ async def run_build_extraction_grounding(
         if extra_parent_ids:
             extra_parent_rows = (
                 await db.execute(
-                    select(WorkItem).where(
+                    select(WorkItem.id, WorkItem.title).where(
                         WorkItem.user_id == user_id,
                         WorkItem.id.in_(extra_parent_ids),
                     )
                 )
-            ).scalars().all()
+            ).all()
             parent_titles_by_id.update(
                 {
                     parent.id: helpers["_canonical_task_title"](parent.title)
@@ -168,7 +225,6 @@ async def run_build_extraction_grounding(
                     if isinstance(parent.id, str) and parent.id.strip()
                 }
             )
-        task_by_id = {task.id: task for task in recent_tasks}
         for task_id in recent_task_ids:
             task = task_by_id.get(task_id)
             if not task:
@@ -201,7 +257,7 @@ async def run_build_extraction_grounding(
 
     recent_reminder_refs: List[Dict[str, Any]] = []
     recent_reminder_stmt = (
-        select(RecentContextItem)
+        select(RecentContextItem.entity_id)
         .where(
             RecentContextItem.user_id == user_id,
             RecentContextItem.chat_id == chat_id,
@@ -211,18 +267,21 @@ async def run_build_extraction_grounding(
         .order_by(RecentContextItem.surfaced_at.desc())
         .limit(12)
     )
-    recent_reminder_rows = (await db.execute(recent_reminder_stmt)).scalars().all()
+    recent_reminder_entity_ids = (await db.execute(recent_reminder_stmt)).scalars().all()
     recent_reminder_ids: List[str] = []
     seen_reminder_ids: set[str] = set()
-    for row in recent_reminder_rows:
-        if isinstance(row.entity_id, str) and row.entity_id and row.entity_id not in seen_reminder_ids:
-            seen_reminder_ids.add(row.entity_id)
-            recent_reminder_ids.append(row.entity_id)
-    reminder_by_id: Dict[str, Reminder] = {}
+    for entity_id in recent_reminder_entity_ids:
+        if isinstance(entity_id, str) and entity_id and entity_id not in seen_reminder_ids:
+            seen_reminder_ids.add(entity_id)
+            recent_reminder_ids.append(entity_id)
+    reminder_by_id: Dict[str, Any] = {}
     reminder_work_item_titles_by_id: Dict[str, str] = {}
     if recent_reminder_ids:
-        recent_reminders_stmt = select(Reminder).where(Reminder.user_id == user_id, Reminder.id.in_(recent_reminder_ids))
-        recent_reminders = (await db.execute(recent_reminders_stmt)).scalars().all()
+        recent_reminders_stmt = select(*_GROUNDING_REMINDER_COLUMNS).where(
+            Reminder.user_id == user_id,
+            Reminder.id.in_(recent_reminder_ids),
+        )
+        recent_reminders = (await db.execute(recent_reminders_stmt)).all()
         reminder_by_id = {reminder.id: reminder for reminder in recent_reminders}
         linked_work_item_ids = {
             reminder.work_item_id
@@ -232,12 +291,12 @@ async def run_build_extraction_grounding(
         if linked_work_item_ids:
             linked_work_items = (
                 await db.execute(
-                    select(WorkItem).where(
+                    select(WorkItem.id, WorkItem.title).where(
                         WorkItem.user_id == user_id,
                         WorkItem.id.in_(linked_work_item_ids),
                     )
                 )
-            ).scalars().all()
+            ).all()
             reminder_work_item_titles_by_id.update(
                 {
                     item.id: helpers["_canonical_task_title"](item.title)
@@ -265,7 +324,7 @@ async def run_build_extraction_grounding(
 
     reminder_rows = (
         await db.execute(
-            select(Reminder)
+            select(*_GROUNDING_REMINDER_COLUMNS)
             .where(
                 Reminder.user_id == user_id,
                 Reminder.status.in_([ReminderStatus.pending, ReminderStatus.sent]),
@@ -273,7 +332,7 @@ async def run_build_extraction_grounding(
             .order_by(Reminder.updated_at.desc())
             .limit(40)
         )
-    ).scalars().all()
+    ).all()
     linked_work_item_ids = {
         reminder.work_item_id
         for reminder in reminder_rows
@@ -282,12 +341,12 @@ async def run_build_extraction_grounding(
     if linked_work_item_ids:
         linked_work_items = (
             await db.execute(
-                select(WorkItem).where(
+                select(WorkItem.id, WorkItem.title).where(
                     WorkItem.user_id == user_id,
                     WorkItem.id.in_(linked_work_item_ids),
                 )
             )
-        ).scalars().all()
+        ).all()
         reminder_work_item_titles_by_id.update(
             {
                 item.id: helpers["_canonical_task_title"](item.title)
@@ -296,16 +355,13 @@ async def run_build_extraction_grounding(
             }
         )
     prepared_reminders = []
+    reminder_overlaps = _term_overlap_scores(
+        [str(reminder.title or "").lower() for reminder in reminder_rows],
+        [str(reminder.message or "").lower() for reminder in reminder_rows],
+        terms,
+    )
     for idx, reminder in enumerate(reminder_rows):
-        title_l = str(reminder.title or "").lower()
-        message_l = str(reminder.message or "").lower()
-        overlap = 0
-        if terms:
-            for term in terms:
-                if term in title_l:
-                    overlap += 3
-                elif term in message_l:
-                    overlap += 1
+        overlap = reminder_overlaps[idx]
         status_value = getattr(reminder.status, "value", reminder.status)
         status_text = str(status_value or "").strip().lower()
         status_boost = 3 if status_text == "pending" else 1 if status_text == "sent" else 0
@@ -330,14 +386,13 @@ async def run_build_extraction_grounding(
                 },
             )
         )
-    prepared_reminders.sort(key=lambda item: item[0], reverse=True)
     max_reminders = 12 if terms else 8
-    reminders = [item[1] for item in prepared_reminders[:max_reminders]]
+    reminders = [item[1] for item in heapq.nlargest(max_reminders, prepared_reminders, key=lambda item: item[0])]
 
     return {
         "chat_id": chat_id,
-        "current_date_utc": helpers["utc_now"]().date().isoformat(),
-        "current_datetime_utc": helpers["utc_now"]().isoformat(),
+        "current_date_utc": now.date().isoformat(),
+        "current_datetime_utc": now.isoformat(),
         "current_date_local": helpers["_local_today"]().isoformat(),
         "current_datetime_local": helpers["_local_now"]().isoformat(),
         "timezone": helpers["settings"].APP_TIMEZONE,
@@ -349,13 +404,118 @@ async def run_build_extraction_grounding(
     }
 
 
-async def run_enqueue_summary_job(user_id: str, chat_id: str, inbox_item_id: str, *, helpers: Dict[str, Any]) -> None:
+def run_extraction_cache_key(user_id: str, message: str, grounding: Dict[str, Any]) -> str:
+    # Timestamps are truncated to the minute so replays inside the TTL share a key
+    # while relative times ("in 10 minutes") never resolve against a stale clock.
+    digest_source = dict(grounding) if isinstance(grounding, dict) else {}
+    for key in ("current_datetime_utc", "current_datetime_local"):
+        if isinstance(digest_source.get(key), str):
+            digest_source[key] = digest_source[key][:16]
+    grounding_digest = json.dumps(digest_source, sort_keys=True, default=str)
+    normalized_message = " ".join((message or "").split())
+    raw = f"{user_id}|{normalized_message}|{grounding_digest}"
+    return "extract:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _decode_cached_extraction(cached: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not cached:
+        return None
+    extraction = json.loads(cached)
+    return extraction if isinstance(extraction, dict) else None
+
+
+def _passes_validation(extraction: Any, *, helpers: Dict[str, Any]) -> bool:
+    try:
+        helpers["_validate_extraction_payload"](extraction)
+    except Exception:
+        return False
+    return True
+
+
+async def run_extract_structured_updates(
+    user_id: str,
+    message: str,
+    grounding: Dict[str, Any],
+    *,
+    helpers: Dict[str, Any],
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    ttl = helpers["settings"].EXTRACTION_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return await helpers["adapter"].extract_structured_updates(message, grounding=grounding)
+
+    redis_client = helpers["redis_client"]
+    cache_key = run_extraction_cache_key(user_id, message, grounding)
+    lock_key = f"{cache_key}:lock"
+    lock_claimed = False
+    # A retry after a rejected result skips the lookup so it reaches the model again.
+    if use_cache:
+        try:
+            cached = _decode_cached_extraction(await redis_client.get(cache_key))
+            if cached is not None:
+                return cached
+            lock_claimed = bool(await redis_client.set(lock_key, "1", nx=True, ex=ttl))
+            if not lock_claimed:
+                # Another retry of the same turn is already calling the model; wait for its result.
+                # The leader always releases the lock, so a free lock with nothing cached means it
+                # failed or had nothing worth caching, and waiting longer cannot help.
+                for _ in range(_EXTRACTION_LOCK_MAX_POLLS):
+                    await asyncio.sleep(_EXTRACTION_LOCK_POLL_SECONDS)
+                    cached_raw, lock_held = await redis_client.mget(cache_key, lock_key)
+                    cached = _decode_cached_extraction(cached_raw)
+                    if cached is not None:
+                        return cached
+                    if not lock_held:
+                        break
+        except Exception as exc:
+            helpers["logger"].warning("Extraction cache lookup failed for user %s: %s", user_id, exc)
+
+    try:
+        extraction = await helpers["adapter"].extract_structured_updates(message, grounding=grounding)
+        try:
+            # Empty results are usually provider fallbacks, and invalid ones would be rejected
+            # again on replay; let the next retry ask the model instead.
+            if helpers["_has_actionable_entities"](extraction) and _passes_validation(extraction, helpers=helpers):
+                cached_payload = {key: value for key, value in extraction.items() if key != "usage"}
+                await redis_client.setex(cache_key, ttl, json.dumps(cached_payload))
+        except Exception as exc:
+            helpers["logger"].warning("Failed to cache extraction for user %s: %s", user_id, exc)
+    finally:
+        if lock_claimed:
+            try:
+                await redis_client.delete(lock_key)
+            except Exception as exc:
+                helpers["logger"].warning("Failed to release extraction lock for user %s: %s", user_id, exc)
+    return extraction
+
+
+async def run_enqueue_summary_job(
+    user_id: str,
+    chat_id: str,
+    inbox_item_id: str,
+    *,
+    helpers: Dict[str, Any],
+    invalidate_plan_cache: bool = False,
+) -> None:
     job_payload = {
-        "job_id": str(uuid.uuid4()),
+        "job_id": new_uuid(),
         "topic": "memory.summarize",
         "payload": {"user_id": user_id, "chat_id": chat_id, "inbox_item_id": inbox_item_id},
     }
-    await helpers["redis_client"].rpush("default_queue", json.dumps(job_payload))
+    if not invalidate_plan_cache:
+        await helpers["redis_client"].rpush("default_queue", orjson.dumps(job_payload))
+        return
+    # Applying changes both stales the today plan and queues a summary; send both in one round trip.
+    async with helpers["redis_client"].pipeline(transaction=False) as pipe:
+        pipe.delete(helpers["_plan_cache_key"](user_id, chat_id))
+        pipe.rpush("default_queue", orjson.dumps(job_payload))
+        invalidated, enqueued = await pipe.execute(raise_on_error=False)
+    if isinstance(invalidated, Exception):
+        helpers["logger"].warning(
+            "Failed to invalidate today plan cache for user %s chat %s: %s", user_id, chat_id, invalidated
+        )
+    if isinstance(enqueued, Exception):
+        raise enqueued
 
 
 async def run_remember_recent_tasks(
@@ -437,7 +597,7 @@ async def run_remember_displayed_tasks(
     for ordinal, task_id in enumerate(unique_ids[:12], start=1):
         db.add(
             RecentContextItem(
-                id=f"rcx_{uuid.uuid4().hex[:12]}",
+                id=short_id("rcx"),
                 user_id=user_id,
                 chat_id=chat_id,
                 entity_type=EntityType.work_item,
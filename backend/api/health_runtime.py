@@ -1,5 +1,15 @@
+import asyncio
+import json
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+import httpx
+
+from common.http_pool import LoopBoundClient
+
+PREFLIGHT_REPORT_CACHE_KEY = "preflight:report"
+PREFLIGHT_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8)
+_http_client = LoopBoundClient()
 
 
 def run_external_preflight_required(*, helpers: Dict[str, Any]) -> bool:
@@ -10,7 +20,21 @@ def run_http_ok_status(code: int) -> bool:
     return 200 <= code < 300
 
 
-async def run_check_llm_credentials(*, helpers: Dict[str, Any]) -> Dict[str, Any]:
+def run_preflight_http_client(*, helpers: Dict[str, Any]) -> httpx.AsyncClient:
+    """Return the pooled preflight client, creating it for the running event loop."""
+    return _http_client.get(
+        lambda: helpers["httpx"].AsyncClient(
+            timeout=helpers["settings"].PREFLIGHT_TIMEOUT_SECONDS,
+            limits=PREFLIGHT_HTTP_LIMITS,
+        )
+    )
+
+
+async def close_preflight_http_client() -> None:
+    await _http_client.aclose()
+
+
+async def run_check_llm_credentials(*, helpers: Dict[str, Any], client: Optional[Any] = None) -> Dict[str, Any]:
     base = (helpers["settings"].LLM_API_BASE_URL or "").strip().rstrip("/")
     api_key = (helpers["settings"].LLM_API_KEY or "").strip()
     if not base:
@@ -18,11 +42,10 @@ async def run_check_llm_credentials(*, helpers: Dict[str, Any]) -> Dict[str, Any
     if not api_key:
         return {"ok": False, "reason": "llm_api_key_missing"}
     try:
-        async with helpers["httpx"].AsyncClient(timeout=helpers["settings"].PREFLIGHT_TIMEOUT_SECONDS) as client:
-            response = await client.get(
-                f"{base}/models",
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
+        response = await (client or helpers["_preflight_http_client"]()).get(
+            f"{base}/models",
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
         if run_http_ok_status(response.status_code):
             return {"ok": True}
         if response.status_code in {401, 403}:
@@ -32,14 +55,13 @@ async def run_check_llm_credentials(*, helpers: Dict[str, Any]) -> Dict[str, Any
         return {"ok": False, "reason": "llm_unreachable"}
 
 
-async def run_check_telegram_credentials(*, helpers: Dict[str, Any]) -> Dict[str, Any]:
+async def run_check_telegram_credentials(*, helpers: Dict[str, Any], client: Optional[Any] = None) -> Dict[str, Any]:
     token = (helpers["settings"].TELEGRAM_BOT_TOKEN or "").strip()
     if not token:
         return {"ok": True, "skipped": True, "reason": "telegram_token_not_configured"}
     base = (helpers["settings"].TELEGRAM_API_BASE or "https://api.telegram.org").rstrip("/")
     try:
-        async with helpers["httpx"].AsyncClient(timeout=helpers["settings"].PREFLIGHT_TIMEOUT_SECONDS) as client:
-            response = await client.get(f"{base}/bot{token}/getMe")
+        response = await (client or helpers["_preflight_http_client"]()).get(f"{base}/bot{token}/getMe")
         if not run_http_ok_status(response.status_code):
             if response.status_code in {401, 403}:
                 return {"ok": False, "reason": "telegram_auth_failed"}
@@ -53,8 +75,13 @@ async def run_check_telegram_credentials(*, helpers: Dict[str, Any]) -> Dict[str
 
 
 async def run_compute_preflight_report(*, helpers: Dict[str, Any]) -> Dict[str, Any]:
-    llm = await helpers["_check_llm_credentials"]()
-    telegram = await helpers["_check_telegram_credentials"]()
+    # The probes are independent; run them together over the pooled client so the
+    # report costs the slower probe rather than both.
+    client = helpers["_preflight_http_client"]()
+    llm, telegram = await asyncio.gather(
+        helpers["_check_llm_credentials"](client=client),
+        helpers["_check_telegram_credentials"](client=client),
+    )
     checks = {"llm": llm, "telegram": telegram}
     return {
         "ok": all(isinstance(item, dict) and item.get("ok") is True for item in checks.values()),
@@ -75,7 +102,46 @@ async def run_get_preflight_report(force: bool = False, *, helpers: Dict[str, An
         )
         if not force and fresh:
             return cached
-        report = await helpers["_compute_preflight_report"]()
-        helpers["_preflight_cache"]["checked_at"] = now
+        ttl_seconds = max(1, helpers["settings"].PREFLIGHT_CACHE_SECONDS)
+        report = None
+        # Workers share the last report through Redis so probes run once per window, not once per process.
+        if not force:
+            try:
+                shared = await helpers["redis_client"].get(PREFLIGHT_REPORT_CACHE_KEY)
+                if shared:
+                    report = json.loads(shared)
+            except Exception as exc:
+                helpers["logger"].warning("Preflight report cache lookup failed: %s", exc)
+        if not isinstance(report, dict):
+            report = await helpers["_compute_preflight_report"]()
+            try:
+                await helpers["redis_client"].setex(PREFLIGHT_REPORT_CACHE_KEY, ttl_seconds, json.dumps(report))
+            except Exception as exc:
+                helpers["logger"].warning("Failed to cache preflight report: %s", exc)
+        checked_at = now
+        if isinstance(report.get("checked_at"), str):
+            try:
+                checked_at = datetime.fromisoformat(report["checked_at"])
+            except ValueError:
+                pass
+        helpers["_preflight_cache"]["checked_at"] = checked_at
         helpers["_preflight_cache"]["report"] = report
         return report
+
+
+async def run_cached_preflight_report(*, helpers: Dict[str, Any]) -> Dict[str, Any]:
+    """Serve the last known report, even if stale; only probe when nothing has been cached yet."""
+    cached = helpers["_preflight_cache"].get("report")
+    if isinstance(cached, dict):
+        return cached
+    return await helpers["_get_preflight_report"]()
+
+
+async def run_preflight_refresher(*, helpers: Dict[str, Any]) -> None:
+    interval = max(1, helpers["settings"].PREFLIGHT_CACHE_SECONDS)
+    while True:
+        try:
+            await helpers["_get_preflight_report"]()
+        except Exception as exc:
+            helpers["logger"].warning("Preflight refresh failed: %s", exc)
+        await asyncio.sleep(interval)
@@ -1,5 +1,5 @@
+import asyncio
 import time
-import uuid
 from typing import Any, Dict
 
 from fastapi import Depends, FastAPI, HTTPException, Request
@@ -12,6 +12,7 @@ from api.schemas import (
     ThoughtCaptureRequest,
     ThoughtCaptureResponse,
 )
+from common.ids import new_uuid
 
 
 async def run_create_telegram_link_token(user_id: str, db, *, helpers: Dict[str, Any]):
@@ -59,7 +60,21 @@ async def run_telegram_webhook(request: Request, db, *, helpers: Dict[str, Any])
 async def run_capture_thought(request: Request, payload: ThoughtCaptureRequest, user_id: str, db, *, helpers: Dict[str, Any]):
     if hasattr(request.state, "idempotent_response"):
         return request.state.idempotent_response
-    await helpers["enforce_rate_limit"](user_id, "capture", helpers["settings"].RATE_LIMIT_CAPTURE_PER_WINDOW)
+    # The limiter only touches Redis and grounding only reads the DB, so the first attempt's
+    # grounding is fetched while the limiter round trip is in flight; a rejected request
+    # cancels it before it can do more work. Grounding must finish before anything else
+    # uses the session: an AsyncSession does not allow concurrent operations.
+    prefetched_grounding = asyncio.ensure_future(
+        helpers["_build_extraction_grounding"](db=db, user_id=user_id, chat_id=payload.chat_id, message=payload.message)
+    )
+    try:
+        await helpers["enforce_rate_limit"](user_id, "capture", helpers["settings"].RATE_LIMIT_CAPTURE_PER_WINDOW)
+    except BaseException:
+        prefetched_grounding.cancel()
+        await asyncio.gather(prefetched_grounding, return_exceptions=True)
+        raise
+    # Wait without raising; a grounding failure counts against the first attempt below.
+    await asyncio.wait([prefetched_grounding])
     request_id = request.state.request_id
     session = await helpers["_get_or_create_session"](db=db, user_id=user_id, chat_id=payload.chat_id)
     await helpers["_update_session_state"](
@@ -75,21 +90,29 @@ async def run_capture_thought(request: Request, payload: ThoughtCaptureRequest,
     for attempt_num in range(1, 3):
         start_time = time.time()
         try:
-            grounding = await helpers["_build_extraction_grounding"](
-                db=db, user_id=user_id, chat_id=payload.chat_id, message=payload.message
+            if attempt_num == 1:
+                grounding = prefetched_grounding.result()
+            else:
+                grounding = await helpers["_build_extraction_grounding"](
+                    db=db, user_id=user_id, chat_id=payload.chat_id, message=payload.message
+                )
+            # Attempt 1's result may be the cached one that was just rejected; ask the model again.
+            extraction = await helpers["_extract_structured_updates"](
+                user_id, payload.message, grounding, use_cache=attempt_num == 1
             )
-            extraction = await helpers["adapter"].extract_structured_updates(payload.message, grounding=grounding)
             extraction = helpers["_apply_intent_fallbacks"](payload.message, extraction, grounding)
-            extraction = helpers["_sanitize_completion_extraction"](extraction, grounding)
-            extraction = helpers["_sanitize_create_extraction"](extraction)
-            extraction = helpers["_sanitize_targeted_task_actions"](payload.message, extraction, grounding)
-            extraction = helpers["_resolve_relative_due_date_overrides"](payload.message, extraction)
+            extraction = helpers["_sanitize_extraction"](
+                payload.message,
+                extraction,
+                grounding,
+                sanitize_reminders=False,
+            )
             usage = helpers["_extract_usage"](extraction)
             latency = int((time.time() - start_time) * 1000)
             helpers["_validate_extraction_payload"](extraction)
             db.add(
                 helpers["PromptRun"](
-                    id=str(uuid.uuid4()),
+                    id=new_uuid(),
                     request_id=request_id,
                     user_id=user_id,
                     operation="extract",
@@ -108,7 +131,7 @@ async def run_capture_thought(request: Request, payload: ThoughtCaptureRequest,
         except Exception as exc:
             db.add(
                 helpers["PromptRun"](
-                    id=str(uuid.uuid4()),
+                    id=new_uuid(),
                     request_id=request_id,
                     user_id=user_id,
                     operation="extract",
@@ -168,14 +191,14 @@ async def run_query_ask(payload: QueryAskRequest, user_id: str, db, *, helpers:
         session_state=session_state,
     )
     start_time = time.time()
-    request_id = str(uuid.uuid4())
+    request_id = new_uuid()
     try:
         raw_resp = await helpers["adapter"].answer_query(payload.query, ctx)
         usage = helpers["_extract_usage"](raw_resp)
         query_response = QueryResponseV1(**raw_resp)
         db.add(
             helpers["PromptRun"](
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 request_id=request_id,
                 user_id=user_id,
                 operation="query",
@@ -194,7 +217,7 @@ async def run_query_ask(payload: QueryAskRequest, user_id: str, db, *, helpers:
         helpers["logger"].error(f"Query failure: {exc}")
         db.add(
             helpers["PromptRun"](
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 request_id=request_id,
                 user_id=user_id,
                 operation="query",
@@ -208,7 +231,7 @@ async def run_query_ask(payload: QueryAskRequest, user_id: str, db, *, helpers:
         )
         db.add(
             helpers["EventLog"](
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 request_id=request_id,
                 user_id=user_id,
                 event_type="query_fallback_used",
@@ -1,12 +1,12 @@
-import json
-import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Request
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from sqlalchemy import select
 
 from api.schemas import ReminderCreate, ReminderSnoozeRequest, ReminderUpdate, WorkItemCreate, WorkItemUpdate
+from common.ids import new_uuid, short_id
 from common.models import (
     ActionBatch,
     ActionBatchStatus,
@@ -22,6 +22,12 @@ from common.models import (
 )
 
 
+def _json_list_response(payloads: List[Dict[str, Any]]) -> Response:
+    # List views are plain dicts of JSON-native values and datetimes; orjson encodes them
+    # in one pass instead of FastAPI walking every field through jsonable_encoder.
+    return Response(content=orjson.dumps(payloads), media_type="application/json")
+
+
 async def _attach_reminder_work_item_titles(reminders: List[Reminder], user_id: str, db) -> None:
     work_item_ids = {
         reminder.work_item_id
@@ -75,7 +81,7 @@ def register_local_first_routes(
         if cursor:
             query = query.where(WorkItem.id > cursor)
         items = (await db.execute(query)).scalars().all()
-        return [helpers["_work_item_view_payload"](item) for item in items]
+        return _json_list_response([helpers["_work_item_view_payload"](item) for item in items])
 
     @app.post("/v1/work_items", dependencies=[Depends(check_idempotency)])
     async def create_work_item(
@@ -87,6 +93,7 @@ def register_local_first_routes(
         if hasattr(request.state, "idempotent_response"):
             return request.state.idempotent_response
         canonical_title = helpers["_canonical_task_title"](payload.title)
+        now = helpers["utc_now"]()
         item = WorkItem(
             id=helpers["_new_work_item_id"](payload.kind),
             user_id=user_id,
@@ -102,10 +109,10 @@ def register_local_first_routes(
             scheduled_for=helpers["_parse_due_at"](payload.scheduled_for),
             snooze_until=helpers["_parse_due_at"](payload.snooze_until),
             estimated_minutes=payload.estimated_minutes,
-            created_at=helpers["utc_now"](),
-            updated_at=helpers["utc_now"](),
-            completed_at=helpers["utc_now"]() if payload.status == WorkItemStatus.done else None,
-            archived_at=helpers["utc_now"]() if payload.status == WorkItemStatus.archived else None,
+            created_at=now,
+            updated_at=now,
+            completed_at=now if payload.status == WorkItemStatus.done else None,
+            archived_at=now if payload.status == WorkItemStatus.archived else None,
         )
         db.add(item)
         await helpers["_record_work_item_action_batch"](
@@ -189,7 +196,7 @@ def register_local_first_routes(
             query = query.where(Reminder.remind_at <= due_before_dt)
         reminders = (await db.execute(query)).scalars().all()
         await _attach_reminder_work_item_titles(reminders, user_id, db)
-        return [helpers["_reminder_view_payload"](reminder) for reminder in reminders]
+        return _json_list_response([helpers["_reminder_view_payload"](reminder) for reminder in reminders])
 
     @app.post("/v1/reminders", dependencies=[Depends(check_idempotency)])
     async def create_reminder(
@@ -209,8 +216,9 @@ def register_local_first_routes(
             reminder_kind = ReminderKind.recurring
         if reminder_kind == ReminderKind.recurring and not recurrence_rule:
             raise HTTPException(status_code=400, detail="Recurring reminders require recurrence_rule")
+        now = helpers["utc_now"]()
         reminder = Reminder(
-            id=f"rem_{uuid.uuid4().hex[:12]}",
+            id=short_id("rem"),
             user_id=user_id,
             work_item_id=payload.work_item_id,
             person_id=payload.person_id,
@@ -220,11 +228,11 @@ def register_local_first_routes(
             message=payload.message,
             remind_at=remind_at,
             recurrence_rule=recurrence_rule,
-            created_at=helpers["utc_now"](),
-            updated_at=helpers["utc_now"](),
+            created_at=now,
+            updated_at=now,
             last_sent_at=None,
-            completed_at=helpers["utc_now"]() if payload.status == ReminderStatus.completed else None,
-            dismissed_at=helpers["utc_now"]() if payload.status == ReminderStatus.dismissed else None,
+            completed_at=now if payload.status == ReminderStatus.completed else None,
+            dismissed_at=now if payload.status == ReminderStatus.dismissed else None,
         )
         db.add(reminder)
         await helpers["_record_reminder_action_batch"](
@@ -291,12 +299,13 @@ def register_local_first_routes(
             if remind_at is None:
                 raise HTTPException(status_code=400, detail="Invalid remind_at")
             reminder.remind_at = remind_at
+        now = helpers["utc_now"]()
         if "status" in update_data and update_data["status"] is not None:
             reminder.status = helpers["_coerce_reminder_status"](update_data["status"])
-            reminder.last_sent_at = helpers["utc_now"]() if reminder.status == ReminderStatus.sent else reminder.last_sent_at
-            reminder.completed_at = helpers["utc_now"]() if reminder.status == ReminderStatus.completed else None
-            reminder.dismissed_at = helpers["utc_now"]() if reminder.status == ReminderStatus.dismissed else None
-        reminder.updated_at = helpers["utc_now"]()
+            reminder.last_sent_at = now if reminder.status == ReminderStatus.sent else reminder.last_sent_at
+            reminder.completed_at = now if reminder.status == ReminderStatus.completed else None
+            reminder.dismissed_at = now if reminder.status == ReminderStatus.dismissed else None
+        reminder.updated_at = now
         after_snapshot = helpers["_reminder_snapshot"](reminder)
         await helpers["_record_reminder_action_batch"](
             db,
@@ -333,9 +342,10 @@ def register_local_first_routes(
         ).scalar_one_or_none()
         if reminder is None:
             raise HTTPException(status_code=404, detail="Reminder not found")
+        now = helpers["utc_now"]()
         next_remind_at = helpers["compute_snooze_remind_at"](
             payload.preset,
-            now=helpers["utc_now"](),
+            now=now,
             current_remind_at=reminder.remind_at,
             timezone_name=helpers["settings"].APP_TIMEZONE,
         )
@@ -347,7 +357,7 @@ def register_local_first_routes(
         reminder.remind_at = next_remind_at
         reminder.completed_at = None
         reminder.dismissed_at = None
-        reminder.updated_at = helpers["utc_now"]()
+        reminder.updated_at = now
         after_snapshot = helpers["_reminder_snapshot"](reminder)
         await helpers["_record_reminder_action_batch"](
             db,
@@ -377,10 +387,10 @@ def register_local_first_routes(
     ):
         if hasattr(request.state, "idempotent_response"):
             return request.state.idempotent_response
-        job_id = str(uuid.uuid4())
+        job_id = new_uuid()
         await helpers["redis_client"].rpush(
             "default_queue",
-            json.dumps({"job_id": job_id, "topic": "reminders.dispatch", "payload": {"user_id": user_id}}),
+            orjson.dumps({"job_id": job_id, "topic": "reminders.dispatch", "payload": {"user_id": user_id}}),
         )
         resp = {"status": "ok", "enqueued": True, "job_id": job_id}
         await helpers["save_idempotency"](user_id, request.state.idempotency_key, request.state.request_hash, 200, resp)
@@ -417,11 +427,12 @@ def register_local_first_routes(
             raise HTTPException(status_code=404, detail="Action batch not found")
         if batch.status == ActionBatchStatus.reverted or batch.reverted_at is not None:
             raise HTTPException(status_code=409, detail="Action batch already reverted")
+        now = helpers["utc_now"]()
         expires_at = batch.undo_window_expires_at
         if isinstance(expires_at, datetime):
             if expires_at.tzinfo is None:
                 expires_at = expires_at.replace(tzinfo=timezone.utc)
-            if expires_at < helpers["utc_now"]():
+            if expires_at < now:
                 raise HTTPException(status_code=409, detail="Undo window expired")
         versions = (
             await db.execute(
@@ -460,9 +471,9 @@ def register_local_first_routes(
                     helpers["_restore_work_item_from_snapshot"](item, before_json)
                 else:
                     item.status = WorkItemStatus.archived
-                    item.archived_at = helpers["utc_now"]()
+                    item.archived_at = now
                     item.completed_at = None
-                    item.updated_at = helpers["utc_now"]()
+                    item.updated_at = now
                 restored_snapshot = helpers["work_item_snapshot"](item)
                 revert_records.append(
                     {
@@ -500,7 +511,7 @@ def register_local_first_routes(
                     reminder.status = ReminderStatus.canceled
                     reminder.completed_at = None
                     reminder.dismissed_at = None
-                    reminder.updated_at = helpers["utc_now"]()
+                    reminder.updated_at = now
                 restored_snapshot = helpers["_reminder_snapshot"](reminder)
                 reminder_revert_records.append(
                     {
@@ -522,7 +533,7 @@ def register_local_first_routes(
             )
 
         batch.status = ActionBatchStatus.reverted
-        batch.reverted_at = helpers["utc_now"]()
+        batch.reverted_at = now
         if not batch.after_summary:
             batch.after_summary = f"Reverted {len(restored_ids)} item{'s' if len(restored_ids) != 1 else ''}"
         await db.commit()
@@ -1,21 +1,22 @@
 import uuid
-import copy
 import re
 import logging
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone, date
 from typing import Optional, List, Dict, Any
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import httpx
 
 from fastapi import FastAPI, Depends, HTTPException, Request
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import select, delete
 
 import redis.asyncio as redis
 
-from common.config import settings
+from common.config import resolve_timezone, settings
+from common.database import create_app_engine
+from common.ids import short_id
 from common.models import (
     Base, IdempotencyKey, InboxItem, Session,
     EventLog, PromptRun, LinkType, RecentContextItem,
@@ -85,13 +86,16 @@ from api.draft_runtime import (
     run_is_low_risk_action_extraction,
     run_is_safe_completion_extraction,
     run_planner_confidence,
+    run_post_confirm_side_effects,
     run_resolve_relative_due_date_overrides,
     run_revise_action_draft,
+    run_sanitize_extraction,
     run_unresolved_mutation_titles,
 )
 from api.grounding_runtime import (
     run_build_extraction_grounding,
     run_enqueue_summary_job,
+    run_extract_structured_updates,
     run_grounding_terms,
     run_infer_reminder_ids_from_answer_text,
     run_infer_task_ids_from_answer_text,
@@ -106,12 +110,16 @@ from api.grounding_runtime import (
     run_task_ids_from_query_response,
 )
 from api.health_runtime import (
+    close_preflight_http_client,
+    run_cached_preflight_report,
     run_check_llm_credentials,
     run_check_telegram_credentials,
     run_compute_preflight_report,
     run_external_preflight_required,
     run_get_preflight_report,
     run_http_ok_status,
+    run_preflight_http_client,
+    run_preflight_refresher,
 )
 from api.maintenance_runtime import (
     run_apply_work_item_updates,
@@ -132,6 +140,7 @@ from api.request_runtime import (
     run_enforce_rate_limit,
     run_extract_usage,
     run_get_authenticated_user,
+    run_idempotent_replay,
     run_save_idempotency,
     run_validate_extraction_payload,
 )
@@ -153,6 +162,7 @@ from api.reference_resolution import (
     run_is_explicit_recent_named_reference_mutation,
     run_merge_grounding_task_refs,
     run_missing_reminder_schedule_info,
+    run_prepare_completion_candidates,
     run_rank_reminder_reference_candidates,
     run_rank_task_reference_candidates,
     run_reminder_reference_candidates,
@@ -213,7 +223,7 @@ from common.telegram import (
     format_due_next_week,
     format_overdue,
     format_action_batch_details,
-    escape_html, format_query_answer, user_facing_task_title
+    escape_html, format_query_answer, user_facing_task_title, close_telegram_http_client
 )
 
 # --- Shared Capture Pipeline ---
@@ -269,12 +279,7 @@ def _draft_now() -> datetime:
 
 
 def _local_now() -> datetime:
-    tz_name = (settings.APP_TIMEZONE or "").strip() or "UTC"
-    try:
-        tz = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        tz = timezone.utc
-    return datetime.now(tz)
+    return datetime.now(resolve_timezone(settings.APP_TIMEZONE))
 
 
 def _local_today() -> date:
@@ -296,13 +301,17 @@ def _parse_iso_datetime(value: Any) -> Optional[datetime]:
     return parsed.astimezone(timezone.utc)
 
 
+_QUERY_PUNCTUATION_PATTERN = re.compile(r"[^a-z0-9\s]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
 def _normalize_query_text(text: str) -> str:
-    collapsed = re.sub(r"[^a-z0-9\s]+", " ", (text or "").lower())
-    return re.sub(r"\s+", " ", collapsed).strip()
+    collapsed = _QUERY_PUNCTUATION_PATTERN.sub(" ", (text or "").lower())
+    return _WHITESPACE_PATTERN.sub(" ", collapsed).strip()
 
 def _canonical_task_title(title: Any) -> str:
-    cleaned = re.sub(r"\s+", " ", user_facing_task_title(title)).strip()
-    return cleaned or re.sub(r"\s+", " ", str(title or "").strip())
+    cleaned = _WHITESPACE_PATTERN.sub(" ", user_facing_task_title(title)).strip()
+    return cleaned or _WHITESPACE_PATTERN.sub(" ", str(title or "").strip())
 
 
 def _result_rows(value: Any) -> list[Any]:
@@ -376,32 +385,48 @@ def _is_telegram_sender_allowed(chat_id: str, username: Optional[str]) -> bool:
     return False
 
 
+_DRAFT_CALLBACK_ACTIONS = frozenset({"confirm", "edit", "discard"})
+
+
 def _parse_draft_callback(callback_data: str) -> tuple[Optional[str], Optional[str]]:
     # Expected format: draft:<confirm|edit|discard>:<draft_id>
-    parts = (callback_data or "").split(":", 2)
-    if len(parts) != 3 or parts[0] != "draft":
+    prefix, _, rest = (callback_data or "").partition(":")
+    if prefix != "draft":
         return None, None
-    action = parts[1]
-    draft_id = parts[2]
-    if action not in {"confirm", "edit", "discard"}:
+    action, sep, draft_id = rest.partition(":")
+    if not sep or action not in _DRAFT_CALLBACK_ACTIONS:
         return None, None
-    if not draft_id.strip():
+    draft_id = draft_id.strip()
+    if not draft_id:
         return None, None
-    return action, draft_id.strip()
+    return action, draft_id
 
 
 def _parse_action_batch_callback(callback_data: str) -> tuple[Optional[str], Optional[str]]:
     return run_parse_action_batch_callback(callback_data)
 
 
+def _draft_proposal_with_meta(draft: ActionDraft) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    # Only the top-level dict and _meta are rewritten, so copy just those two
+    # levels; a fresh top-level object is still what marks the JSON column dirty.
+    proposal = dict(draft.proposal_json) if isinstance(draft.proposal_json, dict) else {}
+    meta = dict(proposal["_meta"]) if isinstance(proposal.get("_meta"), dict) else {}
+    return proposal, meta
+
+
 def _draft_set_awaiting_edit_input(draft: ActionDraft, value: bool) -> None:
-    proposal = copy.deepcopy(draft.proposal_json) if isinstance(draft.proposal_json, dict) else {}
-    meta = proposal.get("_meta") if isinstance(proposal.get("_meta"), dict) else {}
+    proposal, meta = _draft_proposal_with_meta(draft)
     meta["awaiting_edit_input"] = bool(value)
     proposal["_meta"] = meta
     draft.proposal_json = proposal
 
 
+def _draft_extend_expiry(draft: ActionDraft) -> None:
+    now = _draft_now()
+    draft.updated_at = now
+    draft.expires_at = now + timedelta(seconds=ACTION_DRAFT_TTL_SECONDS)
+
+
 def _draft_is_awaiting_edit_input(draft: ActionDraft) -> bool:
     if not isinstance(draft.proposal_json, dict):
         return False
@@ -412,8 +437,7 @@ def _draft_is_awaiting_edit_input(draft: ActionDraft) -> bool:
 
 
 def _draft_set_proposal_message_id(draft: ActionDraft, message_id: int) -> None:
-    proposal = copy.deepcopy(draft.proposal_json) if isinstance(draft.proposal_json, dict) else {}
-    meta = proposal.get("_meta") if isinstance(proposal.get("_meta"), dict) else {}
+    proposal, meta = _draft_proposal_with_meta(draft)
     meta["proposal_message_id"] = int(message_id)
     proposal["_meta"] = meta
     draft.proposal_json = proposal
@@ -432,8 +456,7 @@ def _draft_get_proposal_message_id(draft: ActionDraft) -> Optional[int]:
 
 
 def _draft_set_clarification_state(draft: ActionDraft, state: Optional[Dict[str, Any]]) -> None:
-    proposal = copy.deepcopy(draft.proposal_json) if isinstance(draft.proposal_json, dict) else {}
-    meta = proposal.get("_meta") if isinstance(proposal.get("_meta"), dict) else {}
+    proposal, meta = _draft_proposal_with_meta(draft)
     if isinstance(state, dict) and state:
         meta["clarification_state"] = state
     else:
@@ -555,13 +578,8 @@ def _reminder_preview_group(reminder: Dict[str, Any]) -> tuple[str, str, str]:
 
 
 def _preview_localize_datetime(value: datetime) -> datetime:
-    tz_name = (settings.APP_TIMEZONE or "").strip() or "UTC"
-    try:
-        tz = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        tz = timezone.utc
     base = value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
-    return base.astimezone(tz)
+    return base.astimezone(resolve_timezone(settings.APP_TIMEZONE))
 
 
 def _preview_time_text(value: datetime) -> str:
@@ -599,19 +617,21 @@ def _preview_recurrence_text(value: Any) -> Optional[str]:
     return None
 
 
-def _reminder_preview_line(reminder: Dict[str, Any], verb: str) -> str:
+def _reminder_preview_line(reminder: Dict[str, Any], verb: str, remind_at_text: Optional[str] = None) -> str:
     title = str(reminder.get("title") or "").strip()
-    remind_at_text = _preview_remind_at_text(reminder.get("remind_at"))
+    if remind_at_text is None:
+        remind_at_text = _preview_remind_at_text(reminder.get("remind_at"))
     action = str(reminder.get("action") or "").strip().lower()
     if action == "create" and remind_at_text and title:
         return f"<b>Remind me</b> {escape_html(remind_at_text)}: {escape_html(title)}"
     return f"<b>{verb}:</b> {escape_html(title)}"
 
 
-def _reminder_preview_details(reminder: Dict[str, Any]) -> List[str]:
+def _reminder_preview_details(reminder: Dict[str, Any], remind_at_text: Optional[str] = None) -> List[str]:
     details: List[str] = []
     action = str(reminder.get("action") or "").strip().lower()
-    remind_at_text = _preview_remind_at_text(reminder.get("remind_at"))
+    if remind_at_text is None:
+        remind_at_text = _preview_remind_at_text(reminder.get("remind_at"))
     if remind_at_text and action != "create":
         details.append(remind_at_text)
     recurrence_text = _preview_recurrence_text(reminder.get("recurrence_rule"))
@@ -624,19 +644,44 @@ def _reminder_preview_details(reminder: Dict[str, Any]) -> List[str]:
     return details
 
 
+_TASK_PREVIEW_GROUPS = (
+    ("completed", "Mark complete"),
+    ("updated", "Update existing task"),
+    ("created", "Create new task"),
+    ("archived", "Archive"),
+)
+_REMINDER_PREVIEW_GROUPS = (
+    ("completed", "Mark reminder complete"),
+    ("updated", "Update existing reminder"),
+    ("created", "Create reminder"),
+    ("canceled", "Cancel reminder"),
+)
+_DRAFT_PREVIEW_VISIBLE_ITEMS = 4
+_DRAFT_PREVIEW_VISIBLE_LINKS = 3
+_DRAFT_PREVIEW_EMPTY_TEXT = (
+    "I did not find clear actions to apply yet.\n"
+    "Reply with more details, or ask a question directly."
+)
+_DRAFT_PREVIEW_FOOTER = (
+    "Tap <code>Yes</code> to apply these exact changes, <code>Edit</code> to revise them, or <code>No</code> to discard."
+)
+
+
+def _append_preview_group(lines: List[str], heading: str, rendered: List[tuple[str, List[str]]], hidden: int, noun: str) -> None:
+    lines.extend(("", f"<b>{heading}</b>"))
+    for preview, details in rendered:
+        lines.append(f"• {preview}")
+        if details:
+            lines.append(f"  <i>{escape_html('; '.join(details))}</i>")
+    if hidden > 0:
+        lines.append(f"• +{hidden} more {noun}(s)")
+
+
 def _format_action_draft_preview(extraction: Dict[str, Any]) -> str:
-    task_groups: Dict[str, List[tuple[str, List[str]]]] = {
-        "created": [],
-        "updated": [],
-        "completed": [],
-        "archived": [],
-    }
-    reminder_groups: Dict[str, List[tuple[str, List[str]]]] = {
-        "created": [],
-        "updated": [],
-        "completed": [],
-        "canceled": [],
-    }
+    # Group first, render later: only the first few items of each group are
+    # shown, so details (and reminder time parsing) are skipped for the rest.
+    task_groups: Dict[str, List[tuple[Dict[str, Any], str, str]]] = {key: [] for key, _ in _TASK_PREVIEW_GROUPS}
+    reminder_groups: Dict[str, List[tuple[Dict[str, Any], str]]] = {key: [] for key, _ in _REMINDER_PREVIEW_GROUPS}
     links = [
         link for link in extraction.get("links", [])
         if isinstance(link, dict)
@@ -645,79 +690,66 @@ def _format_action_draft_preview(extraction: Dict[str, Any]) -> str:
         and isinstance(link.get("link_type"), str)
     ]
 
+    has_items = False
     for task in extraction.get("tasks", []):
-        if not isinstance(task, dict):
+        if type(task) is not dict:
             continue
         title = task.get("title")
         if not isinstance(title, str) or not title.strip():
             continue
-        key, heading, verb = _task_preview_group(task)
-        details = _task_preview_details(task)
-        task_groups[key].append((f"<b>{verb}:</b> {escape_html(title.strip())}", details))
+        key, _heading, verb = _task_preview_group(task)
+        task_groups[key].append((task, title.strip(), verb))
+        has_items = True
     for reminder in extraction.get("reminders", []):
-        if not isinstance(reminder, dict):
+        if type(reminder) is not dict:
             continue
         title = reminder.get("title")
         if not isinstance(title, str) or not title.strip():
             continue
-        key, heading, verb = _reminder_preview_group(reminder)
-        details = _reminder_preview_details(reminder)
-        reminder_groups[key].append((_reminder_preview_line(reminder, verb), details))
-
-    if not any(task_groups.values()) and not any(reminder_groups.values()) and not links:
-        return (
-            "I did not find clear actions to apply yet.\n"
-            "Reply with more details, or ask a question directly."
-        )
+        key, _heading, verb = _reminder_preview_group(reminder)
+        reminder_groups[key].append((reminder, verb))
+        has_items = True
+
+    if not has_items and not links:
+        return _DRAFT_PREVIEW_EMPTY_TEXT
 
     lines = ["<b>Review changes</b>"]
-    ordered_groups = [
-        ("completed", "Mark complete"),
-        ("updated", "Update existing task"),
-        ("created", "Create new task"),
-        ("archived", "Archive"),
-    ]
-    for key, heading in ordered_groups:
+    for key, heading in _TASK_PREVIEW_GROUPS:
         items = task_groups[key]
         if not items:
             continue
-        lines.extend(["", f"<b>{heading}</b>"])
-        for preview, details in items[:4]:
-            lines.append(f"• {preview}")
-            if details:
-                lines.append(f"  <i>{escape_html('; '.join(details))}</i>")
-        if len(items) > 4:
-            lines.append(f"• +{len(items) - 4} more task(s)")
-
-    ordered_reminder_groups = [
-        ("completed", "Mark reminder complete"),
-        ("updated", "Update existing reminder"),
-        ("created", "Create reminder"),
-        ("canceled", "Cancel reminder"),
-    ]
-    for key, heading in ordered_reminder_groups:
+        rendered = [
+            (f"<b>{verb}:</b> {escape_html(title)}", _task_preview_details(task))
+            for task, title, verb in items[:_DRAFT_PREVIEW_VISIBLE_ITEMS]
+        ]
+        _append_preview_group(lines, heading, rendered, len(items) - _DRAFT_PREVIEW_VISIBLE_ITEMS, "task")
+
+    for key, heading in _REMINDER_PREVIEW_GROUPS:
         items = reminder_groups[key]
         if not items:
             continue
-        lines.extend(["", f"<b>{heading}</b>"])
-        for preview, details in items[:4]:
-            lines.append(f"• {preview}")
-            if details:
-                lines.append(f"  <i>{escape_html('; '.join(details))}</i>")
-        if len(items) > 4:
-            lines.append(f"• +{len(items) - 4} more reminder(s)")
+        rendered = []
+        for reminder, verb in items[:_DRAFT_PREVIEW_VISIBLE_ITEMS]:
+            remind_at_text = _preview_remind_at_text(reminder.get("remind_at"))
+            rendered.append(
+                (
+                    _reminder_preview_line(reminder, verb, remind_at_text),
+                    _reminder_preview_details(reminder, remind_at_text),
+                )
+            )
+        _append_preview_group(lines, heading, rendered, len(items) - _DRAFT_PREVIEW_VISIBLE_ITEMS, "reminder")
 
     if links:
-        lines.extend(["", "<b>Links</b>"])
-        for link in links[:3]:
+        lines.extend(("", "<b>Links</b>"))
+        for link in links[:_DRAFT_PREVIEW_VISIBLE_LINKS]:
             lines.append(
                 "• <b>Create link:</b> "
                 f"{escape_html(link['from_title'].strip())} {escape_html(link['link_type'].strip())} {escape_html(link['to_title'].strip())}"
             )
-        if len(links) > 3:
-            lines.append(f"• +{len(links) - 3} more link(s)")
+        if len(links) > _DRAFT_PREVIEW_VISIBLE_LINKS:
+            lines.append(f"• +{len(links) - _DRAFT_PREVIEW_VISIBLE_LINKS} more link(s)")
 
-    lines.extend(["", "Tap <code>Yes</code> to apply these exact changes, <code>Edit</code> to revise them, or <code>No</code> to discard."])
+    lines.extend(("", _DRAFT_PREVIEW_FOOTER))
     return "\n".join(lines)
 
 
@@ -753,11 +785,17 @@ def _completion_candidate_rows(grounding: Dict[str, Any]) -> List[Dict[str, Any]
     return run_completion_candidate_rows(grounding, helpers=globals())
 
 
+def _prepare_completion_candidates(grounding: Dict[str, Any]) -> Dict[str, Any]:
+    return run_prepare_completion_candidates(grounding, helpers=globals())
+
+
 def _sanitize_completion_extraction(
     extraction: Dict[str, Any],
     grounding: Dict[str, Any],
+    *,
+    prepared: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    return run_sanitize_completion_extraction(extraction, grounding, helpers=globals())
+    return run_sanitize_completion_extraction(extraction, grounding, helpers=globals(), prepared=prepared)
 
 
 def _sanitize_create_extraction(
@@ -797,8 +835,14 @@ def _reminder_requires_schedule(reminder: Dict[str, Any]) -> bool:
     return run_reminder_requires_schedule(reminder, helpers=globals())
 
 
-def _sanitize_targeted_task_actions(message: str, extraction: Dict[str, Any], grounding: Dict[str, Any]) -> Dict[str, Any]:
-    return run_sanitize_targeted_task_actions(message, extraction, grounding, helpers=globals())
+def _sanitize_targeted_task_actions(
+    message: str,
+    extraction: Dict[str, Any],
+    grounding: Dict[str, Any],
+    *,
+    prepared: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    return run_sanitize_targeted_task_actions(message, extraction, grounding, helpers=globals(), prepared=prepared)
 
 
 def _reminder_reference_candidates(grounding: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -931,6 +975,24 @@ def _build_low_confidence_clarification(extraction: Dict[str, Any]) -> str:
     return run_build_low_confidence_clarification(extraction, helpers=globals())
 
 
+def _sanitize_extraction(
+    message: str,
+    extraction: Dict[str, Any],
+    grounding: Dict[str, Any],
+    *,
+    sanitize_create: bool = True,
+    sanitize_reminders: bool = True,
+) -> Dict[str, Any]:
+    return run_sanitize_extraction(
+        message,
+        extraction,
+        grounding,
+        helpers=globals(),
+        sanitize_create=sanitize_create,
+        sanitize_reminders=sanitize_reminders,
+    )
+
+
 def _apply_intent_fallbacks(message: str, extraction: Dict[str, Any], grounding: Dict[str, Any]) -> Dict[str, Any]:
     return run_apply_intent_fallbacks(message, extraction, grounding, helpers=globals())
 
@@ -978,6 +1040,23 @@ async def _confirm_action_draft(
     return await run_confirm_action_draft(draft, user_id, chat_id, request_id, db, helpers=globals())
 
 
+async def _post_confirm_side_effects(
+    draft_id: str,
+    user_id: str,
+    chat_id: str,
+    request_id: str,
+    inbox_item_id: str,
+) -> None:
+    await run_post_confirm_side_effects(
+        draft_id,
+        user_id,
+        chat_id,
+        request_id,
+        inbox_item_id,
+        helpers=globals(),
+    )
+
+
 def _grounding_terms(message: str) -> set[str]:
     return run_grounding_terms(message)
 
@@ -992,8 +1071,26 @@ async def _build_extraction_grounding(db: AsyncSession, user_id: str, chat_id: s
     )
 
 
-async def _enqueue_summary_job(user_id: str, chat_id: str, inbox_item_id: str) -> None:
-    await run_enqueue_summary_job(user_id, chat_id, inbox_item_id, helpers=globals())
+async def _extract_structured_updates(
+    user_id: str, message: str, grounding: Dict[str, Any], use_cache: bool = True
+) -> Dict[str, Any]:
+    return await run_extract_structured_updates(user_id, message, grounding, helpers=globals(), use_cache=use_cache)
+
+
+async def _enqueue_summary_job(
+    user_id: str,
+    chat_id: str,
+    inbox_item_id: str,
+    *,
+    invalidate_plan_cache: bool = False,
+) -> None:
+    await run_enqueue_summary_job(
+        user_id,
+        chat_id,
+        inbox_item_id,
+        helpers=globals(),
+        invalidate_plan_cache=invalidate_plan_cache,
+    )
 
 
 async def _remember_recent_tasks(
@@ -1425,15 +1522,44 @@ async def _consume_telegram_link_token(chat_id: str, username: Optional[str], ra
     return await run_consume_telegram_link_token(chat_id, username, raw_token, db, helpers=globals())
 
 logger = logging.getLogger(__name__)
-app = FastAPI(title="Telegram Native AI Assistant API")
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background_task(coro) -> asyncio.Task:
+    # The event loop only keeps weak references to tasks; hold one until the task finishes.
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _drain_background_tasks() -> None:
+    if _background_tasks:
+        await asyncio.gather(*list(_background_tasks), return_exceptions=True)
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    refresher = asyncio.create_task(_preflight_refresher()) if _external_preflight_required() else None
+    yield
+    if refresher is not None:
+        refresher.cancel()
+        await asyncio.gather(refresher, return_exceptions=True)
+    await _drain_background_tasks()
+    await close_telegram_http_client()
+    await close_preflight_http_client()
+
+
+app = FastAPI(title="Telegram Native AI Assistant API", lifespan=_lifespan)
 
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 # DB Setup
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.APP_ENV == "dev")
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+engine = create_app_engine(echo=settings.APP_ENV == "dev")
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 # Redis Setup
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -1442,20 +1568,83 @@ _preflight_cache: Dict[str, Any] = {"checked_at": None, "report": None}
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
 
 # --- Middleware & Dependencies ---
 
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
+class RequestIdMiddleware:
+    """Tag each HTTP request with an id in request.state and the X-Request-ID header.
+
+    Plain ASGI rather than @app.middleware("http"), which wraps every request in a
+    BaseHTTPMiddleware task and streaming bridge.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        header = (b"x-request-id", request_id.encode("ascii"))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), header]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+
+class IdempotencyReplayMiddleware:
+    """Answer replayed idempotent writes from the Redis memo before routing.
+
+    A hit skips body validation, the DB session and the route entirely; anything
+    else is passed on with the buffered body for check_idempotency to handle.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith("/v1/")
+            or b"idempotency-key" not in {name.lower() for name, _ in scope["headers"]}
+        ):
+            await self.app(scope, receive, send)
+            return
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                await self.app(scope, receive, send)
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response_body = await _idempotent_replay(Request(scope), body)
+        if response_body is None:
+            await self.app(scope, replay_receive, send)
+            return
+        await JSONResponse(response_body)(scope, replay_receive, send)
+
+
+# Registered first so RequestIdMiddleware wraps it and replays still carry X-Request-ID.
+app.add_middleware(IdempotencyReplayMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 async def get_authenticated_user(request: Request):
     return await run_get_authenticated_user(request, helpers=globals())
@@ -1473,6 +1662,9 @@ def _validate_extraction_payload(extraction: Any) -> None:
 async def check_idempotency(request: Request, user_id: str = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
     return await run_check_idempotency(request, user_id, db, helpers=globals())
 
+async def _idempotent_replay(request: Request, body: bytes) -> Optional[Any]:
+    return await run_idempotent_replay(request, body, helpers=globals())
+
 async def save_idempotency(user_id: str, idempotency_key: str, request_hash: str, status_code: int, response_body: dict):
     return await run_save_idempotency(
         user_id,
@@ -1508,12 +1700,16 @@ def _http_ok_status(code: int) -> bool:
     return run_http_ok_status(code)
 
 
-async def _check_llm_credentials() -> Dict[str, Any]:
-    return await run_check_llm_credentials(helpers=globals())
+def _preflight_http_client() -> httpx.AsyncClient:
+    return run_preflight_http_client(helpers=globals())
 
 
-async def _check_telegram_credentials() -> Dict[str, Any]:
-    return await run_check_telegram_credentials(helpers=globals())
+async def _check_llm_credentials(client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    return await run_check_llm_credentials(helpers=globals(), client=client)
+
+
+async def _check_telegram_credentials(client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    return await run_check_telegram_credentials(helpers=globals(), client=client)
 
 
 async def _compute_preflight_report() -> Dict[str, Any]:
@@ -1524,6 +1720,14 @@ async def _get_preflight_report(force: bool = False) -> Dict[str, Any]:
     return await run_get_preflight_report(force=force, helpers=globals())
 
 
+async def _cached_preflight_report() -> Dict[str, Any]:
+    return await run_cached_preflight_report(helpers=globals())
+
+
+async def _preflight_refresher() -> None:
+    await run_preflight_refresher(helpers=globals())
+
+
 # --- Telegram Integration ---
 
 
@@ -1572,7 +1776,7 @@ register_local_first_routes(
 @app.post("/v1/links", dependencies=[Depends(check_idempotency)])
 async def create_link(request: Request, payload: LinkCreate, user_id: str = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
     if hasattr(request.state, "idempotent_response"): return request.state.idempotent_response
-    link_id = f"lnk_{uuid.uuid4().hex[:12]}"
+    link_id = short_id("lnk")
     projected_type = _work_item_link_type_from_legacy(payload.link_type)
     if projected_type is None:
         raise HTTPException(status_code=400, detail="Unsupported link type for canonical work items")
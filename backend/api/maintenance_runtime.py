@@ -1,8 +1,9 @@
 import copy
-import uuid
 from datetime import date, datetime, timezone
 from typing import Any, Dict, Optional
 
+from common.ids import short_id
+
 
 def run_parse_due_date(value: Any) -> Optional[date]:
     if not isinstance(value, str) or not value.strip():
@@ -48,8 +49,8 @@ def run_coerce_work_item_status(value: Any, *, helpers: Dict[str, Any]):
 
 def run_new_work_item_id(kind, *, helpers: Dict[str, Any]) -> str:
     if kind in {helpers["WorkItemKind"].task, helpers["WorkItemKind"].subtask}:
-        return f"tsk_{uuid.uuid4().hex[:12]}"
-    return f"wki_{uuid.uuid4().hex[:12]}"
+        return short_id("tsk")
+    return short_id("wki")
 
 
 def run_work_item_view_payload(item, *, helpers: Dict[str, Any]) -> Dict[str, Any]:
@@ -174,10 +175,11 @@ def run_apply_work_item_updates(item, update_data: Dict[str, Any], *, helpers: D
         item.snooze_until = helpers["_parse_due_at"](update_data["snooze_until"])
     if "estimated_minutes" in update_data:
         item.estimated_minutes = update_data["estimated_minutes"]
+    now = helpers["utc_now"]()
     if "status" in update_data and update_data["status"] is not None:
         item.status = helpers["_coerce_work_item_status"](update_data["status"])
-        item.completed_at = helpers["utc_now"]() if item.status == helpers["WorkItemStatus"].done else None
-        item.archived_at = helpers["utc_now"]() if item.status == helpers["WorkItemStatus"].archived else None
+        item.completed_at = now if item.status == helpers["WorkItemStatus"].done else None
+        item.archived_at = now if item.status == helpers["WorkItemStatus"].archived else None
     elif item.status != helpers["WorkItemStatus"].archived:
         item.archived_at = None
-    item.updated_at = helpers["utc_now"]()
+    item.updated_at = now
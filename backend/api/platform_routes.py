@@ -1,13 +1,14 @@
-import json
-import uuid
+import asyncio
 from datetime import timedelta
 from typing import Any, Dict, Optional
 
+import orjson
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from sqlalchemy import select, text
+from sqlalchemy import func, select, text
 
 from api.schemas import PlanRefreshRequest, PlanRefreshResponse, PlanResponseV1
+from common.ids import new_uuid
 from common.models import EventLog, PromptRun, Session
 from common.maintenance_ui import render_maintenance_ui
 
@@ -31,12 +32,12 @@ def register_platform_routes(
     @app.get("/health/ready")
     async def health_ready(db=Depends(get_db)):
         try:
-            await db.execute(text("SELECT 1"))
-            await helpers["redis_client"].ping()
+            await asyncio.gather(db.execute(text("SELECT 1")), helpers["redis_client"].ping())
         except Exception:
             raise HTTPException(status_code=503, detail="Infrastructure unreachable")
         if helpers["_external_preflight_required"]():
-            report = await helpers["_get_preflight_report"]()
+            # The lifespan refresher keeps the report warm; readiness never waits on the probes.
+            report = await helpers["_cached_preflight_report"]()
             if not report.get("ok"):
                 failing = [
                     name
@@ -67,42 +68,46 @@ def register_platform_routes(
         window_hours = helpers["settings"].OPERATIONS_METRICS_WINDOW_HOURS
         window_cutoff = helpers["utc_now"]() - timedelta(hours=window_hours)
 
+        async with helpers["redis_client"].pipeline(transaction=False) as pipe:
+            pipe.llen("default_queue")
+            pipe.llen("dead_letter_queue")
+            default_depth, dead_letter_depth = await pipe.execute()
         queue_depth = {
-            "default_queue": await helpers["redis_client"].llen("default_queue"),
-            "dead_letter_queue": await helpers["redis_client"].llen("dead_letter_queue"),
+            "default_queue": default_depth,
+            "dead_letter_queue": dead_letter_depth,
         }
 
-        failure_events = (await db.execute(
-            select(EventLog).where(
-                EventLog.created_at >= window_cutoff,
-                EventLog.event_type.in_(["worker_retry_scheduled", "worker_moved_to_dlq"])
-            )
-        )).scalars().all()
-
-        retry_count = 0
-        dlq_count = 0
-        for event in failure_events:
-            if event.event_type == "worker_retry_scheduled":
-                retry_count += 1
-            elif event.event_type == "worker_moved_to_dlq":
-                dlq_count += 1
+        failure_counts = dict(
+            (
+                await db.execute(
+                    select(EventLog.event_type, func.count())
+                    .where(
+                        EventLog.created_at >= window_cutoff,
+                        EventLog.event_type.in_(["worker_retry_scheduled", "worker_moved_to_dlq"]),
+                    )
+                    .group_by(EventLog.event_type)
+                )
+            ).all()
+        )
+        retry_count = failure_counts.get("worker_retry_scheduled", 0)
+        dlq_count = failure_counts.get("worker_moved_to_dlq", 0)
 
         tracked_topics = ("memory.summarize", "memory.compact", "plan.refresh", "reminders.dispatch")
         last_success_by_topic: Dict[str, Optional[str]] = {topic: None for topic in tracked_topics}
-        completed_events = (await db.execute(
-            select(EventLog).where(
-                EventLog.event_type == "worker_topic_completed"
-            ).order_by(EventLog.created_at.desc()).limit(1000)
-        )).scalars().all()
-        for event in completed_events:
-            payload = event.payload_json or {}
-            topic = payload.get("topic")
-            if topic not in last_success_by_topic or last_success_by_topic[topic] is not None:
-                continue
-            if event.created_at:
-                last_success_by_topic[topic] = event.created_at.isoformat()
-            if all(last_success_by_topic.values()):
-                break
+        completed_topic = EventLog.payload_json["topic"].as_string()
+        latest_completions = (
+            await db.execute(
+                select(completed_topic, func.max(EventLog.created_at))
+                .where(
+                    EventLog.event_type == "worker_topic_completed",
+                    completed_topic.in_(tracked_topics),
+                )
+                .group_by(completed_topic)
+            )
+        ).all()
+        for topic, completed_at in latest_completions:
+            if topic in last_success_by_topic and completed_at:
+                last_success_by_topic[topic] = completed_at.isoformat()
 
         total_failures = retry_count + dlq_count
         return {
@@ -123,42 +128,39 @@ def register_platform_routes(
     async def health_costs_daily(user_id: str = Depends(get_authenticated_user), db=Depends(get_db)):
         day_start = helpers["utc_now"]().replace(hour=0, minute=0, second=0, microsecond=0)
         day_end = day_start + timedelta(days=1)
-        rows = (await db.execute(
-            select(PromptRun).where(
-                PromptRun.user_id == user_id,
-                PromptRun.created_at >= day_start,
-                PromptRun.created_at < day_end
-            )
-        )).scalars().all()
-
-        total_input_tokens = 0
-        total_output_tokens = 0
-        total_cached_input_tokens = 0
-        by_operation_model: Dict[str, Dict[str, Any]] = {}
-
-        for row in rows:
-            input_tokens = row.input_tokens or 0
-            output_tokens = row.output_tokens or 0
-            cached_input_tokens = row.cached_input_tokens or 0
-            total_input_tokens += input_tokens
-            total_output_tokens += output_tokens
-            total_cached_input_tokens += cached_input_tokens
-            key = f"{row.operation}|{row.model}"
-            entry = by_operation_model.setdefault(
-                key,
-                {
-                    "operation": row.operation,
-                    "model": row.model,
-                    "runs": 0,
-                    "input_tokens": 0,
-                    "output_tokens": 0,
-                    "cached_input_tokens": 0,
-                },
+        rows = (
+            await db.execute(
+                select(
+                    PromptRun.operation,
+                    PromptRun.model,
+                    func.count().label("runs"),
+                    func.sum(func.coalesce(PromptRun.input_tokens, 0)).label("input_tokens"),
+                    func.sum(func.coalesce(PromptRun.output_tokens, 0)).label("output_tokens"),
+                    func.sum(func.coalesce(PromptRun.cached_input_tokens, 0)).label("cached_input_tokens"),
+                )
+                .where(
+                    PromptRun.user_id == user_id,
+                    PromptRun.created_at >= day_start,
+                    PromptRun.created_at < day_end,
+                )
+                .group_by(PromptRun.operation, PromptRun.model)
             )
-            entry["runs"] += 1
-            entry["input_tokens"] += input_tokens
-            entry["output_tokens"] += output_tokens
-            entry["cached_input_tokens"] += cached_input_tokens
+        ).all()
+
+        by_operation_model = [
+            {
+                "operation": row.operation,
+                "model": row.model,
+                "runs": int(row.runs or 0),
+                "input_tokens": int(row.input_tokens or 0),
+                "output_tokens": int(row.output_tokens or 0),
+                "cached_input_tokens": int(row.cached_input_tokens or 0),
+            }
+            for row in rows
+        ]
+        total_input_tokens = sum(entry["input_tokens"] for entry in by_operation_model)
+        total_output_tokens = sum(entry["output_tokens"] for entry in by_operation_model)
+        total_cached_input_tokens = sum(entry["cached_input_tokens"] for entry in by_operation_model)
 
         def _estimate(input_t: int, output_t: int, cached_t: int) -> float:
             usd = (
@@ -169,7 +171,7 @@ def register_platform_routes(
             return round(max(usd, 0.0), 8)
 
         breakdown = []
-        for entry in by_operation_model.values():
+        for entry in by_operation_model:
             entry["estimated_usd"] = _estimate(
                 entry["input_tokens"],
                 entry["output_tokens"],
@@ -199,10 +201,10 @@ def register_platform_routes(
         if hasattr(request.state, "idempotent_response"):
             return request.state.idempotent_response
         await helpers["enforce_rate_limit"](user_id, "plan", helpers["settings"].RATE_LIMIT_PLAN_PER_WINDOW)
-        job_id = str(uuid.uuid4())
+        job_id = new_uuid()
         await helpers["redis_client"].rpush(
             "default_queue",
-            json.dumps({"job_id": job_id, "topic": "plan.refresh", "payload": {"user_id": user_id, "chat_id": payload.chat_id}}),
+            orjson.dumps({"job_id": job_id, "topic": "plan.refresh", "payload": {"user_id": user_id, "chat_id": payload.chat_id}}),
         )
         resp = PlanRefreshResponse(status="ok", enqueued=True, job_id=job_id)
         await helpers["save_idempotency"](user_id, request.state.idempotency_key, request.state.request_hash, 200, resp.model_dump())
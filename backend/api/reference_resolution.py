@@ -1,19 +1,24 @@
 import copy
 from typing import Any, Dict, List, Optional
 
+_OPEN_TASK_STATUSES = frozenset({"open", "blocked"})
+_CLOSED_TASK_STATUSES = frozenset({"done", "archived"})
+_TARGETED_TASK_ACTIONS = frozenset({"update", "complete", "archive"})
+_ACTIVE_REMINDER_STATUSES = frozenset({"pending", "sent"})
+
 
 def run_has_term_overlap(title_terms: set[str], msg_terms: set[str]) -> bool:
-    for message_term in msg_terms:
-        if len(message_term) < 4:
-            continue
-        for title_term in title_terms:
-            if len(title_term) < 4:
-                continue
-            if (
-                message_term == title_term
-                or message_term.startswith(title_term)
-                or title_term.startswith(message_term)
-            ):
+    long_title_terms = {term for term in title_terms if len(term) >= 4}
+    if not long_title_terms:
+        return False
+    long_message_terms = {term for term in msg_terms if len(term) >= 4}
+    if not long_message_terms:
+        return False
+    if not long_title_terms.isdisjoint(long_message_terms):
+        return True
+    for message_term in long_message_terms:
+        for title_term in long_title_terms:
+            if message_term.startswith(title_term) or title_term.startswith(message_term):
                 return True
     return False
 
@@ -22,12 +27,14 @@ def run_task_reference_candidates(grounding: Dict[str, Any], *, helpers: Dict[st
     if not isinstance(grounding, dict):
         return []
     candidates: Dict[str, Dict[str, Any]] = {}
+    canonical_title = helpers["_canonical_task_title"]
 
     def add_rows(rows: Any, source: str) -> None:
         if not isinstance(rows, list):
             return
         for row in rows:
-            if not isinstance(row, dict):
+            # Grounding rows are plain dicts built by us; skip the isinstance MRO walk per row.
+            if type(row) is not dict:
                 continue
             task_id = row.get("id")
             title = row.get("title")
@@ -35,16 +42,17 @@ def run_task_reference_candidates(grounding: Dict[str, Any], *, helpers: Dict[st
                 continue
             if not isinstance(title, str) or not title.strip():
                 continue
-            existing = candidates.get(task_id.strip())
+            task_id = task_id.strip()
+            existing = candidates.get(task_id)
             if not existing:
                 existing = {
-                    "id": task_id.strip(),
-                    "title": helpers["_canonical_task_title"](title),
+                    "id": task_id,
+                    "title": canonical_title(title),
                     "parent_title": str(row.get("parent_title") or "").strip() or None,
                     "status": str(row.get("status") or "").strip().lower(),
                     "sources": set(),
                 }
-                candidates[task_id.strip()] = existing
+                candidates[task_id] = existing
             existing["sources"].add(source)
             if not existing.get("parent_title") and isinstance(row.get("parent_title"), str) and row.get("parent_title").strip():
                 existing["parent_title"] = row.get("parent_title").strip()
@@ -59,8 +67,24 @@ def run_task_reference_candidates(grounding: Dict[str, Any], *, helpers: Dict[st
     return list(candidates.values())
 
 
-def run_score_task_reference_candidate(clause: str, candidate: Dict[str, Any], *, helpers: Dict[str, Any]) -> Dict[str, Any]:
-    clause_text = helpers["_normalize_query_text"](clause)
+def _task_clause_terms(clause_text: str, *, helpers: Dict[str, Any]) -> set[str]:
+    return {
+        term
+        for term in helpers["_grounding_terms"](clause_text)
+        if term not in helpers["TASK_MATCH_IGNORE_TERMS"]
+    }
+
+
+def run_score_task_reference_candidate(
+    clause: str,
+    candidate: Dict[str, Any],
+    *,
+    helpers: Dict[str, Any],
+    clause_text: Optional[str] = None,
+    clause_terms: Optional[set[str]] = None,
+) -> Dict[str, Any]:
+    if clause_text is None:
+        clause_text = helpers["_normalize_query_text"](clause)
     if not clause_text:
         return {"score": 0, "evidence": []}
     title_text = helpers["_normalize_query_text"](candidate.get("title"))
@@ -68,11 +92,8 @@ def run_score_task_reference_candidate(clause: str, candidate: Dict[str, Any], *
         return {"score": 0, "evidence": []}
     parent_text = helpers["_normalize_query_text"](candidate.get("parent_title"))
 
-    clause_terms = {
-        term
-        for term in helpers["_grounding_terms"](clause_text)
-        if term not in helpers["TASK_MATCH_IGNORE_TERMS"]
-    }
+    if clause_terms is None:
+        clause_terms = _task_clause_terms(clause_text, helpers=helpers)
     title_terms = helpers["_grounding_terms"](title_text)
     overlap_terms = {
         term
@@ -123,7 +144,7 @@ def run_score_task_reference_candidate(clause: str, candidate: Dict[str, Any], *
     if "grounding" in sources:
         score += 1
         evidence.append("grounding")
-    if candidate.get("status") in {"open", "blocked"}:
+    if candidate.get("status") in _OPEN_TASK_STATUSES:
         score += 1
         evidence.append("open")
 
@@ -138,10 +159,20 @@ def run_rank_task_reference_candidates(
     helpers: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
     ranked: List[Dict[str, Any]] = []
+    clause_text = helpers["_normalize_query_text"](clause)
+    if not clause_text:
+        return ranked
+    clause_terms = _task_clause_terms(clause_text, helpers=helpers)
     for candidate in run_task_reference_candidates(grounding, helpers=helpers):
-        if open_only and candidate.get("status") not in {"open", "blocked"}:
+        if open_only and candidate.get("status") not in _OPEN_TASK_STATUSES:
             continue
-        scored = run_score_task_reference_candidate(clause, candidate, helpers=helpers)
+        scored = run_score_task_reference_candidate(
+            clause,
+            candidate,
+            helpers=helpers,
+            clause_text=clause_text,
+            clause_terms=clause_terms,
+        )
         score = scored.get("score") or 0
         if score <= 0:
             continue
@@ -188,35 +219,48 @@ def run_best_task_reference_candidate(
     return None
 
 
-def run_completion_candidate_rows(grounding: Dict[str, Any], *, helpers: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _completion_candidates_by_id(grounding: Dict[str, Any], *, helpers: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     if not isinstance(grounding, dict):
-        return []
-    out: List[Dict[str, Any]] = []
-    seen: set[str] = set()
+        return {}
+    canonical_title = helpers["_canonical_task_title"]
+    candidates: Dict[str, Dict[str, Any]] = {}
     for key in ("recent_task_refs", "tasks"):
         rows = grounding.get(key)
         if not isinstance(rows, list):
             continue
         for row in rows:
-            if not isinstance(row, dict):
+            if type(row) is not dict:
                 continue
-            task_id = row.get("id")
-            title = row.get("title")
-            if not isinstance(task_id, str) or not task_id.strip():
-                continue
-            if not isinstance(title, str) or not title.strip():
+            get = row.get
+            task_id = get("id")
+            title = get("title")
+            if not isinstance(task_id, str) or not isinstance(title, str):
                 continue
-            if task_id in seen:
+            task_id = task_id.strip()
+            if not task_id or task_id in candidates or not title.strip():
                 continue
-            seen.add(task_id)
-            out.append(
-                {
-                    "id": task_id.strip(),
-                    "title": helpers["_canonical_task_title"](title),
-                    "status": str(row.get("status") or "").strip().lower(),
-                }
-            )
-    return out
+            candidates[task_id] = {
+                "id": task_id,
+                "title": canonical_title(title),
+                "status": str(get("status") or "").strip().lower(),
+            }
+    return candidates
+
+
+def run_completion_candidate_rows(grounding: Dict[str, Any], *, helpers: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return list(_completion_candidates_by_id(grounding, helpers=helpers).values())
+
+
+def run_prepare_completion_candidates(grounding: Dict[str, Any], *, helpers: Dict[str, Any]) -> Dict[str, Any]:
+    """Index completion candidates once so every sanitizer in a pass shares the lookups."""
+    row_by_id = _completion_candidates_by_id(grounding, helpers=helpers)
+    open_by_id: Dict[str, Dict[str, Any]] = {}
+    open_by_title: Dict[str, Dict[str, Any]] = {}
+    for task_id, row in row_by_id.items():
+        if row["status"] in _OPEN_TASK_STATUSES:
+            open_by_id[task_id] = row
+            open_by_title[row["title"].lower().strip()] = row
+    return {"row_by_id": row_by_id, "open_by_id": open_by_id, "open_by_title": open_by_title}
 
 
 def run_sanitize_completion_extraction(
@@ -224,24 +268,22 @@ def run_sanitize_completion_extraction(
     grounding: Dict[str, Any],
     *,
     helpers: Dict[str, Any],
+    prepared: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     if not isinstance(extraction, dict):
         return helpers["_empty_extraction"]()
 
-    rows = run_completion_candidate_rows(grounding, helpers=helpers)
-    open_by_id: Dict[str, Dict[str, Any]] = {
-        row["id"]: row for row in rows if row.get("status") in {"open", "blocked"}
-    }
-    open_by_title: Dict[str, Dict[str, Any]] = {
-        row["title"].lower().strip(): row for row in rows if row.get("status") in {"open", "blocked"}
-    }
+    if prepared is None:
+        prepared = run_prepare_completion_candidates(grounding, helpers=helpers)
+    open_by_id: Dict[str, Dict[str, Any]] = prepared["open_by_id"]
+    open_by_title: Dict[str, Dict[str, Any]] = prepared["open_by_title"]
 
     normalized_tasks: List[Dict[str, Any]] = []
     seen: set[str] = set()
     raw_tasks = extraction.get("tasks", [])
     if isinstance(raw_tasks, list):
         for task in raw_tasks:
-            if not isinstance(task, dict):
+            if type(task) is not dict:
                 continue
             action = str(task.get("action") or "").lower()
             status = str(task.get("status") or "").lower()
@@ -308,7 +350,7 @@ def run_sanitize_create_extraction(extraction: Dict[str, Any], *, helpers: Dict[
         action = str(normalized.get("action") or "").lower()
         status = str(normalized.get("status") or "").lower()
         target_task_id = normalized.get("target_task_id")
-        if action in {"complete", "archive", "update"} or status in {"done", "archived"}:
+        if action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES:
             sanitized_tasks.append(normalized)
             continue
         if isinstance(target_task_id, str) and target_task_id.strip():
@@ -354,7 +396,7 @@ def run_apply_displayed_task_reference_extraction(
             continue
         action = str(task.get("action") or "").lower()
         status = str(task.get("status") or "").lower()
-        requires_target = action in {"update", "complete", "archive"} or status in {"done", "archived"}
+        requires_target = action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES
         if not requires_target:
             normalized_tasks.append(task)
             continue
@@ -401,7 +443,7 @@ def run_is_explicit_displayed_reference_mutation(
         status = str(task.get("status") or "").lower()
         if task.get("target_task_id") not in displayed_ids:
             continue
-        if action in {"update", "complete", "archive"} or status in {"done", "archived"}:
+        if action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES:
             return True
     return False
 
@@ -432,7 +474,7 @@ def run_is_explicit_recent_named_reference_mutation(
         target_task_id = task.get("target_task_id")
         action = str(task.get("action") or "").lower()
         status = str(task.get("status") or "").lower()
-        if target_task_id in recent_ids and (action in {"complete", "archive"} or status in {"done", "archived"}):
+        if target_task_id in recent_ids and (action in {"complete", "archive"} or status in _CLOSED_TASK_STATUSES):
             return True
     return False
 
@@ -455,6 +497,7 @@ def run_sanitize_targeted_task_actions(
     grounding: Dict[str, Any],
     *,
     helpers: Dict[str, Any],
+    prepared: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     if not isinstance(extraction, dict):
         return helpers["_empty_extraction"]()
@@ -462,8 +505,9 @@ def run_sanitize_targeted_task_actions(
     if not isinstance(raw_tasks, list) or not raw_tasks:
         return extraction
 
-    rows = run_completion_candidate_rows(grounding, helpers=helpers)
-    row_by_id = {row["id"]: row for row in rows}
+    if prepared is None:
+        prepared = run_prepare_completion_candidates(grounding, helpers=helpers)
+    row_by_id: Dict[str, Dict[str, Any]] = prepared["row_by_id"]
     sanitized: List[Any] = []
     for task in raw_tasks:
         if not isinstance(task, dict):
@@ -472,7 +516,7 @@ def run_sanitize_targeted_task_actions(
         target_id = task.get("target_task_id")
         action = str(task.get("action") or "").lower()
         status = str(task.get("status") or "").lower()
-        requires_target = action in {"update", "complete", "archive"} or status in {"done", "archived"}
+        requires_target = action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES
         if (not isinstance(target_id, str) or not target_id.strip()) and requires_target:
             candidate_seed = " ".join(
                 part
@@ -577,7 +621,7 @@ def run_reminder_reference_candidates(grounding: Dict[str, Any], *, helpers: Dic
         if not isinstance(rows, list):
             return
         for row in rows:
-            if not isinstance(row, dict):
+            if type(row) is not dict:
                 continue
             reminder_id = row.get("id")
             title = row.get("title")
@@ -606,7 +650,7 @@ def run_reminder_reference_candidates(grounding: Dict[str, Any], *, helpers: Dic
             if not existing.get("remind_at") and row.get("remind_at"):
                 existing["remind_at"] = row.get("remind_at")
             row_status = str(row.get("status") or "").strip().lower()
-            if existing.get("status") not in {"pending", "sent"} and row_status in {"pending", "sent"}:
+            if existing.get("status") not in _ACTIVE_REMINDER_STATUSES and row_status in _ACTIVE_REMINDER_STATUSES:
                 existing["status"] = row_status
 
     add_rows(grounding.get("recent_reminder_refs"), "recent")
@@ -619,8 +663,11 @@ def run_score_reminder_reference_candidate(
     candidate: Dict[str, Any],
     *,
     helpers: Dict[str, Any],
+    normalized_clause: Optional[str] = None,
+    clause_terms: Optional[set[str]] = None,
 ) -> Dict[str, Any]:
-    normalized_clause = helpers["_canonical_task_title"](clause).lower().strip()
+    if normalized_clause is None:
+        normalized_clause = helpers["_canonical_task_title"](clause).lower().strip()
     if not normalized_clause:
         return {"score": 0, "evidence": []}
 
@@ -630,7 +677,8 @@ def run_score_reminder_reference_candidate(
     candidate_terms = helpers["_grounding_terms"](title)
     message_terms = helpers["_grounding_terms"](message)
     work_item_terms = helpers["_grounding_terms"](work_item_title)
-    clause_terms = helpers["_grounding_terms"](normalized_clause)
+    if clause_terms is None:
+        clause_terms = helpers["_grounding_terms"](normalized_clause)
     evidence: List[str] = []
     score = 0
 
@@ -671,10 +719,20 @@ def run_rank_reminder_reference_candidates(
     helpers: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
     ranked: List[Dict[str, Any]] = []
+    normalized_clause = helpers["_canonical_task_title"](clause).lower().strip()
+    if not normalized_clause:
+        return ranked
+    clause_terms = helpers["_grounding_terms"](normalized_clause)
     for candidate in run_reminder_reference_candidates(grounding, helpers=helpers):
-        if active_only and candidate.get("status") not in {"pending", "sent"}:
+        if active_only and candidate.get("status") not in _ACTIVE_REMINDER_STATUSES:
             continue
-        scored = run_score_reminder_reference_candidate(clause, candidate, helpers=helpers)
+        scored = run_score_reminder_reference_candidate(
+            clause,
+            candidate,
+            helpers=helpers,
+            normalized_clause=normalized_clause,
+            clause_terms=clause_terms,
+        )
         score = scored.get("score") or 0
         if score <= 0:
             continue
@@ -843,7 +901,7 @@ def run_candidate_task_clarification_info(
                     continue
                 action = str(task.get("action") or "").lower()
                 status = str(task.get("status") or "").lower()
-                requires_target = action in {"update", "complete", "archive"} or status in {"done", "archived"}
+                requires_target = action in _TARGETED_TASK_ACTIONS or status in _CLOSED_TASK_STATUSES
                 if requires_target and not task.get("target_task_id"):
                     query = task.get("title") if isinstance(task.get("title"), str) and task.get("title").strip() else message
                     candidate_queries.append((query, task))
@@ -999,7 +1057,7 @@ def run_select_clarification_candidate(
         for candidate in candidates
         if isinstance(candidate, dict)
     }
-    open_only = bool(status_values & {"open", "blocked"})
+    open_only = bool(status_values & _OPEN_TASK_STATUSES)
     reply_grounding = {
         "tasks": candidates,
         "recent_task_refs": candidates,
@@ -1030,8 +1088,8 @@ def run_fill_clarified_task_target(base_extraction: Dict[str, Any], candidate: D
         if isinstance(task, dict)
         and not (isinstance(task.get("target_task_id"), str) and task.get("target_task_id").strip())
         and (
-            str(task.get("action") or "").lower() in {"update", "complete", "archive"}
-            or str(task.get("status") or "").lower() in {"done", "archived"}
+            str(task.get("action") or "").lower() in _TARGETED_TASK_ACTIONS
+            or str(task.get("status") or "").lower() in _CLOSED_TASK_STATUSES
         )
     ]
     if len(unresolved_indexes) != 1:
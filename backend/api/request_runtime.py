@@ -1,12 +1,25 @@
 import hashlib
+import json
 import uuid
-from datetime import timedelta
-from typing import Any, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select
 
+from api.draft_runtime import _REMINDER_ACTIONS, _REMINDER_KINDS, _REMINDER_STATUSES, _TASK_ACTIONS, _TASK_KINDS
+
+_RATE_LIMIT_LUA = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {current, redis.call('TTL', KEYS[1])}
+"""
+_rate_limit_script_cache: Tuple[Any, Any] = (None, None)
+_IDEMPOTENT_METHODS = frozenset({"POST", "PATCH", "PUT", "DELETE"})
+
 
 async def run_get_authenticated_user(request, *, helpers: Dict[str, Any]):
     auth_header = request.headers.get("Authorization")
@@ -28,34 +41,69 @@ async def run_get_authenticated_user(request, *, helpers: Dict[str, Any]):
     return "usr_dev"
 
 
+def _rate_limit_script(redis_client: Any):
+    """Return the fixed-window limiter script registered on the given client."""
+    global _rate_limit_script_cache
+    script, client = _rate_limit_script_cache
+    if script is None or client is not redis_client:
+        script = redis_client.register_script(_RATE_LIMIT_LUA)
+        _rate_limit_script_cache = (script, redis_client)
+    return script
+
+
 async def run_enforce_rate_limit(user_id: str, endpoint_class: str, limit: int, *, helpers: Dict[str, Any]):
     key = f"rate_limit:{endpoint_class}:{user_id}"
-    current = await helpers["redis_client"].incr(key)
-    if current == 1:
-        await helpers["redis_client"].expire(key, helpers["settings"].RATE_LIMIT_WINDOW_SECONDS)
+    window = helpers["settings"].RATE_LIMIT_WINDOW_SECONDS
+    # INCR, first-hit EXPIRE and TTL run server-side as one atomic script call.
+    current, ttl = await _rate_limit_script(helpers["redis_client"])(keys=[key], args=[window])
     if current > limit:
-        ttl = await helpers["redis_client"].ttl(key)
         if ttl is None or ttl < 0:
-            ttl = helpers["settings"].RATE_LIMIT_WINDOW_SECONDS
+            ttl = window
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Rate limit exceeded for {endpoint_class}. Retry in {ttl}s.",
         )
 
 
+_USAGE_KEYS = ("input_tokens", "output_tokens", "cached_input_tokens")
+
+
+def _int_or_zero(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
 def run_extract_usage(metadata: Any) -> Dict[str, int]:
     if not isinstance(metadata, dict):
         return {"input_tokens": 0, "output_tokens": 0, "cached_input_tokens": 0}
     usage = metadata.get("usage", metadata)
     if not isinstance(usage, dict):
         return {"input_tokens": 0, "output_tokens": 0, "cached_input_tokens": 0}
-    return {
-        "input_tokens": usage.get("input_tokens", 0) if isinstance(usage.get("input_tokens", 0), int) else 0,
-        "output_tokens": usage.get("output_tokens", 0) if isinstance(usage.get("output_tokens", 0), int) else 0,
-        "cached_input_tokens": usage.get("cached_input_tokens", 0)
-        if isinstance(usage.get("cached_input_tokens", 0), int)
-        else 0,
-    }
+    return {key: _int_or_zero(usage.get(key)) for key in _USAGE_KEYS}
+
+
+# (field, error) pairs for optional string fields, in the order the validator reports them.
+_TASK_REFERENCE_FIELDS = (
+    ("target_task_id", "Invalid target_task_id"),
+    ("parent_task_id", "Invalid parent_task_id"),
+    ("parent_title", "Invalid parent_title"),
+)
+_TASK_NOTES_FIELDS = (("notes", "Invalid task notes"),)
+_LINK_KEYS = ("from_type", "from_title", "to_type", "to_title", "link_type")
+_REMINDER_LEADING_STR_FIELDS = (
+    ("target_reminder_id", "Invalid target_reminder_id"),
+    ("message", "Invalid reminder message"),
+)
+_REMINDER_TRAILING_STR_FIELDS = (
+    ("work_item_id", "Invalid reminder work_item_id"),
+    ("person_id", "Invalid reminder person_id"),
+)
+
+
+def _require_optional_str(entry: Dict[str, Any], fields: Tuple[Tuple[str, str], ...]) -> None:
+    for key, error in fields:
+        value = entry.get(key)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(error)
 
 
 def run_validate_extraction_payload(extraction: Any, *, helpers: Dict[str, Any]) -> None:
@@ -77,166 +125,212 @@ def run_validate_extraction_payload(extraction: Any, *, helpers: Dict[str, Any])
     for task in extraction["tasks"]:
         if not isinstance(task, dict):
             raise ValueError("Invalid task entry type")
-        if not isinstance(task.get("title"), str) or not task.get("title").strip():
+        title = task.get("title")
+        if not isinstance(title, str) or not title.strip():
             raise ValueError("Invalid task title")
-        if "kind" in task and task.get("kind") is not None:
-            if task.get("kind") not in {"project", "task", "subtask"}:
-                raise ValueError("Invalid task kind")
+        kind = task.get("kind")
+        if kind is not None and kind not in _TASK_KINDS:
+            raise ValueError("Invalid task kind")
         action = task.get("action")
-        if action is not None and action not in {"create", "update", "complete", "archive", "noop"}:
+        if action is not None and action not in _TASK_ACTIONS:
             raise ValueError("Invalid task action")
-        if "target_task_id" in task and task.get("target_task_id") is not None and not isinstance(
-            task.get("target_task_id"), str
-        ):
-            raise ValueError("Invalid target_task_id")
-        if "parent_task_id" in task and task.get("parent_task_id") is not None and not isinstance(
-            task.get("parent_task_id"), str
-        ):
-            raise ValueError("Invalid parent_task_id")
-        if "parent_title" in task and task.get("parent_title") is not None and not isinstance(
-            task.get("parent_title"), str
-        ):
-            raise ValueError("Invalid parent_title")
-        if "priority" in task and task.get("priority") is not None and not isinstance(task.get("priority"), int):
-            raise ValueError("Invalid task priority")
-        if "priority" in task and isinstance(task.get("priority"), int) and not (1 <= task.get("priority") <= 4):
-            raise ValueError("Invalid task priority range")
-        if "impact_score" in task and task.get("impact_score") is not None:
-            if not isinstance(task.get("impact_score"), int) or not (1 <= task.get("impact_score") <= 5):
-                raise ValueError("Invalid task impact_score")
-        if "urgency_score" in task and task.get("urgency_score") is not None:
-            if not isinstance(task.get("urgency_score"), int) or not (1 <= task.get("urgency_score") <= 5):
-                raise ValueError("Invalid task urgency_score")
-        if "notes" in task and task.get("notes") is not None and not isinstance(task.get("notes"), str):
-            raise ValueError("Invalid task notes")
-        if "due_date" in task and task.get("due_date") is not None:
-            due_raw = task.get("due_date")
+        _require_optional_str(task, _TASK_REFERENCE_FIELDS)
+        priority = task.get("priority")
+        if priority is not None:
+            if not isinstance(priority, int):
+                raise ValueError("Invalid task priority")
+            if not 1 <= priority <= 4:
+                raise ValueError("Invalid task priority range")
+        for score_key in ("impact_score", "urgency_score"):
+            score = task.get(score_key)
+            if score is not None and (not isinstance(score, int) or not 1 <= score <= 5):
+                raise ValueError(f"Invalid task {score_key}")
+        _require_optional_str(task, _TASK_NOTES_FIELDS)
+        due_raw = task.get("due_date")
+        if due_raw is not None:
             if not isinstance(due_raw, str):
                 raise ValueError("Invalid task due_date")
             if helpers["_parse_due_date"](due_raw) is None:
                 raise ValueError("Invalid task due_date format")
 
     folded_project_tasks = []
-    for goal in extraction["goals"]:
-        if not isinstance(goal, dict):
-            raise ValueError("Invalid goal entry type")
-        if not isinstance(goal.get("title"), str) or not goal.get("title").strip():
-            raise ValueError("Invalid goal title")
-        folded_project_tasks.append(
-            {
-                "title": goal.get("title").strip(),
-                "kind": "project",
-                "notes": goal.get("description").strip()
-                if isinstance(goal.get("description"), str) and goal.get("description").strip()
-                else None,
-            }
-        )
-
-    for problem in extraction["problems"]:
-        if not isinstance(problem, dict):
-            raise ValueError("Invalid problem entry type")
-        if not isinstance(problem.get("title"), str) or not problem.get("title").strip():
-            raise ValueError("Invalid problem title")
-        folded_project_tasks.append(
-            {
-                "title": problem.get("title").strip(),
-                "kind": "project",
-                "notes": problem.get("description").strip()
-                if isinstance(problem.get("description"), str) and problem.get("description").strip()
-                else None,
-            }
-        )
+    for entry_type in ("goal", "problem"):
+        for entry in extraction[f"{entry_type}s"]:
+            if not isinstance(entry, dict):
+                raise ValueError(f"Invalid {entry_type} entry type")
+            title = entry.get("title")
+            if not isinstance(title, str) or not title.strip():
+                raise ValueError(f"Invalid {entry_type} title")
+            description = entry.get("description")
+            description = description.strip() if isinstance(description, str) else ""
+            folded_project_tasks.append(
+                {
+                    "title": title.strip(),
+                    "kind": "project",
+                    "notes": description or None,
+                }
+            )
 
     if folded_project_tasks:
         extraction["tasks"].extend(folded_project_tasks)
         extraction["goals"] = []
         extraction["problems"] = []
 
-    link_keys = ("from_type", "from_title", "to_type", "to_title", "link_type")
     for link in extraction["links"]:
         if not isinstance(link, dict):
             raise ValueError("Invalid link entry type")
-        for key in link_keys:
-            if not isinstance(link.get(key), str) or not link.get(key).strip():
+        for key in _LINK_KEYS:
+            value = link.get(key)
+            if not isinstance(value, str) or not value.strip():
                 raise ValueError(f"Invalid link field: {key}")
 
     for reminder in extraction["reminders"]:
         if not isinstance(reminder, dict):
             raise ValueError("Invalid reminder entry type")
-        if not isinstance(reminder.get("title"), str) or not reminder.get("title").strip():
+        title = reminder.get("title")
+        if not isinstance(title, str) or not title.strip():
             raise ValueError("Invalid reminder title")
         action = reminder.get("action")
-        if action is not None and action not in {"create", "update", "complete", "dismiss", "cancel", "noop"}:
+        if action is not None and action not in _REMINDER_ACTIONS:
             raise ValueError("Invalid reminder action")
-        if "target_reminder_id" in reminder and reminder.get("target_reminder_id") is not None and not isinstance(
-            reminder.get("target_reminder_id"), str
-        ):
-            raise ValueError("Invalid target_reminder_id")
-        if "message" in reminder and reminder.get("message") is not None and not isinstance(
-            reminder.get("message"), str
-        ):
-            raise ValueError("Invalid reminder message")
-        if "remind_at" in reminder and reminder.get("remind_at") is not None:
-            remind_at = reminder.get("remind_at")
+        _require_optional_str(reminder, _REMINDER_LEADING_STR_FIELDS)
+        remind_at = reminder.get("remind_at")
+        parsed_remind_at = None
+        if remind_at is not None:
             if not isinstance(remind_at, str):
                 raise ValueError("Invalid reminder remind_at")
-            if helpers["_parse_due_at"](remind_at) is None:
+            parsed_remind_at = helpers["_parse_due_at"](remind_at)
+            if parsed_remind_at is None:
                 raise ValueError("Invalid reminder remind_at format")
-        if "kind" in reminder and reminder.get("kind") is not None:
-            if reminder.get("kind") not in {"one_off", "follow_up", "recurring"}:
-                raise ValueError("Invalid reminder kind")
-        if "status" in reminder and reminder.get("status") is not None:
-            if reminder.get("status") not in {"pending", "sent", "completed", "dismissed", "canceled"}:
-                raise ValueError("Invalid reminder status")
-        if "recurrence_rule" in reminder and reminder.get("recurrence_rule") is not None:
-            recurrence_rule = reminder.get("recurrence_rule")
-            if not isinstance(recurrence_rule, str):
+        kind = reminder.get("kind")
+        if kind is not None and kind not in _REMINDER_KINDS:
+            raise ValueError("Invalid reminder kind")
+        reminder_status = reminder.get("status")
+        if reminder_status is not None and reminder_status not in _REMINDER_STATUSES:
+            raise ValueError("Invalid reminder status")
+        recurrence_rule = reminder.get("recurrence_rule")
+        if recurrence_rule is not None:
+            if not isinstance(recurrence_rule, str) or helpers["normalize_recurrence_rule"](recurrence_rule) is None:
                 raise ValueError("Invalid reminder recurrence_rule")
-            if helpers["normalize_recurrence_rule"](recurrence_rule) is None:
-                raise ValueError("Invalid reminder recurrence_rule")
-        if "work_item_id" in reminder and reminder.get("work_item_id") is not None and not isinstance(
-            reminder.get("work_item_id"), str
-        ):
-            raise ValueError("Invalid reminder work_item_id")
-        if "person_id" in reminder and reminder.get("person_id") is not None and not isinstance(
-            reminder.get("person_id"), str
-        ):
-            raise ValueError("Invalid reminder person_id")
-        reminder_action = str(reminder.get("action") or "").strip().lower()
-        if reminder_action == "create" and helpers["_parse_due_at"](reminder.get("remind_at")) is None:
+        _require_optional_str(reminder, _REMINDER_TRAILING_STR_FIELDS)
+        if str(action or "").strip().lower() == "create" and parsed_remind_at is None:
             raise ValueError("Reminder create requires remind_at")
-        reminder_kind = str(reminder.get("kind") or "").strip().lower()
-        if reminder_kind == "recurring" and not reminder.get("recurrence_rule"):
+        if str(kind or "").strip().lower() == "recurring" and not recurrence_rule:
             raise ValueError("Recurring reminders require recurrence_rule")
 
 
+def _idempotency_cache_key(user_id: str, idempotency_key: str) -> str:
+    return f"idem:{user_id}:{idempotency_key}"
+
+
+def _idempotency_request_hash(method: str, path: str, user_id: str, body: bytes) -> str:
+    # Hash the raw body bytes; for UTF-8 bodies this matches the old decode/re-encode digest.
+    identity = hashlib.sha256(f"{method}|{path}|{user_id}|".encode("utf-8"))
+    identity.update(body)
+    return identity.hexdigest()
+
+
+async def _cached_idempotency_entry(user_id: str, idempotency_key: str, *, helpers: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        cached = await helpers["redis_client"].get(_idempotency_cache_key(user_id, idempotency_key))
+        if cached:
+            entry = json.loads(cached)
+            if isinstance(entry, dict) and "request_hash" in entry:
+                return entry
+    except Exception as exc:
+        helpers["logger"].warning("Idempotency cache lookup failed for user %s: %s", user_id, exc)
+    return None
+
+
+async def _backfill_idempotency_cache(user_id: str, idempotency_key: str, existing: Any, *, helpers: Dict[str, Any]) -> None:
+    # A key found only in Postgres (memo evicted or never written) is re-memoized so
+    # further replays of it stay on the Redis path.
+    expires_at = getattr(existing, "expires_at", None)
+    if not isinstance(expires_at, datetime):
+        return
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    remaining_seconds = int((expires_at - helpers["utc_now"]()).total_seconds())
+    if remaining_seconds <= 0:
+        return
+    try:
+        await helpers["redis_client"].setex(
+            _idempotency_cache_key(user_id, idempotency_key),
+            remaining_seconds,
+            json.dumps({"request_hash": existing.request_hash, "response_body": existing.response_body}),
+        )
+    except Exception as exc:
+        helpers["logger"].warning("Failed to backfill idempotency cache for user %s: %s", user_id, exc)
+
+
 async def run_check_idempotency(request, user_id: str, db, *, helpers: Dict[str, Any]):
-    if request.method not in ["POST", "PATCH", "PUT", "DELETE"]:
+    if request.method not in _IDEMPOTENT_METHODS:
         return
     idempotency_key = request.headers.get("Idempotency-Key")
     if not idempotency_key:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing Idempotency-Key header")
 
     body = await request.body()
-    identity_string = f"{request.method}|{request.url.path}|{user_id}|{body.decode('utf-8', errors='ignore')}"
-    body_hash = hashlib.sha256(identity_string.encode("utf-8")).hexdigest()
-
-    stmt = select(helpers["IdempotencyKey"]).where(
-        helpers["IdempotencyKey"].user_id == user_id,
-        helpers["IdempotencyKey"].idempotency_key == idempotency_key,
-    )
-    result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
-
-    if existing:
-        if existing.request_hash != body_hash:
+    body_hash = _idempotency_request_hash(request.method, request.url.path, user_id, body)
+
+    # Replays are served from the Redis memo written by run_save_idempotency; Postgres stays the source of truth.
+    # When the replay middleware already looked this key up, reuse its answer instead of a second GET.
+    lookup = getattr(request.state, "idempotency_cache_lookup", None)
+    if isinstance(lookup, tuple) and lookup[:2] == (user_id, idempotency_key):
+        cached_entry = lookup[2]
+    else:
+        cached_entry = await _cached_idempotency_entry(user_id, idempotency_key, helpers=helpers)
+
+    if cached_entry is not None:
+        stored_hash = cached_entry["request_hash"]
+        stored_response = cached_entry.get("response_body")
+        found = True
+    else:
+        stmt = select(helpers["IdempotencyKey"]).where(
+            helpers["IdempotencyKey"].user_id == user_id,
+            helpers["IdempotencyKey"].idempotency_key == idempotency_key,
+        )
+        result = await db.execute(stmt)
+        existing = result.scalar_one_or_none()
+        found = existing is not None
+        stored_hash = existing.request_hash if found else None
+        stored_response = existing.response_body if found else None
+        if found:
+            await _backfill_idempotency_cache(user_id, idempotency_key, existing, helpers=helpers)
+
+    if found:
+        if stored_hash != body_hash:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Idempotency key collision")
-        request.state.idempotent_response = existing.response_body
+        request.state.idempotent_response = stored_response
 
     request.state.idempotency_key = idempotency_key
     request.state.request_hash = body_hash
 
 
+async def run_idempotent_replay(request, body: bytes, *, helpers: Dict[str, Any]) -> Optional[Any]:
+    """Return the memoized response for a replayed request, or None to route it normally.
+
+    Only an exact Redis hit is served here; misses, collisions and unauthenticated
+    requests fall through to check_idempotency, which owns the error responses.
+    """
+    if request.method not in _IDEMPOTENT_METHODS:
+        return None
+    idempotency_key = request.headers.get("Idempotency-Key")
+    if not idempotency_key:
+        return None
+    try:
+        user_id = await helpers["get_authenticated_user"](request)
+    except HTTPException:
+        return None
+    cached_entry = await _cached_idempotency_entry(user_id, idempotency_key, helpers=helpers)
+    request.state.idempotency_cache_lookup = (user_id, idempotency_key, cached_entry)
+    if cached_entry is None:
+        return None
+    if cached_entry["request_hash"] != _idempotency_request_hash(request.method, request.url.path, user_id, body):
+        return None
+    return cached_entry.get("response_body")
+
+
 async def run_save_idempotency(
     user_id: str,
     idempotency_key: str,
@@ -247,16 +341,25 @@ async def run_save_idempotency(
     helpers: Dict[str, Any],
 ):
     encoded_body = jsonable_encoder(response_body)
+    now = helpers["utc_now"]()
     async with helpers["AsyncSessionLocal"]() as db:
         ik = helpers["IdempotencyKey"](
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             user_id=user_id,
             idempotency_key=idempotency_key,
             request_hash=request_hash,
             response_status=status_code,
             response_body=encoded_body,
-            created_at=helpers["utc_now"](),
-            expires_at=helpers["utc_now"]() + timedelta(hours=helpers["settings"].IDEMPOTENCY_TTL_HOURS),
+            created_at=now,
+            expires_at=now + timedelta(hours=helpers["settings"].IDEMPOTENCY_TTL_HOURS),
         )
         db.add(ik)
         await db.commit()
+    try:
+        await helpers["redis_client"].setex(
+            _idempotency_cache_key(user_id, idempotency_key),
+            helpers["settings"].IDEMPOTENCY_TTL_HOURS * 3600,
+            json.dumps({"request_hash": request_hash, "response_body": encoded_body}),
+        )
+    except Exception as exc:
+        helpers["logger"].warning("Failed to cache idempotent response for user %s: %s", user_id, exc)
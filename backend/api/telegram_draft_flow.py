@@ -1,8 +1,15 @@
-import uuid
 import re
-from datetime import timedelta
 from typing import Any, Dict, Optional
 
+from common.ids import new_uuid, short_id
+
+_MIXED_TURN_CLAUSE_SPLIT_PATTERN = re.compile(
+    r"(?<=[.!?])\s+(?=(?:also|and also|then|next|plus|separately)\b)",
+    re.IGNORECASE,
+)
+_OVERDUE_PATTERN = re.compile(r"\boverdue\b|\bpast due\b")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
 
 def _split_mixed_turn_clauses(text: str) -> list[str]:
     if not isinstance(text, str) or not text.strip():
@@ -10,17 +17,7 @@ def _split_mixed_turn_clauses(text: str) -> list[str]:
     if "\n" in text:
         raw_parts = [part.strip() for part in text.splitlines() if part.strip()]
     else:
-        import re
-
-        raw_parts = [
-            part.strip()
-            for part in re.split(
-                r"(?<=[.!?])\s+(?=(?:also|and also|then|next|plus|separately)\b)",
-                text,
-                flags=re.IGNORECASE,
-            )
-            if part.strip()
-        ]
+        raw_parts = [part.strip() for part in _MIXED_TURN_CLAUSE_SPLIT_PATTERN.split(text) if part.strip()]
     clauses: list[str] = []
     for part in raw_parts:
         if len(part) < 4:
@@ -44,11 +41,17 @@ def _looks_like_structured_capture_message(text: str) -> bool:
     return len(lines) >= 3 and all(len(line.split()) <= 16 for line in lines)
 
 
+async def _commit_and_reply(db, chat_id: str, text: str, *, helpers: Dict[str, Any]) -> None:
+    # Commit first: the reply confirms state that must already be durable.
+    await db.commit()
+    await helpers["send_message"](chat_id, text)
+
+
 def _query_mentions_overdue(text: str) -> bool:
     if not isinstance(text, str) or not text.strip():
         return False
-    normalized = re.sub(r"\s+", " ", text.strip().lower())
-    return bool(re.search(r"\boverdue\b|\bpast due\b", normalized))
+    normalized = _WHITESPACE_PATTERN.sub(" ", text.strip().lower())
+    return bool(_OVERDUE_PATTERN.search(normalized))
 
 
 async def run_handle_telegram_draft_flow(
@@ -60,7 +63,7 @@ async def run_handle_telegram_draft_flow(
     *,
     helpers: Dict[str, Any],
 ) -> None:
-    request_id = f"tg_{uuid.uuid4().hex[:8]}"
+    request_id = short_id("tg", nbytes=4)
     session = await helpers["_get_or_create_session"](db=db, user_id=user_id, chat_id=chat_id)
     open_draft = await helpers["_get_open_action_draft"](user_id=user_id, chat_id=chat_id, db=db)
     awaiting_edit_input = bool(open_draft and helpers["_draft_is_awaiting_edit_input"](open_draft))
@@ -93,7 +96,7 @@ async def run_handle_telegram_draft_flow(
 
     db.add(
         helpers["EventLog"](
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="telegram_turn_interpreted",
@@ -141,7 +144,7 @@ async def run_handle_telegram_draft_flow(
             ):
                 db.add(
                     helpers["EventLog"](
-                        id=str(uuid.uuid4()),
+                        id=new_uuid(),
                         request_id=request_id,
                         user_id=user_id,
                         event_type="telegram_turn_mixed_split",
@@ -253,12 +256,12 @@ async def run_handle_telegram_draft_flow(
     if open_draft and draft_action == "edit":
         if not isinstance(draft_edit_text, str) or not draft_edit_text.strip():
             helpers["_draft_set_awaiting_edit_input"](open_draft, True)
-            open_draft.updated_at = helpers["_draft_now"]()
-            open_draft.expires_at = helpers["_draft_now"]() + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
-            await db.commit()
-            await helpers["send_message"](
+            helpers["_draft_extend_expiry"](open_draft)
+            await _commit_and_reply(
+                db,
                 chat_id,
                 "Reply with your changes in one message, and I will revise the proposal.",
+                helpers=helpers,
             )
             return
         extraction = await helpers["_revise_action_draft"](
@@ -301,28 +304,24 @@ async def run_handle_telegram_draft_flow(
                     clarification.get("state")
                     or {"kind": "task_candidates", "candidates": clarification.get("candidates", [])},
                 )
-                open_draft.updated_at = helpers["_draft_now"]()
-                open_draft.expires_at = helpers["_draft_now"]() + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
-                await db.commit()
-                await helpers["send_message"](chat_id, clarification["text"])
+                helpers["_draft_extend_expiry"](open_draft)
+                await _commit_and_reply(db, chat_id, clarification["text"], helpers=helpers)
                 return
             reminder_schedule = helpers["_missing_reminder_schedule_info"](extraction)
             if reminder_schedule:
                 helpers["_draft_set_awaiting_edit_input"](open_draft, True)
                 helpers["_draft_set_clarification_state"](open_draft, reminder_schedule.get("state"))
-                open_draft.updated_at = helpers["_draft_now"]()
-                open_draft.expires_at = helpers["_draft_now"]() + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
-                await db.commit()
-                await helpers["send_message"](chat_id, reminder_schedule["text"])
+                helpers["_draft_extend_expiry"](open_draft)
+                await _commit_and_reply(db, chat_id, reminder_schedule["text"], helpers=helpers)
                 return
         if not helpers["_has_actionable_entities"](extraction):
             helpers["_draft_set_awaiting_edit_input"](open_draft, True)
-            open_draft.updated_at = helpers["_draft_now"]()
-            open_draft.expires_at = helpers["_draft_now"]() + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
-            await db.commit()
-            await helpers["send_message"](
+            helpers["_draft_extend_expiry"](open_draft)
+            await _commit_and_reply(
+                db,
                 chat_id,
                 "I still need one more detail. Reply with the exact task name, and I will revise the change.",
+                helpers=helpers,
             )
             return
         await helpers["_send_or_edit_draft_preview"](
@@ -495,7 +494,7 @@ async def run_handle_telegram_draft_flow(
 
     db.add(
         helpers["EventLog"](
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="telegram_action_planned",
@@ -509,137 +508,131 @@ async def run_handle_telegram_draft_flow(
             created_at=helpers["utc_now"](),
         )
     )
-    await db.commit()
 
-    planner_actions_valid = (
-        isinstance(planned, dict)
-        and planned.get("intent") == "action"
-        and isinstance(actions, list)
-        and len(actions) > 0
-    )
-    used_extract_fallback = False
-    planner_actions_repaired_locally = False
-    if planner_actions_valid:
-        extraction = helpers["_actions_to_extraction"](actions)
-        if not helpers["_has_actionable_entities"](extraction):
-            used_extract_fallback = True
-            db.add(
-                helpers["EventLog"](
-                    id=str(uuid.uuid4()),
-                    request_id=request_id,
-                    user_id=user_id,
-                    event_type="action_extract_fallback_used",
-                    payload_json={"chat_id": chat_id, "reason": "planner_actions_unusable"},
-                    created_at=helpers["utc_now"](),
-                )
-            )
-            await db.commit()
-            extraction = await helpers["adapter"].extract_structured_updates(text, grounding=grounding)
-        else:
-            repaired_extraction = helpers["_sanitize_completion_extraction"](extraction, grounding)
-            repaired_extraction = helpers["_sanitize_targeted_task_actions"](text, repaired_extraction, grounding)
-            repaired_extraction = helpers["_sanitize_targeted_reminder_actions"](text, repaired_extraction, grounding)
-            repaired_extraction = helpers["_apply_displayed_task_reference_extraction"](repaired_extraction, grounding)
-            repaired_extraction = helpers["_resolve_relative_due_date_overrides"](text, repaired_extraction)
-            if repaired_extraction != extraction and helpers["_has_actionable_entities"](repaired_extraction):
-                planner_actions_repaired_locally = True
-                extraction = repaired_extraction
+    try:
+        planner_actions_valid = (
+            isinstance(planned, dict)
+            and planned.get("intent") == "action"
+            and isinstance(actions, list)
+            and len(actions) > 0
+        )
+        used_extract_fallback = False
+        planner_actions_repaired_locally = False
+        if planner_actions_valid:
+            extraction = helpers["_actions_to_extraction"](actions)
+            if not helpers["_has_actionable_entities"](extraction):
+                used_extract_fallback = True
                 db.add(
                     helpers["EventLog"](
-                        id=str(uuid.uuid4()),
+                        id=new_uuid(),
                         request_id=request_id,
                         user_id=user_id,
                         event_type="action_extract_fallback_used",
-                        payload_json={"chat_id": chat_id, "reason": "planner_actions_repaired_locally"},
+                        payload_json={"chat_id": chat_id, "reason": "planner_actions_unusable"},
                         created_at=helpers["utc_now"](),
                     )
                 )
-                await db.commit()
-            requested_change_count = helpers["_estimated_requested_change_count"](text)
-            extraction_mutation_count = helpers["_extraction_mutation_count"](extraction)
-            if requested_change_count >= 2 and extraction_mutation_count < requested_change_count:
-                recovery_extraction = await helpers["adapter"].extract_structured_updates(text, grounding=grounding)
-                recovery_count = helpers["_extraction_mutation_count"](recovery_extraction)
-                if recovery_count > extraction_mutation_count:
-                    used_extract_fallback = True
+                extraction = await helpers["_extract_structured_updates"](user_id, text, grounding)
+            else:
+                repaired_extraction = helpers["_sanitize_extraction"](text, extraction, grounding, sanitize_create=False)
+                if repaired_extraction != extraction and helpers["_has_actionable_entities"](repaired_extraction):
+                    planner_actions_repaired_locally = True
+                    extraction = repaired_extraction
                     db.add(
                         helpers["EventLog"](
-                            id=str(uuid.uuid4()),
+                            id=new_uuid(),
                             request_id=request_id,
                             user_id=user_id,
                             event_type="action_extract_fallback_used",
-                            payload_json={
-                                "chat_id": chat_id,
-                                "reason": "planner_actions_incomplete_multi_action",
-                            },
+                            payload_json={"chat_id": chat_id, "reason": "planner_actions_repaired_locally"},
                             created_at=helpers["utc_now"](),
                         )
                     )
-                    await db.commit()
-                    extraction = recovery_extraction
-    else:
-        used_extract_fallback = True
-        db.add(
-            helpers["EventLog"](
-                id=str(uuid.uuid4()),
-                request_id=request_id,
-                user_id=user_id,
-                event_type="action_extract_fallback_used",
-                payload_json={"chat_id": chat_id, "reason": "planner_invalid_or_empty"},
-                created_at=helpers["utc_now"](),
-            )
-        )
-        await db.commit()
-        extraction = await helpers["adapter"].extract_structured_updates(text, grounding=grounding)
-
-    if used_extract_fallback or planner_actions_repaired_locally:
-        critic = {
-            "approved": True,
-            "issues": [],
-            "skipped": True,
-            "reason": "extract_fallback" if used_extract_fallback else "planner_repaired_locally",
-        }
-    else:
-        critic = await helpers["adapter"].critique_actions(
-            text,
-            context={"grounding": grounding, "chat_id": chat_id},
-            proposal={"intent": intent, "actions": actions},
-        )
-    db.add(
-        helpers["EventLog"](
-            id=str(uuid.uuid4()),
-            request_id=request_id,
-            user_id=user_id,
-            event_type="telegram_action_critic_result",
-            payload_json={
-                "chat_id": chat_id,
-                "approved": critic.get("approved"),
-                "issues": critic.get("issues"),
-                "skipped": critic.get("skipped"),
-                "reason": critic.get("reason"),
-            },
-            created_at=helpers["utc_now"](),
-        )
-    )
-    await db.commit()
-
-    revised_actions = critic.get("revised_actions") if isinstance(critic, dict) else None
-    if isinstance(revised_actions, list):
-        revised_extraction = helpers["_actions_to_extraction"](revised_actions)
-        if helpers["_has_actionable_entities"](revised_extraction):
-            extraction = revised_extraction
+                requested_change_count = helpers["_estimated_requested_change_count"](text)
+                extraction_mutation_count = helpers["_extraction_mutation_count"](extraction)
+                if requested_change_count >= 2 and extraction_mutation_count < requested_change_count:
+                    recovery_extraction = await helpers["_extract_structured_updates"](user_id, text, grounding)
+                    recovery_count = helpers["_extraction_mutation_count"](recovery_extraction)
+                    if recovery_count > extraction_mutation_count:
+                        used_extract_fallback = True
+                        db.add(
+                            helpers["EventLog"](
+                                id=new_uuid(),
+                                request_id=request_id,
+                                user_id=user_id,
+                                event_type="action_extract_fallback_used",
+                                payload_json={
+                                    "chat_id": chat_id,
+                                    "reason": "planner_actions_incomplete_multi_action",
+                                },
+                                created_at=helpers["utc_now"](),
+                            )
+                        )
+                        extraction = recovery_extraction
         else:
+            used_extract_fallback = True
             db.add(
                 helpers["EventLog"](
-                    id=str(uuid.uuid4()),
+                    id=new_uuid(),
                     request_id=request_id,
                     user_id=user_id,
                     event_type="action_extract_fallback_used",
-                    payload_json={"chat_id": chat_id, "reason": "critic_revised_actions_unusable"},
+                    payload_json={"chat_id": chat_id, "reason": "planner_invalid_or_empty"},
                     created_at=helpers["utc_now"](),
                 )
             )
-            await db.commit()
+            extraction = await helpers["_extract_structured_updates"](user_id, text, grounding)
+
+        if used_extract_fallback or planner_actions_repaired_locally:
+            critic = {
+                "approved": True,
+                "issues": [],
+                "skipped": True,
+                "reason": "extract_fallback" if used_extract_fallback else "planner_repaired_locally",
+            }
+        else:
+            critic = await helpers["adapter"].critique_actions(
+                text,
+                context={"grounding": grounding, "chat_id": chat_id},
+                proposal={"intent": intent, "actions": actions},
+            )
+        db.add(
+            helpers["EventLog"](
+                id=new_uuid(),
+                request_id=request_id,
+                user_id=user_id,
+                event_type="telegram_action_critic_result",
+                payload_json={
+                    "chat_id": chat_id,
+                    "approved": critic.get("approved"),
+                    "issues": critic.get("issues"),
+                    "skipped": critic.get("skipped"),
+                    "reason": critic.get("reason"),
+                },
+                created_at=helpers["utc_now"](),
+            )
+        )
+
+        revised_actions = critic.get("revised_actions") if isinstance(critic, dict) else None
+        if isinstance(revised_actions, list):
+            revised_extraction = helpers["_actions_to_extraction"](revised_actions)
+            if helpers["_has_actionable_entities"](revised_extraction):
+                extraction = revised_extraction
+            else:
+                db.add(
+                    helpers["EventLog"](
+                        id=new_uuid(),
+                        request_id=request_id,
+                        user_id=user_id,
+                        event_type="action_extract_fallback_used",
+                        payload_json={"chat_id": chat_id, "reason": "critic_revised_actions_unusable"},
+                        created_at=helpers["utc_now"](),
+                    )
+                )
+    finally:
+        # Planner, fallback and critic telemetry share one commit instead of one per event.
+        # It runs even when an LLM call raises, so the events leading up to it are kept.
+        await db.commit()
     if isinstance(critic, dict) and critic.get("approved") is False:
         issues = critic.get("issues") if isinstance(critic.get("issues"), list) else []
         issue_text = "\n".join([f"• {helpers['escape_html'](str(i))}" for i in issues[:3]]) if issues else "• Proposal needs clarification."
@@ -658,12 +651,7 @@ async def run_handle_telegram_draft_flow(
         and extraction_mutation_count < estimated_requested_change_count
     ):
         extraction = helpers["_apply_intent_fallbacks"](text, extraction, grounding)
-    extraction = helpers["_sanitize_completion_extraction"](extraction, grounding)
-    extraction = helpers["_sanitize_create_extraction"](extraction)
-    extraction = helpers["_sanitize_targeted_task_actions"](text, extraction, grounding)
-    extraction = helpers["_sanitize_targeted_reminder_actions"](text, extraction, grounding)
-    extraction = helpers["_apply_displayed_task_reference_extraction"](extraction, grounding)
-    extraction = helpers["_resolve_relative_due_date_overrides"](text, extraction)
+    extraction = helpers["_sanitize_extraction"](text, extraction, grounding)
     extraction_mutation_count = helpers["_extraction_mutation_count"](extraction)
     completion_request = helpers["_is_safe_completion_extraction"](extraction)
     unresolved_mutations = helpers["_unresolved_mutation_titles"](extraction)
@@ -744,7 +732,7 @@ async def run_handle_telegram_draft_flow(
         if used_extract_fallback:
             db.add(
                 helpers["EventLog"](
-                    id=str(uuid.uuid4()),
+                    id=new_uuid(),
                     request_id=request_id,
                     user_id=user_id,
                     event_type="action_extract_fallback_used",
@@ -783,7 +771,7 @@ async def run_handle_telegram_draft_flow(
     auto_apply, auto_reason = helpers["_autopilot_decision"](text, extraction, planned)
     db.add(
         helpers["EventLog"](
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             request_id=request_id,
             user_id=user_id,
             event_type="telegram_autopilot_decision",
@@ -796,7 +784,7 @@ async def run_handle_telegram_draft_flow(
             created_at=helpers["utc_now"](),
         )
     )
-    await db.commit()
+    # Both branches below commit, which persists the decision event with their writes.
     if auto_apply:
         _, applied = await helpers["_apply_capture"](
             db=db,
@@ -1,12 +1,12 @@
 import hashlib
 import secrets
-import uuid
 from datetime import timedelta, timezone
 from typing import Any, Dict, Optional
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from sqlalchemy import select
 
+from common.ids import short_id
 from common.models import (
     ActionBatch,
     ConversationDirection,
@@ -22,6 +22,12 @@ from common.models import (
     WorkItemVersion,
 )
 
+_BATCH_CALLBACK_ACTIONS = frozenset({"show", "subtasks"})
+
+
+def _telegram_user_cache_key(chat_id: str) -> str:
+    return f"tg_user:{chat_id}"
+
 
 async def run_handle_telegram_command(
     command: str,
@@ -119,14 +125,15 @@ async def run_handle_telegram_command(
             task.title_norm = canonical_title.lower().strip()
 
         before_snapshot = helpers["work_item_snapshot"](task)
+        now = helpers["utc_now"]()
         task.status = WorkItemStatus.done
-        task.completed_at = helpers["utc_now"]()
-        task.updated_at = helpers["utc_now"]()
+        task.completed_at = now
+        task.updated_at = now
         after_snapshot = helpers["work_item_snapshot"](task)
         work_item_id = task.id
 
         conversation_event = ConversationEvent(
-            id=f"cev_{uuid.uuid4().hex[:12]}",
+            id=short_id("cev"),
             user_id=user_id,
             chat_id=chat_id,
             source=ConversationSource.telegram,
@@ -134,7 +141,7 @@ async def run_handle_telegram_command(
             content_text=f"/done {task_ref}",
             normalized_text=f"/done {task_ref}",
             metadata_json={"command": "/done", "task_ref": task_ref},
-            created_at=helpers["utc_now"](),
+            created_at=now,
         )
         db.add(conversation_event)
         if work_item_id:
@@ -212,17 +219,18 @@ def run_build_workbench_url(user_id: str, *, helpers: Dict[str, Any]) -> Optiona
 
 async def run_issue_telegram_link_token(user_id: str, db, *, helpers: Dict[str, Any]):
     raw_token = secrets.token_urlsafe(24)
+    now = helpers["utc_now"]()
     if helpers["settings"].TELEGRAM_LINK_TOKEN_TTL_SECONDS <= 0:
-        expires_at = helpers["utc_now"]() + timedelta(days=36500)
+        expires_at = now + timedelta(days=36500)
     else:
-        expires_at = helpers["utc_now"]() + timedelta(seconds=helpers["settings"].TELEGRAM_LINK_TOKEN_TTL_SECONDS)
+        expires_at = now + timedelta(seconds=helpers["settings"].TELEGRAM_LINK_TOKEN_TTL_SECONDS)
     record = TelegramLinkToken(
-        id=f"tlt_{uuid.uuid4().hex[:12]}",
+        id=short_id("tlt"),
         token_hash=helpers["_hash_link_token"](raw_token),
         user_id=user_id,
         expires_at=expires_at,
         consumed_at=None,
-        created_at=helpers["utc_now"](),
+        created_at=now,
     )
     db.add(record)
     await db.commit()
@@ -234,12 +242,32 @@ async def run_issue_telegram_link_token(user_id: str, db, *, helpers: Dict[str,
 
 
 async def run_resolve_telegram_user(chat_id: str, db, *, helpers: Dict[str, Any]) -> Optional[str]:
+    # Linked chats resolve on every inbound update; remember the mapping briefly so a
+    # conversation costs one lookup (and one last_seen_at write) per TTL, not per message.
+    # The entry lives in Redis so a relink handled by any API process is seen by all of them.
+    # Unlinked chats are never cached so /start takes effect immediately.
+    ttl_seconds = helpers["settings"].TELEGRAM_USER_CACHE_SECONDS
+    redis_client = helpers["redis_client"]
+    cache_key = _telegram_user_cache_key(chat_id)
+    if ttl_seconds > 0:
+        try:
+            cached_user_id = await redis_client.get(cache_key)
+            if cached_user_id:
+                return cached_user_id
+        except Exception as exc:
+            helpers["logger"].warning("Telegram user cache lookup failed for chat %s: %s", chat_id, exc)
     stmt = select(TelegramUserMap).where(TelegramUserMap.chat_id == chat_id)
     mapping = (await db.execute(stmt)).scalar_one_or_none()
     if not mapping:
         return None
     mapping.last_seen_at = helpers["utc_now"]()
     await db.commit()
+    if ttl_seconds > 0:
+        try:
+            # NX so a relink that committed after our read keeps the user it stored.
+            await redis_client.set(cache_key, mapping.user_id, ex=ttl_seconds, nx=True)
+        except Exception as exc:
+            helpers["logger"].warning("Failed to cache Telegram user for chat %s: %s", chat_id, exc)
     return mapping.user_id
 
 
@@ -261,12 +289,12 @@ async def run_consume_telegram_link_token(
     expires_at = token_row.expires_at
     if expires_at.tzinfo is None:
         expires_at = expires_at.replace(tzinfo=timezone.utc)
-    if helpers["settings"].TELEGRAM_LINK_TOKEN_TTL_SECONDS > 0 and expires_at < helpers["utc_now"]():
+    now = helpers["utc_now"]()
+    if helpers["settings"].TELEGRAM_LINK_TOKEN_TTL_SECONDS > 0 and expires_at < now:
         return False
 
     mapping_stmt = select(TelegramUserMap).where(TelegramUserMap.chat_id == chat_id)
     mapping = (await db.execute(mapping_stmt)).scalar_one_or_none()
-    now = helpers["utc_now"]()
     if mapping:
         mapping.user_id = token_row.user_id
         mapping.telegram_username = username
@@ -275,7 +303,7 @@ async def run_consume_telegram_link_token(
     else:
         db.add(
             TelegramUserMap(
-                id=f"tgm_{uuid.uuid4().hex[:12]}",
+                id=short_id("tgm"),
                 chat_id=chat_id,
                 user_id=token_row.user_id,
                 telegram_username=username,
@@ -285,6 +313,15 @@ async def run_consume_telegram_link_token(
         )
     token_row.consumed_at = now
     await db.commit()
+    try:
+        # Overwrite rather than delete, so a resolve racing this relink cannot re-cache the old user.
+        ttl_seconds = helpers["settings"].TELEGRAM_USER_CACHE_SECONDS
+        if ttl_seconds > 0:
+            await helpers["redis_client"].set(_telegram_user_cache_key(chat_id), token_row.user_id, ex=ttl_seconds)
+        else:
+            await helpers["redis_client"].delete(_telegram_user_cache_key(chat_id))
+    except Exception as exc:
+        helpers["logger"].error("Failed to update Telegram user cache after relinking chat %s: %s", chat_id, exc)
     return True
 
 
@@ -292,7 +329,7 @@ async def run_handle_telegram_callback_update(data: Dict[str, Any], db, *, helpe
     chat_id = data["chat_id"]
     callback_query_id = data.get("callback_query_id")
     callback_data = data.get("callback_data", "")
-    request_id = f"tg_{uuid.uuid4().hex[:8]}"
+    request_id = short_id("tg", nbytes=4)
 
     user_id = await helpers["_resolve_telegram_user"](chat_id, db)
     if not user_id:
@@ -314,8 +351,10 @@ async def run_handle_telegram_callback_update(data: Dict[str, Any], db, *, helpe
         )
         return
 
-    open_draft = await helpers["_get_open_action_draft"](user_id=user_id, chat_id=chat_id, db=db)
     action, draft_id = helpers["_parse_draft_callback"](callback_data)
+    open_draft = None
+    if action and draft_id:
+        open_draft = await helpers["_get_open_action_draft"](user_id=user_id, chat_id=chat_id, db=db)
     if not open_draft or not action or draft_id != open_draft.id:
         await helpers["send_message"](chat_id, "This proposal is no longer active. Send a new message to continue.")
         return
@@ -334,8 +373,7 @@ async def run_handle_telegram_callback_update(data: Dict[str, Any], db, *, helpe
         await helpers["send_message"](chat_id, "Discarded the pending proposal.")
     elif action == "edit":
         helpers["_draft_set_awaiting_edit_input"](open_draft, True)
-        open_draft.updated_at = helpers["_draft_now"]()
-        open_draft.expires_at = helpers["_draft_now"]() + timedelta(seconds=helpers["ACTION_DRAFT_TTL_SECONDS"])
+        helpers["_draft_extend_expiry"](open_draft)
         await db.commit()
         await helpers["_update_session_state"](
             db=db,
@@ -352,16 +390,16 @@ async def run_handle_telegram_callback_update(data: Dict[str, Any], db, *, helpe
 
 
 def run_parse_action_batch_callback(callback_data: str) -> tuple[Optional[str], Optional[str]]:
-    parts = (callback_data or "").split(":", 2)
-    if len(parts) != 3 or parts[0] != "batch":
+    prefix, _, rest = (callback_data or "").partition(":")
+    if prefix != "batch":
         return None, None
-    action = parts[1]
-    batch_id = parts[2]
-    if action not in {"show", "subtasks"}:
+    action, sep, batch_id = rest.partition(":")
+    if not sep or action not in _BATCH_CALLBACK_ACTIONS:
         return None, None
-    if not batch_id.strip():
+    batch_id = batch_id.strip()
+    if not batch_id:
         return None, None
-    return action, batch_id.strip()
+    return action, batch_id
 
 
 async def run_show_action_batch_details(
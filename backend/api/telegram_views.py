@@ -2,10 +2,10 @@ import copy
 import json
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy import select
 
+from common.config import resolve_timezone
 from common.models import Reminder, ReminderStatus, WorkItem, WorkItemKind, WorkItemStatus
 
 
@@ -306,12 +306,7 @@ def _telegram_view_local_date(value: Any, *, helpers: Dict[str, Any]) -> Optiona
         return None
     if value.tzinfo is None:
         value = value.replace(tzinfo=timezone.utc)
-    tz_name = (helpers["settings"].APP_TIMEZONE or "").strip() or "UTC"
-    try:
-        tz = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        tz = timezone.utc
-    return value.astimezone(tz)
+    return value.astimezone(resolve_timezone(helpers["settings"].APP_TIMEZONE))
 
 
 def _telegram_view_next_week_range(*, helpers: Dict[str, Any]) -> tuple[datetime, datetime, str]:
@@ -1,4 +1,7 @@
-from typing import List, Optional
+from datetime import timezone, tzinfo
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -12,7 +15,13 @@ class Settings(BaseSettings):
     APP_AUTH_TOKEN_USER_MAP: Optional[str] = None  # token:user_id pairs, comma-separated
     SESSION_INACTIVITY_MINUTES: int = 120
     IDEMPOTENCY_TTL_HOURS: int = 24
+    EXTRACTION_CACHE_TTL_SECONDS: int = 60  # 0 disables replay caching of LLM extractions
     RECENT_CONTEXT_TTL_HOURS: int = 48
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_USE_NULL_POOL: bool = False  # enable behind PgBouncer transaction pooling
 
     # Provider
     LLM_PROVIDER: str = "grok"
@@ -54,6 +63,7 @@ class Settings(BaseSettings):
     TELEGRAM_COMMAND_TIMEOUT_SECONDS: int = 20
     TELEGRAM_DEFAULT_SOURCE: str = "telegram"
     TELEGRAM_LINK_TOKEN_TTL_SECONDS: int = 900
+    TELEGRAM_USER_CACHE_SECONDS: int = 60  # 0 disables the shared chat -> user cache in Redis
     TELEGRAM_BOT_USERNAME: Optional[str] = None
     TELEGRAM_DEEP_LINK_BASE_URL: Optional[str] = None
     TELEGRAM_ALLOWED_CHAT_IDS: Optional[str] = None  # comma-separated
@@ -99,20 +109,38 @@ class Settings(BaseSettings):
         return mapping
 
     @property
-    def telegram_allowed_chat_ids(self) -> List[str]:
-        if not self.TELEGRAM_ALLOWED_CHAT_IDS:
-            return []
-        return [v.strip() for v in self.TELEGRAM_ALLOWED_CHAT_IDS.split(",") if v.strip()]
+    def telegram_allowed_chat_ids(self) -> FrozenSet[str]:
+        return _parse_allowlist(self.TELEGRAM_ALLOWED_CHAT_IDS)
 
     @property
-    def telegram_allowed_usernames(self) -> List[str]:
-        if not self.TELEGRAM_ALLOWED_USERNAMES:
-            return []
-        values = []
-        for raw in self.TELEGRAM_ALLOWED_USERNAMES.split(","):
-            value = raw.strip().lstrip("@").lower()
-            if value:
-                values.append(value)
-        return values
+    def telegram_allowed_usernames(self) -> FrozenSet[str]:
+        return _parse_allowlist(self.TELEGRAM_ALLOWED_USERNAMES, usernames=True)
+
+
+@lru_cache(maxsize=8)
+def _parse_allowlist(raw: Optional[str], *, usernames: bool = False) -> FrozenSet[str]:
+    # Keyed on the raw setting so webhook checks skip re-splitting, while a
+    # changed setting still produces a fresh set.
+    if not raw:
+        return frozenset()
+    values = set()
+    for item in raw.split(","):
+        value = item.strip()
+        if usernames:
+            value = value.lstrip("@").lower()
+        if value:
+            values.add(value)
+    return frozenset(values)
+
+
+@lru_cache(maxsize=32)
+def resolve_timezone(tz_name: Optional[str]) -> tzinfo:
+    """Resolve an IANA zone name once; blank or unknown names fall back to UTC."""
+    name = (tz_name or "").strip() or "UTC"
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        return timezone.utc
+
 
 settings = Settings()
@@ -0,0 +1,40 @@
+from typing import Any, Dict
+
+import orjson
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from common.config import settings
+
+
+def _json_serializer(value: Any) -> str:
+    # JSON columns (draft proposals, event payloads, idempotent responses) go through orjson.
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def engine_options(database_url: str, *, echo: bool = False) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "echo": echo,
+        "json_serializer": _json_serializer,
+        "json_deserializer": orjson.loads,
+    }
+    if make_url(database_url).get_backend_name() == "sqlite":
+        # SQLite picks its own pool (StaticPool for :memory:) and rejects sizing args.
+        return options
+    if settings.DB_USE_NULL_POOL:
+        options["poolclass"] = NullPool
+        return options
+    options.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+    )
+    return options
+
+
+def create_app_engine(*, echo: bool = False) -> AsyncEngine:
+    return create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, echo=echo))
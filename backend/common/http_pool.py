@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from typing import Callable, Optional, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+# Strong references so pending closes of replaced clients are not garbage collected.
+_retiring: Set[asyncio.Task] = set()
+
+
+class LoopBoundClient:
+    """One pooled httpx client per process, rebuilt when the running event loop changes.
+
+    Connections belong to the loop that opened them, so a client cannot follow the
+    process into a new loop; the one it replaces is closed instead of leaking its pool.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self, factory: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is not None and not client.is_closed:
+            if self._loop is loop:
+                return client
+            _retire(client, self._loop, loop)
+        self._client = factory()
+        self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client = self._client
+        self._client = None
+        self._loop = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+
+def _retire(
+    client: httpx.AsyncClient,
+    owner: Optional[asyncio.AbstractEventLoop],
+    current: asyncio.AbstractEventLoop,
+) -> None:
+    if owner is not None and owner.is_running() and not owner.is_closed():
+        # Still serving another thread: close there, on the loop that owns the sockets.
+        asyncio.run_coroutine_threadsafe(_close_quietly(client), owner)
+        return
+    task = current.create_task(_close_quietly(client))
+    _retiring.add(task)
+    task.add_done_callback(_retiring.discard)
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as exc:
+        # The owning loop may already be gone; the sockets are released when collected.
+        logger.debug("Closing replaced HTTP client failed: %s", exc)
@@ -0,0 +1,21 @@
+import os
+import uuid
+from collections import deque
+
+_UUID_BATCH_SIZE = 64
+_uuid_pool: deque = deque()
+# A forked child must not hand out the ids its parent already buffered.
+os.register_at_fork(after_in_child=_uuid_pool.clear)
+
+
+def short_id(prefix: str, *, nbytes: int = 6) -> str:
+    # Same shape as f"{prefix}_{uuid.uuid4().hex[:12]}" without building a UUID just to slice it.
+    return f"{prefix}_{os.urandom(nbytes).hex()}"
+
+
+def new_uuid() -> str:
+    """Return str(uuid.uuid4()), drawing randomness for a batch of ids in one urandom call."""
+    if not _uuid_pool:
+        buf = os.urandom(16 * _UUID_BATCH_SIZE)
+        _uuid_pool.extend(str(uuid.UUID(bytes=buf[i : i + 16], version=4)) for i in range(0, len(buf), 16))
+    return _uuid_pool.popleft()
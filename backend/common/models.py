@@ -236,6 +236,15 @@ class EventLog(Base):
     __table_args__ = (
         Index("idx_event_log_request", "request_id"),
         Index("idx_event_log_user_created", "user_id", created_at.desc()),
+        # Partial index backing the worker failure/last-success reads in /health/metrics.
+        Index(
+            "idx_event_log_worker_type_created",
+            "event_type",
+            created_at.desc(),
+            postgresql_where=event_type.in_(
+                ["worker_retry_scheduled", "worker_moved_to_dlq", "worker_topic_completed"]
+            ),
+        ),
     )
 
 class IdempotencyKey(Base):
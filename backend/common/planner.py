@@ -1,12 +1,11 @@
 import re
 from datetime import date, datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.config import settings
+from common.config import resolve_timezone, settings
 from common.models import Reminder, ReminderStatus, WorkItem, WorkItemKind, WorkItemLink, WorkItemLinkType, WorkItemStatus
 
 _TASK_TITLE_WRAPPER_PATTERNS = (
@@ -43,11 +42,7 @@ def _as_utc_datetime(value: Any, fallback: Optional[datetime] = None) -> datetim
 
 
 def _planner_timezone():
-    tz_name = (settings.APP_TIMEZONE or "").strip() or "UTC"
-    try:
-        return ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        return timezone.utc
+    return resolve_timezone(settings.APP_TIMEZONE)
 
 
 def _local_date_in_planner(value: datetime) -> date:
@@ -1,9 +1,10 @@
-import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Iterable
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.ids import short_id
 from common.models import EntityType, RecentContextItem
 
 
@@ -29,19 +30,23 @@ async def remember_recent_entities(
         if isinstance(entity_id, str) and entity_id and entity_id not in seen:
             seen.add(entity_id)
             unique_ids.append(entity_id)
-    for entity_id in unique_ids[:12]:
-        db.add(
-            RecentContextItem(
-                id=f"rcx_{uuid.uuid4().hex[:12]}",
-                user_id=user_id,
-                chat_id=chat_id,
-                entity_type=entity_type,
-                entity_id=entity_id,
-                reason=reason,
-                surfaced_at=now,
-                expires_at=expires_at,
-            )
-        )
+    rows = [
+        {
+            "id": short_id("rcx"),
+            "user_id": user_id,
+            "chat_id": chat_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "reason": reason,
+            "surfaced_at": now,
+            "expires_at": expires_at,
+        }
+        for entity_id in unique_ids[:12]
+    ]
+    # One executemany; SQLAlchemy folds it into a single multi-row INSERT. Rows are
+    # append-only history (display ordinals live in `reason`), so there is no upsert key.
+    if rows:
+        await db.execute(insert(RecentContextItem), rows)
 
 
 async def remember_recent_tasks(
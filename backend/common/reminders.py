@@ -3,7 +3,8 @@ from __future__ import annotations
 from calendar import monthrange
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from common.config import resolve_timezone
 
 
 _RECURRENCE_ALIASES = {
@@ -56,14 +57,6 @@ def supported_snooze_presets() -> list[str]:
     return ["1h", "tomorrow_morning", "next_week"]
 
 
-def _reminder_timezone(timezone_name: Optional[str]):
-    raw = str(timezone_name or "").strip() or "UTC"
-    try:
-        return ZoneInfo(raw)
-    except ZoneInfoNotFoundError:
-        return timezone.utc
-
-
 def next_recurrence_time(remind_at: datetime, rule: str) -> Optional[datetime]:
     normalized = normalize_recurrence_rule(rule)
     if normalized is None or not isinstance(remind_at, datetime):
@@ -106,7 +99,7 @@ def compute_snooze_remind_at(
     else:
         current_now = current_now.astimezone(timezone.utc)
 
-    tz = _reminder_timezone(timezone_name)
+    tz = resolve_timezone(timezone_name)
     local_now = current_now.astimezone(tz)
 
     if normalized == "1h":
@@ -1,11 +1,11 @@
 import copy
 import inspect
-import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy import select
 
+from common.ids import short_id
 from common.models import Session
 
 _UNSET = object()
@@ -166,7 +166,7 @@ async def get_or_create_active_session(
             session.ended_at = now
             session.last_activity_at = now
     new_session = Session(
-        id=f"ses_{uuid.uuid4().hex[:12]}",
+        id=short_id("ses"),
         user_id=user_id,
         chat_id=chat_id,
         started_at=now,
@@ -4,8 +4,8 @@ import httpx
 from datetime import date, datetime, timezone
 from html import escape as _html_escape
 from typing import Optional, Tuple, Dict, Any, List
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
-from common.config import settings
+from common.config import resolve_timezone, settings
+from common.http_pool import LoopBoundClient
 
 
 def escape_html(text: str) -> str:
@@ -33,6 +33,8 @@ QUERY_PREFIXES = (
     "is there",
     "are there",
 )
+_QUERY_PREFIX_PATTERN = re.compile(r"^(?:" + "|".join(re.escape(prefix) for prefix in QUERY_PREFIXES) + r")(?: |$)")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
 
 _INTERNAL_ID_PATTERNS = (
     re.compile(r"\[(?:tsk|gol|prb|lnk)_[A-Za-z0-9]+\]"),
@@ -48,6 +50,8 @@ _TASK_TITLE_WRAPPER_PATTERNS = (
 )
 PLAN_STALE_WARNING_SECONDS = 300
 PROJECT_MARKER = "▣"
+TELEGRAM_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+_http_client = LoopBoundClient()
 
 
 def strip_internal_ids(text: str) -> str:
@@ -93,6 +97,20 @@ def user_facing_task_title(title: Any) -> str:
             return inner
     return text
 
+def _telegram_http_client() -> httpx.AsyncClient:
+    """Return the pooled Bot API client, creating it for the running event loop."""
+    return _http_client.get(
+        lambda: httpx.AsyncClient(
+            timeout=settings.TELEGRAM_COMMAND_TIMEOUT_SECONDS,
+            limits=TELEGRAM_HTTP_LIMITS,
+        )
+    )
+
+
+async def close_telegram_http_client() -> None:
+    await _http_client.aclose()
+
+
 def verify_telegram_secret(headers: Dict[str, str]) -> bool:
     if not settings.TELEGRAM_WEBHOOK_SECRET:
         return True
@@ -195,17 +213,17 @@ async def answer_callback_query(callback_query_id: str, text: Optional[str] = No
     if text:
         payload["text"] = text[:200]
     try:
-        async with httpx.AsyncClient(timeout=settings.TELEGRAM_COMMAND_TIMEOUT_SECONDS) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code < 400:
-                return resp.json()
-            logger.error(
-                "Failed to answer callback query (status=%s, body=%s)",
-                resp.status_code,
-                resp.text,
-            )
-            resp.raise_for_status()
-            return {"ok": False, "error": "telegram_callback_failed"}
+        client = _telegram_http_client()
+        resp = await client.post(url, json=payload)
+        if resp.status_code < 400:
+            return resp.json()
+        logger.error(
+            "Failed to answer callback query (status=%s, body=%s)",
+            resp.status_code,
+            resp.text,
+        )
+        resp.raise_for_status()
+        return {"ok": False, "error": "telegram_callback_failed"}
     except Exception as e:
         logger.error(f"Failed to answer callback query: {e}")
         return {"ok": False, "error": str(e)}
@@ -225,16 +243,16 @@ async def edit_message(chat_id: str, message_id: int, text: str, reply_markup: O
     if isinstance(reply_markup, dict):
         payload["reply_markup"] = reply_markup
     try:
-        async with httpx.AsyncClient(timeout=settings.TELEGRAM_COMMAND_TIMEOUT_SECONDS) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code < 400:
-                return resp.json()
-            logger.warning(
-                "Telegram edit failed (status=%s, body=%s).",
-                resp.status_code,
-                resp.text,
-            )
-            return {"ok": False, "error": f"status_{resp.status_code}"}
+        client = _telegram_http_client()
+        resp = await client.post(url, json=payload)
+        if resp.status_code < 400:
+            return resp.json()
+        logger.warning(
+            "Telegram edit failed (status=%s, body=%s).",
+            resp.status_code,
+            resp.text,
+        )
+        return {"ok": False, "error": f"status_{resp.status_code}"}
     except Exception as e:
         logger.error(f"Failed to edit Telegram message: {e}")
         return {"ok": False, "error": str(e)}
@@ -254,52 +272,52 @@ async def send_message(chat_id: str, text: str, reply_markup: Optional[Dict[str,
         chunks = [""]
 
     try:
-        async with httpx.AsyncClient(timeout=settings.TELEGRAM_COMMAND_TIMEOUT_SECONDS) as client:
-            # Send in chunks to avoid Telegram hard length cap.
-            last_json: Dict[str, Any] = {"ok": True}
-            total_chunks = len(chunks)
-            for idx, chunk in enumerate(chunks):
-                prefix = f"<i>Part {idx + 1}/{total_chunks}</i>\n\n" if total_chunks > 1 else ""
-                safe_text = prefix + chunk
-
-                payload: Dict[str, Any] = {
-                    "chat_id": chat_id,
-                    "text": safe_text,
-                    "parse_mode": "HTML",
-                }
-                # Keep inline controls on the final chunk only.
-                if isinstance(reply_markup, dict) and idx == total_chunks - 1:
-                    payload["reply_markup"] = reply_markup
-                resp = await client.post(url, json=payload)
-                if resp.status_code < 400:
-                    last_json = resp.json()
-                    continue
+        client = _telegram_http_client()
+        # Send in chunks to avoid Telegram hard length cap.
+        last_json: Dict[str, Any] = {"ok": True}
+        total_chunks = len(chunks)
+        for idx, chunk in enumerate(chunks):
+            prefix = f"<i>Part {idx + 1}/{total_chunks}</i>\n\n" if total_chunks > 1 else ""
+            safe_text = prefix + chunk
+
+            payload: Dict[str, Any] = {
+                "chat_id": chat_id,
+                "text": safe_text,
+                "parse_mode": "HTML",
+            }
+            # Keep inline controls on the final chunk only.
+            if isinstance(reply_markup, dict) and idx == total_chunks - 1:
+                payload["reply_markup"] = reply_markup
+            resp = await client.post(url, json=payload)
+            if resp.status_code < 400:
+                last_json = resp.json()
+                continue
 
-                # Common 400 case is parse issues; retry once with plain text.
-                logger.warning(
-                    "Telegram send failed with HTML mode (status=%s, body=%s). Retrying without parse_mode.",
-                    resp.status_code,
-                    resp.text,
-                )
-                payload = {
-                    "chat_id": chat_id,
-                    "text": re.sub(r"</?i>", "", prefix) + chunk,
-                }
-                if isinstance(reply_markup, dict) and idx == total_chunks - 1:
-                    payload["reply_markup"] = reply_markup
-                resp = await client.post(url, json=payload)
-                if resp.status_code < 400:
-                    last_json = resp.json()
-                    continue
+            # Common 400 case is parse issues; retry once with plain text.
+            logger.warning(
+                "Telegram send failed with HTML mode (status=%s, body=%s). Retrying without parse_mode.",
+                resp.status_code,
+                resp.text,
+            )
+            payload = {
+                "chat_id": chat_id,
+                "text": re.sub(r"</?i>", "", prefix) + chunk,
+            }
+            if isinstance(reply_markup, dict) and idx == total_chunks - 1:
+                payload["reply_markup"] = reply_markup
+            resp = await client.post(url, json=payload)
+            if resp.status_code < 400:
+                last_json = resp.json()
+                continue
 
-                logger.error(
-                    "Failed to send Telegram message (status=%s, body=%s)",
-                    resp.status_code,
-                    resp.text,
-                )
-                resp.raise_for_status()
-                return {"ok": False, "error": "telegram_send_failed"}
-            return last_json
+            logger.error(
+                "Failed to send Telegram message (status=%s, body=%s)",
+                resp.status_code,
+                resp.text,
+            )
+            resp.raise_for_status()
+            return {"ok": False, "error": "telegram_send_failed"}
+        return last_json
     except Exception as e:
         logger.error(f"Failed to send Telegram message: {e}")
         return {"ok": False, "error": str(e)}
@@ -313,7 +331,7 @@ def extract_command(text: str) -> Tuple[Optional[str], Optional[str]]:
         return None, None
     
     parts = text.split(maxsplit=1)
-    command = parts[0].lower().split("@")[0]  # strip @botname suffix
+    command = parts[0].lower().partition("@")[0]  # strip @botname suffix
     args = parts[1] if len(parts) > 1 else None
     return command, args
 
@@ -324,8 +342,8 @@ def is_query_like_text(text: str) -> bool:
         return False
     if "?" in normalized:
         return True
-    collapsed = re.sub(r"\s+", " ", normalized)
-    return any(collapsed.startswith(prefix + " ") or collapsed == prefix for prefix in QUERY_PREFIXES)
+    collapsed = _WHITESPACE_PATTERN.sub(" ", normalized)
+    return bool(_QUERY_PREFIX_PATTERN.match(collapsed))
 
 
 def _parse_iso_datetime(value: Any) -> Optional[datetime]:
@@ -348,12 +366,7 @@ def _utc_now() -> datetime:
 
 
 def _localize_datetime(value: datetime) -> datetime:
-    tz_name = (settings.APP_TIMEZONE or "").strip() or "UTC"
-    try:
-        tz = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError:
-        tz = timezone.utc
-    return value.astimezone(tz)
+    return value.astimezone(resolve_timezone(settings.APP_TIMEZONE))
 
 
 def _format_relative_seconds(seconds: int) -> str:
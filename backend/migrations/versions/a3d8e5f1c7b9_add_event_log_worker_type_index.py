@@ -0,0 +1,34 @@
+"""add event log worker type index
+
+Revision ID: a3d8e5f1c7b9
+Revises: c4f2d9e1a7b3
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d8e5f1c7b9"
+down_revision: Union[str, Sequence[str], None] = "c4f2d9e1a7b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_event_log_worker_type_created",
+        "event_log",
+        ["event_type", sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text(
+            "event_type IN ('worker_retry_scheduled', 'worker_moved_to_dlq', 'worker_topic_completed')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_event_log_worker_type_created", table_name="event_log")
@@ -9,8 +9,7 @@ from pathlib import Path
 import sys
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
@@ -47,7 +46,7 @@ def _section(title: str, lines: list[str]) -> str:
 
 async def _render_markdown(user_id: str | None) -> str:
     engine = create_async_engine(settings.DATABASE_URL)
-    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
     try:
         async with session_factory() as db:
             task_stmt = select(Task).order_by(Task.created_at.asc(), Task.id.asc())
@@ -10,8 +10,7 @@ import sys
 from typing import Any
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
@@ -125,7 +124,7 @@ def _section(title: str, lines: list[str]) -> str:
 
 async def _render_markdown(user_id: str | None, include_archived: bool) -> str:
     engine = create_async_engine(settings.DATABASE_URL)
-    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
     try:
         async with session_factory() as db:
             work_item_stmt = select(WorkItem).order_by(WorkItem.created_at.asc(), WorkItem.id.asc())
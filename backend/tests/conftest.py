@@ -3,7 +3,7 @@
 Design goal: avoid async fixture loop injection and keep test boundaries explicit.
 """
 import os
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
@@ -33,6 +33,20 @@ def mock_redis():
     return r
 
 
+@pytest.fixture
+def redis_pipeline():
+    """Build a pipeline mock usable as ``async with``; ``execute()`` returns ``results``."""
+
+    def _make(results):
+        pipe = MagicMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        pipe.execute = AsyncMock(return_value=results)
+        return pipe
+
+    return _make
+
+
 @pytest.fixture
 def mock_send():
     with patch("api.main.send_message", new_callable=AsyncMock) as m:
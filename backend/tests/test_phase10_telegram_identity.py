@@ -1,6 +1,6 @@
 import asyncio
 from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from httpx import ASGITransport, AsyncClient
 
@@ -10,6 +10,7 @@ from api.main import (
     _consume_telegram_link_token,
     _hash_link_token,
     _issue_telegram_link_token,
+    _resolve_telegram_user,
 )
 from common.config import settings
 from common.models import TelegramLinkToken, TelegramUserMap
@@ -23,6 +24,23 @@ class _FakeResult:
         return self._one_or_none
 
 
+class _KeyValueRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+
 def _db_override(fake_db):
     async def _ctx():
         yield fake_db
@@ -110,6 +128,44 @@ def test_consume_link_token_marks_token_used_and_maps_chat():
     asyncio.run(_run())
 
 
+def test_resolve_telegram_user_caches_linked_chat_until_relinked():
+    async def _run():
+        mapping = TelegramUserMap(id="tgm_1", chat_id="555", user_id="usr_a")
+        fake_db = AsyncMock()
+        fake_db.execute = AsyncMock(return_value=_FakeResult(one_or_none=mapping))
+        fake_db.commit = AsyncMock()
+
+        assert await _resolve_telegram_user("555", fake_db) == "usr_a"
+        assert await _resolve_telegram_user("555", fake_db) == "usr_a"
+        assert fake_db.execute.await_count == 1
+        assert shared_redis.values["tg_user:555"] == "usr_a"
+
+        raw_token = "relink"
+        token_row = TelegramLinkToken(
+            id="tlt_2",
+            token_hash=_hash_link_token(raw_token),
+            user_id="usr_b",
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=10),
+            consumed_at=None,
+            created_at=datetime.now(timezone.utc),
+        )
+        fake_db.execute = AsyncMock(
+            side_effect=[
+                _FakeResult(one_or_none=token_row),
+                _FakeResult(one_or_none=mapping),
+                _FakeResult(one_or_none=mapping),
+            ]
+        )
+        assert await _consume_telegram_link_token("555", "tester", raw_token, fake_db) is True
+        # Any process sees the relink: the shared entry now names the new user.
+        assert shared_redis.values["tg_user:555"] == "usr_b"
+        assert await _resolve_telegram_user("555", fake_db) == "usr_b"
+
+    shared_redis = _KeyValueRedis()
+    with patch("api.main.redis_client", shared_redis):
+        asyncio.run(_run())
+
+
 def test_consume_link_token_rejects_expired_or_consumed():
     async def _run():
         raw_token = "abc123"
@@ -8,7 +8,7 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from common.models import InboxItem
-from worker.main import handle_memory_compact, utc_now
+from worker.main import handle_memory_compact, sweep_lapsed_drafts, utc_now
 
 
 class _FakeResult:
@@ -50,6 +50,7 @@ def test_memory_compact_keeps_task_and_draft_references():
                 _FakeResult(items=["inb_task"]),         # task references
                 _FakeResult(items=["inb_draft"]),        # active draft references
                 _FakeDeleteResult(),                     # delete non-referenced
+                _FakeDeleteResult(),                     # expire lapsed drafts
             ]
         )
         fake_db.add = MagicMock()
@@ -58,17 +59,33 @@ def test_memory_compact_keeps_task_and_draft_references():
         with patch("worker.main.AsyncSessionLocal", _session_factory(fake_db)):
             await handle_memory_compact("job_compact", {"user_id": "usr_dev"})
 
-        assert fake_db.execute.await_count == 4
+        assert fake_db.execute.await_count == 5
         assert fake_db.commit.await_count == 1
         added_event = fake_db.add.call_args.args[0]
         assert added_event.event_type == "memory_compaction_completed"
         assert added_event.payload_json["eligible_old_rows"] == 3
         assert added_event.payload_json["skipped_referenced_rows"] == 2
         assert added_event.payload_json["deleted_rows"] == 1
+        assert added_event.payload_json["expired_drafts"] == 1
 
     asyncio.run(_run())
 
 
+def test_draft_sweep_expires_lapsed_drafts_for_all_users():
+    fake_db = AsyncMock()
+    fake_db.execute = AsyncMock(return_value=_FakeDeleteResult())
+    fake_db.commit = AsyncMock()
+
+    with patch("worker.main.AsyncSessionLocal", _session_factory(fake_db)):
+        asyncio.run(sweep_lapsed_drafts())
+
+    stmt = fake_db.execute.await_args.args[0]
+    compiled = str(stmt)
+    assert compiled.startswith("UPDATE action_drafts")
+    assert "action_drafts.user_id" not in compiled
+    fake_db.commit.assert_awaited_once()
+
+
 def test_backup_script_prunes_expired_files_when_within_limit(tmp_path):
     repo_root = Path(__file__).resolve().parents[2]
     script = repo_root / "ops" / "backup_db.sh"
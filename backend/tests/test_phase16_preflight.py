@@ -1,8 +1,17 @@
 import asyncio
+import json
 from unittest.mock import AsyncMock, patch
 
 from httpx import ASGITransport, AsyncClient
 
+from api.main import (
+    _compute_preflight_report,
+    _get_preflight_report,
+    _preflight_refresher,
+    close_preflight_http_client,
+)
+from common.http_pool import LoopBoundClient
+
 
 def _get(asgi_app, url):
     async def _call():
@@ -41,6 +50,32 @@ def test_health_ready_returns_ready_when_preflight_ok(app_no_db):
         assert response.json()["status"] == "ready"
 
 
+def test_health_ready_serves_stale_cached_report_without_probing(app_no_db):
+    report = {
+        "ok": True,
+        "checked_at": "2026-02-12T00:00:00+00:00",
+        "checks": {"llm": {"ok": True}, "telegram": {"ok": True}},
+    }
+    probe = AsyncMock()
+    with patch("api.main._external_preflight_required", return_value=True), patch(
+        "api.main._get_preflight_report", probe
+    ), patch.dict("api.main._preflight_cache", {"checked_at": None, "report": report}):
+        response = _get(app_no_db, "/health/ready")
+    assert response.status_code == 200
+    probe.assert_not_awaited()
+
+
+def test_preflight_refresher_keeps_running_after_failed_refresh():
+    probe = AsyncMock(side_effect=[RuntimeError("boom"), {"ok": True}])
+    sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+    with patch("api.main._get_preflight_report", probe), patch("api.health_runtime.asyncio.sleep", sleep):
+        try:
+            asyncio.run(_preflight_refresher())
+        except asyncio.CancelledError:
+            pass
+    assert probe.await_count == 2
+
+
 def test_health_preflight_skipped_in_dev_like_env(app_no_db):
     with patch("api.main._external_preflight_required", return_value=False):
         response = _get(app_no_db, "/health/preflight")
@@ -63,3 +98,76 @@ def test_health_preflight_returns_checks(app_no_db):
         body = response.json()
         assert body["status"] == "ok"
         assert body["checks"]["llm"]["ok"] is True
+
+
+def test_compute_preflight_report_reuses_pooled_client_across_probes():
+    llm_check = AsyncMock(return_value={"ok": True})
+    telegram_check = AsyncMock(return_value={"ok": False, "reason": "telegram_auth_failed"})
+
+    async def _run():
+        try:
+            first = await _compute_preflight_report()
+            first_client = llm_check.await_args.kwargs["client"]
+            await _compute_preflight_report()
+            return first, first_client
+        finally:
+            await close_preflight_http_client()
+
+    with patch("api.main._check_llm_credentials", llm_check), patch(
+        "api.main._check_telegram_credentials", telegram_check
+    ):
+        report, client = asyncio.run(_run())
+    assert report["ok"] is False
+    assert report["checks"]["telegram"]["reason"] == "telegram_auth_failed"
+    assert client is not None
+    assert telegram_check.await_args.kwargs["client"] is client
+    assert llm_check.await_args.kwargs["client"] is client
+    assert client.is_closed
+
+
+def test_get_preflight_report_reuses_report_shared_through_redis(mock_redis):
+    shared = {"ok": True, "checked_at": "2026-02-12T00:00:00+00:00", "checks": {"llm": {"ok": True}}}
+    mock_redis.get = AsyncMock(return_value=json.dumps(shared))
+    compute = AsyncMock()
+    with patch("api.main.redis_client", mock_redis), patch("api.main._compute_preflight_report", compute), patch.dict(
+        "api.main._preflight_cache", {"checked_at": None, "report": None}
+    ):
+        report = asyncio.run(_get_preflight_report())
+    assert report == shared
+    compute.assert_not_awaited()
+    mock_redis.setex.assert_not_called()
+
+
+def test_get_preflight_report_publishes_fresh_report_to_redis(mock_redis):
+    fresh = {"ok": True, "checked_at": "2026-02-12T00:00:00+00:00", "checks": {"llm": {"ok": True}}}
+    with patch("api.main.redis_client", mock_redis), patch(
+        "api.main._compute_preflight_report", AsyncMock(return_value=fresh)
+    ), patch.dict("api.main._preflight_cache", {"checked_at": None, "report": None}):
+        report = asyncio.run(_get_preflight_report())
+    assert report == fresh
+    cache_key, ttl, payload = mock_redis.setex.call_args.args
+    assert cache_key == "preflight:report"
+    assert ttl >= 1
+    assert json.loads(payload) == fresh
+
+
+def test_loop_bound_client_closes_client_replaced_by_new_loop():
+    pool = LoopBoundClient()
+
+    async def _get():
+        return pool.get(AsyncClient)
+
+    first = asyncio.run(_get())
+
+    async def _replace():
+        second = pool.get(AsyncClient)
+        # Let the scheduled close of the first client run.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await pool.aclose()
+        return second
+
+    second = asyncio.run(_replace())
+    assert second is not first
+    assert first.is_closed
+    assert second.is_closed
@@ -3,9 +3,12 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from api.main import app, get_db
+from common.database import engine_options
 from common.models import EventLog
 from worker.main import MAX_ATTEMPTS, process_job
 
@@ -29,59 +32,20 @@ def _session_factory(fake_db):
     return lambda: _ctx()
 
 
-def test_health_metrics_returns_operational_shape(mock_redis):
+def test_health_metrics_returns_operational_shape(mock_redis, redis_pipeline):
     async def _run():
-        now = datetime(2026, 2, 10, 0, 0, 0)
-        failure_events = [
-            EventLog(
-                id="ev1",
-                request_id="r1",
-                user_id="usr_dev",
-                event_type="worker_retry_scheduled",
-                payload_json={"topic": "memory.summarize"},
-                created_at=now,
-            ),
-            EventLog(
-                id="ev2",
-                request_id="r2",
-                user_id="usr_dev",
-                event_type="worker_moved_to_dlq",
-                payload_json={"topic": "memory.compact"},
-                created_at=now,
-            ),
-        ]
-        completed_events = [
-            EventLog(
-                id="ev3",
-                request_id="r3",
-                user_id="usr_dev",
-                event_type="worker_topic_completed",
-                payload_json={"topic": "memory.summarize"},
-                created_at=datetime(2026, 2, 10, 1, 0, 0),
-            ),
-            EventLog(
-                id="ev4",
-                request_id="r4",
-                user_id="usr_dev",
-                event_type="worker_topic_completed",
-                payload_json={"topic": "plan.refresh"},
-                created_at=datetime(2026, 2, 10, 2, 0, 0),
-            ),
-            EventLog(
-                id="ev5",
-                request_id="r5",
-                user_id="usr_dev",
-                event_type="worker_topic_completed",
-                payload_json={"topic": "memory.compact"},
-                created_at=datetime(2026, 2, 10, 3, 0, 0),
-            ),
+        failure_counts = [("worker_retry_scheduled", 1), ("worker_moved_to_dlq", 1)]
+        latest_completions = [
+            ("memory.summarize", datetime(2026, 2, 10, 1, 0, 0)),
+            ("plan.refresh", datetime(2026, 2, 10, 2, 0, 0)),
+            ("memory.compact", datetime(2026, 2, 10, 3, 0, 0)),
         ]
 
         fake_db = AsyncMock()
         fake_db.execute = AsyncMock(
             side_effect=[
-                _FakeResult(items=failure_events),
-                _FakeResult(items=completed_events),
+                _FakeResult(items=failure_counts),
+                _FakeResult(items=latest_completions),
             ]
         )
 
@@ -91,7 +55,7 @@ def test_health_metrics_returns_operational_shape(mock_redis):
         app.dependency_overrides[get_db] = _override_get_db
         try:
             with patch("api.main.redis_client", mock_redis):
-                mock_redis.llen = AsyncMock(side_effect=[4, 1])
+                mock_redis.pipeline = MagicMock(return_value=redis_pipeline([4, 1]))
                 transport = ASGITransport(app=app)
                 async with AsyncClient(transport=transport, base_url="http://test") as client:
                     resp = await client.get(
@@ -104,7 +68,7 @@ def test_health_metrics_returns_operational_shape(mock_redis):
                 assert body["queue_depth"]["dead_letter_queue"] == 1
                 assert body["failure_counters"]["retry_scheduled"] == 1
                 assert body["failure_counters"]["moved_to_dlq"] == 1
-                assert body["last_success_by_topic"]["memory.summarize"] is not None
+                assert body["last_success_by_topic"]["memory.summarize"] == "2026-02-10T01:00:00"
                 assert body["last_success_by_topic"]["plan.refresh"] is not None
                 assert body["last_success_by_topic"]["memory.compact"] is not None
                 assert body["last_success_by_topic"]["reminders.dispatch"] is None
@@ -114,6 +78,60 @@ def test_health_metrics_returns_operational_shape(mock_redis):
     asyncio.run(_run())
 
 
+def test_health_metrics_reports_latest_completion_per_topic_from_database(mock_redis, redis_pipeline):
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", **engine_options("sqlite+aiosqlite:///:memory:"))
+        async with engine.begin() as conn:
+            await conn.run_sync(EventLog.__table__.create)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            rows = [
+                ("evt_1", "worker_topic_completed", "plan.refresh", datetime(2026, 2, 10, 1, 0, 0)),
+                ("evt_2", "worker_topic_completed", "plan.refresh", datetime(2026, 2, 10, 4, 0, 0)),
+                ("evt_3", "worker_topic_completed", "memory.summarize", datetime(2026, 2, 10, 2, 0, 0)),
+                ("evt_4", "worker_topic_completed", "untracked.topic", datetime(2026, 2, 10, 5, 0, 0)),
+                ("evt_5", "worker_retry_scheduled", "memory.compact", datetime(2026, 2, 10, 6, 0, 0)),
+            ]
+            for event_id, event_type, topic, created_at in rows:
+                db.add(
+                    EventLog(
+                        id=event_id,
+                        request_id=f"job_{event_id}",
+                        user_id="system",
+                        event_type=event_type,
+                        payload_json={"topic": topic},
+                        created_at=created_at,
+                    )
+                )
+            await db.commit()
+
+        async def _override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = _override_get_db
+        try:
+            with patch("api.main.redis_client", mock_redis):
+                mock_redis.pipeline = MagicMock(return_value=redis_pipeline([0, 0]))
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://test") as client:
+                    resp = await client.get("/health/metrics", headers={"Authorization": "Bearer test_token"})
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+        assert resp.status_code == 200
+        last_success = resp.json()["last_success_by_topic"]
+        assert last_success == {
+            "memory.summarize": "2026-02-10T02:00:00",
+            "memory.compact": None,
+            "plan.refresh": "2026-02-10T04:00:00",
+            "reminders.dispatch": None,
+        }
+
+    asyncio.run(_run())
+
+
 def test_process_job_logs_retry_event_and_requeues():
     async def _run():
         fake_db = AsyncMock()
@@ -140,7 +158,7 @@ def test_process_job_logs_retry_event_and_requeues():
         fake_redis.rpush.assert_awaited_once()
         queue_name, raw_payload = fake_redis.rpush.await_args.args
         assert queue_name == "default_queue"
-        assert '"attempt": 2' in raw_payload
+        assert orjson.loads(raw_payload)["attempt"] == 2
 
         assert fake_db.add.call_count == 1
         logged = fake_db.add.call_args.args[0]
@@ -189,3 +207,65 @@ def test_process_job_logs_dlq_event_on_max_attempts():
         assert logged.payload_json["queue"] == "dead_letter_queue"
 
     asyncio.run(_run())
+
+
+def test_engine_options_apply_pool_settings_for_postgres_only():
+    from common.database import engine_options
+
+    pg = engine_options("postgresql+asyncpg://u:p@db/app")
+    assert pg["pool_size"] == 20
+    assert pg["max_overflow"] == 20
+    assert pg["pool_timeout"] == 10
+    assert pg["pool_pre_ping"] is True
+    assert pg["pool_recycle"] == 1800
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    assert pg["poolclass"] is AsyncAdaptedQueuePool
+    sqlite = engine_options("sqlite+aiosqlite:///:memory:")
+    assert "pool_size" not in sqlite
+    assert sqlite["json_deserializer"](sqlite["json_serializer"]({"tasks": [{"title": "Café"}]})) == {
+        "tasks": [{"title": "Café"}]
+    }
+
+    with patch("common.database.settings.DB_USE_NULL_POOL", True):
+        from sqlalchemy.pool import NullPool
+
+        assert engine_options("postgresql+asyncpg://u:p@db/app")["poolclass"] is NullPool
+
+
+def test_short_id_keeps_prefixed_hex_shape():
+    import re
+
+    from common.ids import short_id
+
+    assert re.fullmatch(r"tsk_[0-9a-f]{12}", short_id("tsk"))
+    assert re.fullmatch(r"tg_[0-9a-f]{8}", short_id("tg", nbytes=4))
+    assert short_id("tsk") != short_id("tsk")
+
+
+def test_new_uuid_matches_uuid4_string_shape():
+    import uuid
+
+    from common.ids import new_uuid
+
+    ids = [new_uuid() for _ in range(200)]
+    assert len(set(ids)) == len(ids)
+    for value in ids:
+        parsed = uuid.UUID(value)
+        assert str(parsed) == value
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+
+
+def test_responses_carry_request_id_header():
+    async def _run():
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/health/live")
+            second = await client.get("/health/live")
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first.status_code == 200
+    assert len(first.headers["X-Request-ID"]) == 32
+    assert first.headers["X-Request-ID"] != second.headers["X-Request-ID"]
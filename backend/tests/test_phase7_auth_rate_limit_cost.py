@@ -1,8 +1,10 @@
 import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from fastapi import HTTPException
 from httpx import ASGITransport, AsyncClient
 
 from api.main import app, get_db
@@ -40,12 +42,23 @@ def _db_override(fake_db):
 class _RateLimitRedis:
     def __init__(self):
         self.counts = {}
+        self.expiries = {}
+
+    def register_script(self, script):
+        async def _run(keys, args):
+            current = await self.incr(keys[0])
+            if current == 1:
+                await self.expire(keys[0], args[0])
+            return [current, await self.ttl(keys[0])]
+
+        return _run
 
     async def incr(self, key):
         self.counts[key] = self.counts.get(key, 0) + 1
         return self.counts[key]
 
     async def expire(self, key, seconds):
+        self.expiries[key] = seconds
         return True
 
     async def ttl(self, key):
@@ -59,9 +72,10 @@ class _RateLimitRedis:
 
     def reset_key(self, key):
         self.counts.pop(key, None)
+        self.expiries.pop(key, None)
 
 
-def test_auth_token_user_mapping_and_unknown_token_denied(mock_redis):
+def test_auth_token_user_mapping_and_unknown_token_denied(mock_redis, redis_pipeline):
     async def _run():
         old_map = settings.APP_AUTH_TOKEN_USER_MAP
         old_tokens = settings.APP_AUTH_BEARER_TOKENS
@@ -77,7 +91,7 @@ def test_auth_token_user_mapping_and_unknown_token_denied(mock_redis):
         app.dependency_overrides[get_db] = _override_get_db
         try:
             with patch("api.main.redis_client", mock_redis):
-                mock_redis.llen = AsyncMock(side_effect=[0, 0])
+                mock_redis.pipeline = MagicMock(return_value=redis_pipeline([0, 0]))
                 transport = ASGITransport(app=app)
                 async with AsyncClient(transport=transport, base_url="http://test") as client:
                     ok = await client.get("/health/metrics", headers={"Authorization": "Bearer token_b"})
@@ -92,7 +106,7 @@ def test_auth_token_user_mapping_and_unknown_token_denied(mock_redis):
     asyncio.run(_run())
 
 
-def test_auth_mixed_mode_falls_back_to_legacy_tokens(mock_redis):
+def test_auth_mixed_mode_falls_back_to_legacy_tokens(mock_redis, redis_pipeline):
     async def _run():
         old_map = settings.APP_AUTH_TOKEN_USER_MAP
         old_tokens = settings.APP_AUTH_BEARER_TOKENS
@@ -108,7 +122,7 @@ def test_auth_mixed_mode_falls_back_to_legacy_tokens(mock_redis):
         app.dependency_overrides[get_db] = _override_get_db
         try:
             with patch("api.main.redis_client", mock_redis):
-                mock_redis.llen = AsyncMock(return_value=0)
+                mock_redis.pipeline = MagicMock(return_value=redis_pipeline([0, 0]))
                 transport = ASGITransport(app=app)
                 async with AsyncClient(transport=transport, base_url="http://test") as client:
                     via_map = await client.get("/health/metrics", headers={"Authorization": "Bearer token_a"})
@@ -174,6 +188,8 @@ def test_rate_limit_enforced_per_endpoint_class():
 
             assert c1.status_code == 200
             assert c2.status_code == 429
+            assert "Retry in 59s" in c2.json()["detail"]
+            assert limiter_redis.expiries["rate_limit:capture:usr_a"] == settings.RATE_LIMIT_WINDOW_SECONDS
             assert q1.status_code == 200
             assert q2.status_code == 429
             assert p1.status_code == 200
@@ -188,6 +204,54 @@ def test_rate_limit_enforced_per_endpoint_class():
     asyncio.run(_run())
 
 
+def test_rate_limited_capture_cancels_prefetched_grounding():
+    async def _run():
+        old_map = settings.APP_AUTH_TOKEN_USER_MAP
+        settings.APP_AUTH_TOKEN_USER_MAP = "token_a:usr_a"
+
+        fake_db = AsyncMock()
+        fake_db.execute = AsyncMock(return_value=_FakeResult())
+        fake_db.add = MagicMock()
+
+        async def _override_get_db():
+            yield fake_db
+
+        app.dependency_overrides[get_db] = _override_get_db
+        grounding_cancelled = asyncio.Event()
+
+        async def _reject_after_round_trip(*_args):
+            await asyncio.sleep(0)
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
+        async def _slow_grounding(**_kwargs):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                grounding_cancelled.set()
+                raise
+
+        try:
+            with patch("api.main.enforce_rate_limit", _reject_after_round_trip), patch("api.main._build_extraction_grounding", _slow_grounding), patch(
+                "api.main.redis_client", AsyncMock(get=AsyncMock(return_value=None))
+            ):
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://test") as client:
+                    response = await client.post(
+                        "/v1/capture/thought",
+                        headers={"Authorization": "Bearer token_a", "Idempotency-Key": "k1"},
+                        json={"chat_id": "c1", "source": "api", "message": "hello"},
+                    )
+        finally:
+            app.dependency_overrides.clear()
+            settings.APP_AUTH_TOKEN_USER_MAP = old_map
+
+        assert response.status_code == 429
+        assert grounding_cancelled.is_set()
+        fake_db.add.assert_not_called()
+
+    asyncio.run(_run())
+
+
 def test_rate_limit_resets_after_window_simulated_expiry():
     async def _run():
         old_map = settings.APP_AUTH_TOKEN_USER_MAP
@@ -287,7 +351,28 @@ def test_daily_cost_summary_aggregation(mock_redis):
 
         async def _execute(stmt):
             _ = stmt
-            return _FakeResult(items=[row for row in rows if row.user_id == "usr_dev"])
+            groups = {}
+            for row in rows:
+                if row.user_id != "usr_dev":
+                    continue
+                group = groups.setdefault((row.operation, row.model), [0, 0, 0, 0])
+                group[0] += 1
+                group[1] += row.input_tokens or 0
+                group[2] += row.output_tokens or 0
+                group[3] += row.cached_input_tokens or 0
+            return _FakeResult(
+                items=[
+                    SimpleNamespace(
+                        operation=operation,
+                        model=model,
+                        runs=runs,
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                        cached_input_tokens=cached_input_tokens,
+                    )
+                    for (operation, model), (runs, input_tokens, output_tokens, cached_input_tokens) in groups.items()
+                ]
+            )
 
         fake_db.execute = AsyncMock(side_effect=_execute)
 
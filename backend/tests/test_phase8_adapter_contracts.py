@@ -4,9 +4,15 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from api.main import app, get_db
+from api.schemas import AppliedChanges
+from common.database import engine_options
+from common.models import Base, PromptRun
 from worker.main import handle_plan_refresh
 
 
@@ -28,9 +34,7 @@ def _session_factory(fake_db):
 
 def _rate_limit_redis():
     mock = AsyncMock()
-    mock.incr = AsyncMock(return_value=1)
-    mock.expire = AsyncMock(return_value=True)
-    mock.ttl = AsyncMock(return_value=59)
+    mock.register_script = MagicMock(return_value=AsyncMock(return_value=[1, 59]))
     mock.rpush = AsyncMock(return_value=1)
     return mock
 
@@ -66,6 +70,106 @@ def test_capture_rejects_non_dict_extraction_and_avoids_writes():
     asyncio.run(_run())
 
 
+def test_capture_retries_when_prefetched_grounding_fails():
+    async def _run():
+        fake_db = AsyncMock()
+        fake_db.execute = AsyncMock(return_value=_FakeResult(one_or_none=None))
+        fake_db.commit = AsyncMock()
+        fake_db.add = MagicMock()
+
+        async def _override_get_db():
+            yield fake_db
+
+        grounding = AsyncMock(side_effect=[RuntimeError("grounding unavailable"), TimeoutError("still unavailable")])
+        extract = AsyncMock(return_value="not-a-dict")
+        app.dependency_overrides[get_db] = _override_get_db
+        try:
+            with patch("api.main.redis_client", _rate_limit_redis()), patch(
+                "api.main._build_extraction_grounding", grounding
+            ), patch("api.main.adapter.extract_structured_updates", extract):
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://test") as client:
+                    resp = await client.post(
+                        "/v1/capture/thought",
+                        headers={"Authorization": "Bearer test_token", "Idempotency-Key": "phase8-grounding-1"},
+                        json={"chat_id": "phase8_chat", "source": "api", "message": "hello"},
+                    )
+                assert resp.status_code == 422
+                assert grounding.await_count == 2
+                extract.assert_not_awaited()
+                runs = [call.args[0] for call in fake_db.add.call_args_list if isinstance(call.args[0], PromptRun)]
+                assert [run.error_code for run in runs] == ["RuntimeError", "TimeoutError"]
+        finally:
+            app.dependency_overrides.clear()
+
+    asyncio.run(_run())
+
+
+def test_capture_finishes_prefetched_grounding_before_other_session_work():
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", **engine_options("sqlite+aiosqlite:///:memory:"))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        # aiosqlite only rejects overlap while a connection is being provisioned (asyncpg rejects
+        # it on every statement), so record statements that start while another is in flight.
+        in_flight = []
+        overlapping = []
+
+        def _before(_conn, _cursor, statement, *_args):
+            if in_flight:
+                overlapping.append(statement)
+            in_flight.append(statement)
+
+        def _after(*_args):
+            in_flight.pop()
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _before)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after)
+
+        async def _override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        extraction = {"tasks": [{"title": "Call dentist", "action": "create"}], "goals": [], "problems": [], "links": []}
+
+        async def _slow_grounding(*, db, **_kwargs):
+            # Long enough that the session lookup would overlap it if it were not awaited first.
+            await db.execute(
+                text(
+                    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000) "
+                    "SELECT count(*) FROM n"
+                )
+            )
+            return {"tasks": []}
+
+        app.dependency_overrides[get_db] = _override_get_db
+        try:
+            limiter_redis = _rate_limit_redis()
+            limiter_redis.get = AsyncMock(return_value=None)
+            with patch("api.main.redis_client", limiter_redis), patch(
+                "api.main._build_extraction_grounding", _slow_grounding
+            ), patch("api.main.adapter.extract_structured_updates", AsyncMock(return_value=extraction)), patch(
+                "api.main._apply_capture", AsyncMock(return_value=("inb_1", AppliedChanges()))
+            ) as apply_capture, patch("api.main.save_idempotency", AsyncMock()):
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://test") as client:
+                    resp = await client.post(
+                        "/v1/capture/thought",
+                        headers={"Authorization": "Bearer test_token", "Idempotency-Key": "phase8-grounding-real-db"},
+                        json={"chat_id": "phase8_chat", "source": "api", "message": "hello"},
+                    )
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+        assert resp.status_code == 200
+        assert overlapping == []
+        apply_capture.assert_awaited_once()
+
+    asyncio.run(_run())
+
+
 def test_capture_rejects_invalid_scalar_fields_and_avoids_partial_writes():
     async def _run():
         fake_db = AsyncMock()
@@ -263,3 +367,139 @@ def test_plan_rewrite_ignores_extra_unexpected_keys_via_schema_validation():
         assert "unexpected_key" not in cached
 
     asyncio.run(_run())
+
+
+def test_capture_retry_reaches_model_after_invalid_actionable_extraction():
+    async def _run():
+        fake_db = AsyncMock()
+        fake_db.execute = AsyncMock(return_value=_FakeResult(one_or_none=None))
+        fake_db.commit = AsyncMock()
+        fake_db.add = MagicMock()
+
+        async def _override_get_db():
+            yield fake_db
+
+        store = {}
+
+        async def _set(key, value, ex=None, nx=False):
+            if nx and key in store:
+                return None
+            store[key] = value
+            return True
+
+        async def _setex(key, _ttl, value):
+            store[key] = value
+            return True
+
+        async def _delete(*keys):
+            return sum(store.pop(key, None) is not None for key in keys)
+
+        cache_redis = _rate_limit_redis()
+        cache_redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        cache_redis.set = AsyncMock(side_effect=_set)
+        cache_redis.setex = AsyncMock(side_effect=_setex)
+        cache_redis.delete = AsyncMock(side_effect=_delete)
+        valid = {"tasks": [{"title": "Call dentist", "action": "create"}], "goals": [], "problems": [], "links": []}
+        invalid = dict(valid, links=[{"from_type": "task", "from_title": "Call dentist"}])
+        extract = AsyncMock(side_effect=[invalid, valid])
+        app.dependency_overrides[get_db] = _override_get_db
+        try:
+            with patch("api.main.redis_client", cache_redis), patch(
+                "api.main._build_extraction_grounding", AsyncMock(return_value={"tasks": []})
+            ), patch("api.main.adapter.extract_structured_updates", extract), patch(
+                "api.main._apply_capture", AsyncMock(return_value=("inb_1", AppliedChanges()))
+            ) as apply_capture, patch("api.main.save_idempotency", AsyncMock()):
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://test") as client:
+                    resp = await client.post(
+                        "/v1/capture/thought",
+                        headers={"Authorization": "Bearer test_token", "Idempotency-Key": "phase8-invalid-cache"},
+                        json={"chat_id": "phase8_chat", "source": "api", "message": "call the dentist"},
+                    )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert resp.status_code == 200
+        assert extract.await_count == 2
+        assert apply_capture.await_args.kwargs["extraction"]["tasks"][0]["title"] == "Call dentist"
+        cached = [json.loads(value) for key, value in store.items() if key.startswith("extract:") and not key.endswith(":lock")]
+        assert cached == [valid]
+
+    asyncio.run(_run())
+
+
+def test_extraction_leader_releases_lock_when_model_call_fails():
+    from api.main import _extract_structured_updates
+
+    fake_redis = AsyncMock()
+    fake_redis.get = AsyncMock(return_value=None)
+    fake_redis.set = AsyncMock(return_value=True)
+    extract = AsyncMock(side_effect=RuntimeError("provider down"))
+
+    with patch("api.main.redis_client", fake_redis), patch("api.main.adapter.extract_structured_updates", extract):
+        with pytest.raises(RuntimeError, match="provider down"):
+            asyncio.run(_extract_structured_updates("usr_dev", "call the dentist", {"tasks": []}))
+
+    lock_key = fake_redis.set.await_args.args[0]
+    assert lock_key.endswith(":lock")
+    fake_redis.delete.assert_awaited_once_with(lock_key)
+
+
+def test_extraction_follower_stops_waiting_once_leader_releases_lock_without_result():
+    from api.main import _extract_structured_updates
+
+    extraction = {"tasks": [], "goals": [], "problems": [], "links": [], "reminders": []}
+    fake_redis = AsyncMock()
+    fake_redis.get = AsyncMock(return_value=None)
+    fake_redis.set = AsyncMock(return_value=False)
+    fake_redis.mget = AsyncMock(return_value=[None, None])
+    extract = AsyncMock(return_value=extraction)
+
+    with patch("api.main.redis_client", fake_redis), patch(
+        "api.main.adapter.extract_structured_updates", extract
+    ), patch("api.grounding_runtime.asyncio.sleep", AsyncMock()):
+        result = asyncio.run(_extract_structured_updates("usr_dev", "call the dentist", {"tasks": []}))
+
+    assert result == extraction
+    fake_redis.mget.assert_awaited_once()
+    extract.assert_awaited_once()
+    fake_redis.delete.assert_not_awaited()
+
+
+def test_extraction_replay_is_served_from_cache_without_usage():
+    from api.main import _extract_structured_updates
+
+    grounding = {"chat_id": "c1", "current_datetime_local": "2026-03-19T12:15:42-05:00", "tasks": []}
+    extraction = {
+        "tasks": [{"title": "Call dentist", "action": "create"}],
+        "goals": [],
+        "problems": [],
+        "links": [],
+        "reminders": [],
+        "usage": {"input_tokens": 120, "output_tokens": 30},
+    }
+    store = {}
+
+    async def _setex(key, _ttl, value):
+        store[key] = value
+        return True
+
+    fake_redis = AsyncMock()
+    fake_redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+    fake_redis.set = AsyncMock(return_value=True)
+    fake_redis.setex = AsyncMock(side_effect=_setex)
+    extract = AsyncMock(return_value=extraction)
+
+    async def _run():
+        first = await _extract_structured_updates("usr_dev", "call the dentist", grounding)
+        replay_grounding = dict(grounding, current_datetime_local="2026-03-19T12:15:58-05:00")
+        second = await _extract_structured_updates("usr_dev", "call  the dentist", replay_grounding)
+        return first, second
+
+    with patch("api.main.redis_client", fake_redis), patch("api.main.adapter.extract_structured_updates", extract):
+        first, second = asyncio.run(_run())
+
+    assert extract.await_count == 1
+    assert first["usage"]["input_tokens"] == 120
+    assert second["tasks"] == extraction["tasks"]
+    assert "usage" not in second
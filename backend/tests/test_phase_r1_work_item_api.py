@@ -1,10 +1,14 @@
 import asyncio
+import hashlib
+import json
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 from httpx import ASGITransport, AsyncClient
 
+from api.main import check_idempotency
 from common.models import (
     ActionBatch,
     WorkItem,
@@ -180,7 +184,7 @@ def test_update_work_item_records_action_batch_and_version(app_no_db, mock_db):
     assert version.operation.value == "complete"
 
 
-def test_update_work_item_save_idempotency_serializes_datetime_payloads(app_no_db, mock_db):
+def test_update_work_item_save_idempotency_serializes_datetime_payloads(app_no_db, mock_db, mock_redis):
     item = WorkItem(
         id="tsk_local_3",
         user_id="usr_dev",
@@ -213,6 +217,98 @@ def test_update_work_item_save_idempotency_serializes_datetime_payloads(app_no_d
     assert stored_entry.response_body["status"] == "open"
     assert stored_entry.response_body["updated_at"] == "2026-03-25T18:00:00+00:00"
     assert stored_entry.response_body["completed_at"] is None
+    cache_key, _, cached_json = mock_redis.setex.call_args.args
+    assert cache_key == "idem:usr_dev:idem-work-item-update"
+    assert json.loads(cached_json)["response_body"]["status"] == "open"
+
+
+def test_update_work_item_replay_collision_is_answered_from_redis(app_no_db, mock_db, mock_redis):
+    mock_redis.get = AsyncMock(return_value=json.dumps({"request_hash": "other", "response_body": {}}))
+
+    response = _patch(app_no_db, "/v1/work_items/tsk_local_3", {"status": "open"})
+
+    assert response.status_code == 409
+    mock_redis.get.assert_awaited_once()
+    mock_db.execute.assert_not_called()
+
+
+def test_idempotent_replay_is_served_before_the_route_runs(app_no_db, mock_db, mock_redis):
+    body = b'{"status":"open"}'
+    request_hash = hashlib.sha256(b"PATCH|/v1/work_items/tsk_1|usr_dev|" + body).hexdigest()
+    mock_redis.get = AsyncMock(
+        return_value=json.dumps({"request_hash": request_hash, "response_body": {"id": "tsk_1", "status": "open"}})
+    )
+
+    async def _call():
+        transport = ASGITransport(app=app_no_db)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.patch(
+                "/v1/work_items/tsk_1",
+                content=body,
+                headers={
+                    "Authorization": "Bearer test_token",
+                    "Idempotency-Key": "idem-replay",
+                    "Content-Type": "application/json",
+                },
+            )
+
+    with patch("api.main.run_check_idempotency", new_callable=AsyncMock) as route_check:
+        response = asyncio.run(_call())
+
+    assert response.status_code == 200
+    assert response.json() == {"id": "tsk_1", "status": "open"}
+    route_check.assert_not_awaited()
+    assert response.headers["x-request-id"]
+    mock_redis.get.assert_awaited_once_with("idem:usr_dev:idem-replay")
+    mock_db.execute.assert_not_called()
+
+
+def test_idempotency_hash_of_raw_body_matches_decoded_string_hash(mock_db, mock_redis):
+    body = json.dumps({"title": "Café ☕"}, ensure_ascii=False).encode("utf-8")
+    legacy_hash = hashlib.sha256(f"PATCH|/v1/work_items/tsk_1|usr_dev|{body.decode('utf-8')}".encode("utf-8")).hexdigest()
+    mock_redis.get = AsyncMock(return_value=json.dumps({"request_hash": legacy_hash, "response_body": {"id": "tsk_1"}}))
+    request = SimpleNamespace(
+        method="PATCH",
+        url=SimpleNamespace(path="/v1/work_items/tsk_1"),
+        headers={"Idempotency-Key": "idem-1"},
+        body=AsyncMock(return_value=body),
+        state=SimpleNamespace(),
+    )
+
+    with patch("api.main.redis_client", mock_redis):
+        asyncio.run(check_idempotency(request, user_id="usr_dev", db=mock_db))
+
+    assert request.state.idempotent_response == {"id": "tsk_1"}
+    assert request.state.request_hash == legacy_hash
+    mock_db.execute.assert_not_called()
+
+
+def test_idempotency_replay_found_in_db_is_backfilled_into_redis(mock_db, mock_redis):
+    now = datetime(2026, 3, 25, 18, 0, tzinfo=timezone.utc)
+    body = b'{"status":"open"}'
+    request_hash = hashlib.sha256(b"PATCH|/v1/work_items/tsk_1|usr_dev|" + body).hexdigest()
+    stored = SimpleNamespace(
+        request_hash=request_hash,
+        response_body={"id": "tsk_1"},
+        expires_at=datetime(2026, 3, 25, 19, 0, tzinfo=timezone.utc),
+    )
+    mock_db.execute.return_value = _FakeResult(one_or_none=stored)
+    request = SimpleNamespace(
+        method="PATCH",
+        url=SimpleNamespace(path="/v1/work_items/tsk_1"),
+        headers={"Idempotency-Key": "idem-2"},
+        body=AsyncMock(return_value=body),
+        state=SimpleNamespace(),
+    )
+
+    with patch("api.main.redis_client", mock_redis), patch("api.main.utc_now", return_value=now):
+        asyncio.run(check_idempotency(request, user_id="usr_dev", db=mock_db))
+
+    assert request.state.idempotent_response == {"id": "tsk_1"}
+    cache_key, ttl, cached_json = mock_redis.setex.call_args.args
+    assert cache_key == "idem:usr_dev:idem-2"
+    assert ttl == 3600
+    assert json.loads(cached_json) == {"request_hash": request_hash, "response_body": {"id": "tsk_1"}}
 
 
 def test_goal_compatibility_endpoint_is_unregistered(app_no_db):
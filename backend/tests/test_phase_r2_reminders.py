@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 from httpx import ASGITransport, AsyncClient
 
 from api.main import app, get_db
@@ -429,7 +430,7 @@ def test_dispatch_due_reminders_endpoint_enqueues_worker_job(app_no_db, mock_red
         assert response.status_code == 200
         assert response.json()["enqueued"] is True
         _, raw = mock_redis.rpush.await_args.args
-        assert '"topic": "reminders.dispatch"' in raw
+        assert orjson.loads(raw)["topic"] == "reminders.dispatch"
     finally:
         app.dependency_overrides.clear()
 
@@ -460,6 +461,7 @@ def test_handle_reminder_dispatch_sends_due_pending_reminders():
             side_effect=[
                 _FakeResult(items=[reminder]),
                 _FakeResult(one_or_none=mapping),
+                _FakeResult(),
             ]
         )
         fake_db.commit = AsyncMock()
@@ -481,10 +483,11 @@ def test_handle_reminder_dispatch_sends_due_pending_reminders():
         assert len(conversation_events) == 1
         assert conversation_events[0].direction == ConversationDirection.outbound
         assert conversation_events[0].chat_id == "791013684"
-        context_items = [call.args[0] for call in fake_db.add.call_args_list if isinstance(call.args[0], RecentContextItem)]
-        assert len(context_items) == 1
-        assert context_items[0].entity_type == EntityType.reminder
-        assert context_items[0].entity_id == "rem_due"
+        context_stmt, context_rows = fake_db.execute.await_args_list[2].args
+        assert context_stmt.table.name == RecentContextItem.__tablename__
+        assert len(context_rows) == 1
+        assert context_rows[0]["entity_type"] == EntityType.reminder
+        assert context_rows[0]["entity_id"] == "rem_due"
 
     asyncio.run(_run())
 
@@ -516,6 +519,7 @@ def test_handle_reminder_dispatch_reschedules_recurring_reminder():
             side_effect=[
                 _FakeResult(items=[reminder]),
                 _FakeResult(one_or_none=mapping),
+                _FakeResult(),
             ]
         )
         fake_db.commit = AsyncMock()
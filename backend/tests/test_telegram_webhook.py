@@ -9,9 +9,11 @@ These tests validate:
 import asyncio
 import json
 from datetime import datetime, date, timezone
+from types import SimpleNamespace
 from typing import Optional
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import pytest
 from httpx import ASGITransport, AsyncClient
 
 from api.main import (
@@ -21,11 +23,19 @@ from api.main import (
     _best_reminder_reference_candidate,
     _best_task_reference_candidate,
     _confirm_action_draft,
+    _create_action_draft,
     _draft_set_awaiting_edit_input,
     _draft_set_proposal_message_id,
+    _drain_background_tasks,
+    _enqueue_summary_job,
     _format_action_draft_preview,
+    _get_open_action_draft,
+    _plan_cache_key,
+    _post_confirm_side_effects,
     _remember_recent_reminders,
+    _revise_action_draft,
     _reminder_reference_candidates,
+    _sanitize_extraction,
     _validate_extraction_payload,
 )
 from api.schemas import AppliedChanges, QueryResponseV1
@@ -35,6 +45,7 @@ from common.models import (
     ActionBatch,
     ConversationEvent,
     EntityType,
+    EventLog,
     RecentContextItem,
     Reminder,
     ReminderKind,
@@ -392,20 +403,23 @@ def test_build_extraction_grounding_keeps_displayed_parent_project(mock_db):
         expires_at=now,
     )
 
+    # Grounding selects columns rather than entities, so results are plain rows.
+    project_row = SimpleNamespace(
+        id=project.id,
+        title=project.title,
+        notes=project.notes,
+        status=project.status,
+        priority=project.priority,
+        due_at=project.due_at,
+        parent_id=project.parent_id,
+    )
     task_result = Mock()
-    task_scalars = Mock()
-    task_scalars.all.return_value = [project]
-    task_result.scalars.return_value = task_scalars
+    task_result.all.return_value = [project_row]
 
     recent_result = Mock()
-    recent_scalars = Mock()
-    recent_scalars.all.return_value = [recent_ctx]
-    recent_result.scalars.return_value = recent_scalars
-
-    recent_task_result = Mock()
-    recent_task_scalars = Mock()
-    recent_task_scalars.all.return_value = [project]
-    recent_task_result.scalars.return_value = recent_task_scalars
+    recent_result.all.return_value = [
+        SimpleNamespace(entity_id=recent_ctx.entity_id, reason=recent_ctx.reason, **vars(project_row))
+    ]
 
     reminder_recent_result = Mock()
     reminder_recent_scalars = Mock()
@@ -413,14 +427,11 @@ def test_build_extraction_grounding_keeps_displayed_parent_project(mock_db):
     reminder_recent_result.scalars.return_value = reminder_recent_scalars
 
     reminder_result = Mock()
-    reminder_scalars = Mock()
-    reminder_scalars.all.return_value = []
-    reminder_result.scalars.return_value = reminder_scalars
+    reminder_result.all.return_value = []
 
     mock_db.execute.side_effect = [
         task_result,
         recent_result,
-        recent_task_result,
         reminder_recent_result,
         reminder_result,
     ]
@@ -650,6 +661,24 @@ def test_non_command_capture_dedup_updates_task_count(app_no_db, mock_send):
         assert "did not find clear actions" in mock_send.await_args.args[1].lower()
 
 
+def test_action_planning_telemetry_is_committed_when_fallback_extraction_fails(app_no_db, mock_extract, mock_send, mock_db):
+    mock_extract.extract_structured_updates.side_effect = RuntimeError("provider down")
+    with patch("api.main._resolve_telegram_user", new_callable=AsyncMock, return_value="usr_123"), patch(
+        "api.main._build_extraction_grounding", new_callable=AsyncMock, return_value={"tasks": []}
+    ), patch("api.main._get_open_action_draft", new_callable=AsyncMock, return_value=None):
+        resp = _post(app_no_db, WEBHOOK_URL, json=_tg_update("Sort out the garage"), headers=_headers())
+
+    assert resp.status_code == 200
+    assert "trouble processing" in mock_send.await_args.args[1]
+    calls = mock_db.mock_calls
+    fallback_index = next(
+        i
+        for i, c in enumerate(calls)
+        if c[0] == "add" and getattr(c.args[0], "event_type", None) == "action_extract_fallback_used"
+    )
+    assert any(c[0] == "commit" for c in calls[fallback_index + 1 :])
+
+
 def test_non_command_bulk_done_without_actionable_plan_requests_clarification(app_no_db, mock_extract, mock_send):
     mock_extract.plan_actions.return_value = {
         "intent": "action",
@@ -2758,7 +2787,7 @@ def test_non_command_yes_applies_open_draft(app_no_db, mock_send, mock_extract):
         assert "task(s) created" in mock_send.await_args.args[1].lower()
 
 
-def test_confirm_action_draft_invalidates_today_plan_cache(mock_db):
+def test_confirm_action_draft_invalidates_today_plan_cache(mock_db, mock_redis):
     fake_draft = _fake_draft(
         source_message="move the photo processing task to tomorrow",
         proposal_json={"tasks": [{"title": "Process photos from the last tournament", "action": "update"}]},
@@ -2775,7 +2804,7 @@ def test_confirm_action_draft_invalidates_today_plan_cache(mock_db):
             "summary_metadata_json": {},
         },
     )()
-    with patch(
+    with patch("api.main.redis_client", mock_redis), patch(
         "api.main._apply_capture",
         new_callable=AsyncMock,
         return_value=("inb_1", AppliedChanges(tasks_updated=1)),
@@ -2793,22 +2822,85 @@ def test_confirm_action_draft_invalidates_today_plan_cache(mock_db):
         "api.main._update_session_state",
         new_callable=AsyncMock,
     ):
-        applied = asyncio.run(
-            _confirm_action_draft(
+
+        async def _run():
+            applied = await _confirm_action_draft(
                 draft=fake_draft,
                 user_id="usr_123",
                 chat_id="12345",
                 request_id="req_1",
                 db=mock_db,
             )
-        )
+            # Both keys are gone before the reply goes out, not in the background task.
+            mock_redis.delete.assert_awaited_once_with("drf_open:usr_123:12345", _plan_cache_key("usr_123", "12345"))
+            await _drain_background_tasks()
+            return applied
+
+        applied = asyncio.run(_run())
 
     apply_capture.assert_awaited_once()
-    invalidate_today.assert_awaited_once_with("usr_123", "12345")
-    enqueue_summary.assert_awaited_once_with(user_id="usr_123", chat_id="12345", inbox_item_id="inb_1")
+    invalidate_today.assert_not_awaited()
+    enqueue_summary.assert_awaited_once_with(
+        user_id="usr_123",
+        chat_id="12345",
+        inbox_item_id="inb_1",
+    )
     assert applied.tasks_updated == 1
 
 
+def test_post_confirm_enqueue_failure_is_logged_in_a_fresh_session():
+    side_db = AsyncMock()
+    side_db.add = Mock()
+
+    class _SessionFactory:
+        async def __aenter__(self):
+            return side_db
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    with patch(
+        "api.main._enqueue_summary_job",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("redis down"),
+    ), patch("api.main.AsyncSessionLocal", return_value=_SessionFactory()):
+        asyncio.run(_post_confirm_side_effects("drf_1", "usr_123", "12345", "req_1", "inb_1"))
+
+    logged = side_db.add.call_args.args[0]
+    assert isinstance(logged, EventLog)
+    assert logged.event_type == "action_apply_background_enqueue_failure"
+    assert logged.payload_json == {"draft_id": "drf_1", "summary_enqueued": False, "summary_error": "redis down"}
+    side_db.commit.assert_awaited_once()
+
+
+def test_enqueue_summary_job_pipelines_plan_cache_invalidation(redis_pipeline):
+    pipe = redis_pipeline([1, 1])
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    redis.rpush = AsyncMock()
+
+    with patch("api.main.redis_client", redis):
+        asyncio.run(_enqueue_summary_job("usr_123", "12345", "inb_1", invalidate_plan_cache=True))
+
+    redis.pipeline.assert_called_once_with(transaction=False)
+    pipe.delete.assert_called_once_with(_plan_cache_key("usr_123", "12345"))
+    queue, raw_job = pipe.rpush.call_args.args
+    assert queue == "default_queue"
+    assert json.loads(raw_job)["payload"]["inbox_item_id"] == "inb_1"
+    pipe.execute.assert_awaited_once_with(raise_on_error=False)
+    redis.rpush.assert_not_awaited()
+
+
+def test_enqueue_summary_job_raises_when_pipelined_enqueue_fails(redis_pipeline):
+    pipe = redis_pipeline([RuntimeError("del failed"), RuntimeError("push failed")])
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+
+    with patch("api.main.redis_client", redis):
+        with pytest.raises(RuntimeError, match="push failed"):
+            asyncio.run(_enqueue_summary_job("usr_123", "12345", "inb_1", invalidate_plan_cache=True))
+
+
 def test_callback_confirm_applies_open_draft(app_no_db, mock_send):
     fake_draft = type("Draft", (), {"id": "drf_1", "source_message": "plan kitchen", "proposal_json": {"tasks": [{"title": "Task A"}]}})()
     with patch("api.main._resolve_telegram_user", new_callable=AsyncMock, return_value="usr_123"), patch(
@@ -2833,6 +2925,102 @@ def test_callback_edit_prompts_for_edit_text(app_no_db, mock_send):
         assert "reply with your changes" in mock_send.await_args.args[1].lower()
 
 
+def test_callback_with_unknown_payload_skips_draft_lookup(app_no_db, mock_send):
+    with patch("api.main._resolve_telegram_user", new_callable=AsyncMock, return_value="usr_123"), patch(
+        "api.main._get_open_action_draft", new_callable=AsyncMock
+    ) as get_draft, patch("api.main.answer_callback_query", new_callable=AsyncMock):
+        resp = _post(app_no_db, WEBHOOK_URL, json=_tg_callback_update("draft:bogus:drf_1"), headers=_headers())
+        assert resp.status_code == 200
+        get_draft.assert_not_awaited()
+        assert "no longer active" in mock_send.await_args.args[1].lower()
+
+
+def test_get_open_action_draft_skips_query_on_cached_miss(mock_db, mock_redis):
+    mock_redis.get = AsyncMock(return_value="none")
+    with patch("api.main.redis_client", mock_redis):
+        draft = asyncio.run(_get_open_action_draft(user_id="usr_123", chat_id="12345", db=mock_db))
+
+    assert draft is None
+    mock_redis.get.assert_awaited_once_with("drf_open:usr_123:12345")
+    mock_db.execute.assert_not_awaited()
+
+
+def test_get_open_action_draft_queries_when_marker_missing_and_caches_miss(mock_db, mock_redis):
+    with patch("api.main.redis_client", mock_redis):
+        draft = asyncio.run(_get_open_action_draft(user_id="usr_123", chat_id="12345", db=mock_db))
+
+    assert draft is None
+    mock_db.execute.assert_awaited_once()
+    mock_redis.set.assert_awaited_once_with("drf_open:usr_123:12345", "none", ex=300, nx=True)
+
+
+def test_get_open_action_draft_finds_draft_created_without_marker(mock_db, mock_redis):
+    existing = _fake_draft(source_message="plan kitchen", proposal_json={"tasks": []})
+    mock_db.execute.return_value.scalar_one_or_none = Mock(return_value=existing)
+    mock_redis.get = AsyncMock(side_effect=RuntimeError("redis down"))
+    with patch("api.main.redis_client", mock_redis):
+        draft = asyncio.run(_get_open_action_draft(user_id="usr_123", chat_id="12345", db=mock_db))
+
+    assert draft is existing
+    mock_redis.set.assert_not_awaited()
+
+
+def test_create_action_draft_sets_open_draft_flag(mock_db, mock_redis):
+    with patch("api.main.redis_client", mock_redis), patch(
+        "api.main._invalidate_today_plan_cache", new_callable=AsyncMock
+    ), patch("api.main._get_or_create_session", new_callable=AsyncMock), patch(
+        "api.main._update_session_state", new_callable=AsyncMock
+    ):
+        draft = asyncio.run(
+            _create_action_draft(
+                db=mock_db,
+                user_id="usr_123",
+                chat_id="12345",
+                message="call the dentist",
+                extraction={"tasks": [{"title": "Call dentist", "action": "create"}]},
+                request_id="req_1",
+            )
+        )
+
+    mock_redis.setex.assert_awaited_once_with("drf_open:usr_123:12345", 1800, draft.id)
+
+
+def test_revise_action_draft_reuses_cached_extraction(mock_db, mock_redis):
+    fake_draft = type(
+        "Draft",
+        (),
+        {
+            "id": "drf_1",
+            "chat_id": "12345",
+            "source_message": "call the dentist",
+            "proposal_json": {"tasks": [{"title": "Call dentist", "action": "create"}]},
+        },
+    )()
+    cached = {"tasks": [{"title": "Call dentist", "action": "create", "due_date": "2026-03-27"}]}
+    mock_redis.get.return_value = json.dumps(cached)
+    with patch("api.main.redis_client", mock_redis), patch(
+        "api.main._build_extraction_grounding",
+        new_callable=AsyncMock,
+        return_value={"tasks": [], "recent_task_refs": [], "reminders": []},
+    ), patch("api.main.adapter") as adapter, patch(
+        "api.main._get_or_create_session", new_callable=AsyncMock
+    ), patch("api.main._update_session_state", new_callable=AsyncMock):
+        adapter.extract_structured_updates = AsyncMock()
+        extraction = asyncio.run(
+            _revise_action_draft(
+                draft=fake_draft,
+                user_id="usr_123",
+                request_id="req_1",
+                edit_text="make it due tomorrow",
+                db=mock_db,
+            )
+        )
+
+    adapter.extract_structured_updates.assert_not_awaited()
+    assert mock_redis.get.await_args.args[0].startswith("extract:")
+    assert extraction["tasks"][0]["title"] == "Call dentist"
+
+
 def test_edit_button_then_plain_message_revises_draft(app_no_db, mock_send):
     fake_draft = type("Draft", (), {"id": "drf_1", "source_message": "plan kitchen", "proposal_json": {"tasks": [{"title": "Task A"}], "_meta": {"awaiting_edit_input": True}}})()
     with patch("api.main._resolve_telegram_user", new_callable=AsyncMock, return_value="usr_123"), patch(
@@ -2942,6 +3130,7 @@ def test_draft_meta_updates_use_new_json_object():
     assert after_awaiting is not original
     assert after_awaiting["_meta"]["existing"] is True
     assert after_awaiting["_meta"]["awaiting_edit_input"] is True
+    assert "awaiting_edit_input" not in original["_meta"]
 
     _draft_set_proposal_message_id(draft, 123)
     after_message_id = draft.proposal_json
@@ -3285,7 +3474,7 @@ def test_apply_capture_repairs_wrapper_title_on_touched_task(mock_db):
         status=WorkItemStatus.open,
     )
     result = Mock()
-    result.scalar_one_or_none.return_value = existing
+    result.scalars.return_value.all.return_value = [existing]
     mock_db.execute.return_value = result
 
     _, applied = asyncio.run(
@@ -3365,6 +3554,150 @@ def test_apply_capture_flushes_inbox_item_before_creating_work_items(mock_db):
     assert applied.tasks_created == 3
 
 
+def test_apply_capture_writes_skip_events_in_one_insert(mock_db):
+    _, applied = asyncio.run(
+        _apply_capture(
+            db=mock_db,
+            user_id="usr_abc",
+            chat_id="12345",
+            source="telegram",
+            message="done with taxes and the car wash",
+            extraction={
+                "tasks": [
+                    {"title": "Taxes", "action": "complete"},
+                    {"title": "Car wash", "action": "complete"},
+                ],
+                "goals": [],
+                "problems": [],
+                "links": [],
+                "reminders": [],
+            },
+            request_id="req_skip_events",
+            commit=False,
+            enqueue_summary=False,
+        )
+    )
+
+    assert applied.tasks_updated == 0
+    assert not [call.args[0] for call in mock_db.add.call_args_list if isinstance(call.args[0], EventLog)]
+    event_inserts = [
+        call.args
+        for call in mock_db.execute.await_args_list
+        if len(call.args) == 2 and call.args[0].table.name == EventLog.__tablename__
+    ]
+    assert len(event_inserts) == 1
+    rows = event_inserts[0][1]
+    assert [row["event_type"] for row in rows] == ["task_action_skipped_missing_target"] * 2
+    assert [row["payload_json"]["title"] for row in rows] == ["Taxes", "Car wash"]
+
+
+def test_apply_capture_completes_loaded_tasks_with_one_bulk_update(mock_db):
+    from sqlalchemy.orm import make_transient_to_detached
+
+    loaded = []
+    for task_id, title in (("tsk_taxes", "Taxes"), ("tsk_car", "Car wash")):
+        item = WorkItem(
+            id=task_id,
+            user_id="usr_abc",
+            kind=WorkItemKind.task,
+            title=title,
+            title_norm=title.lower(),
+            status=WorkItemStatus.open,
+        )
+        for column in WorkItem.__table__.columns:
+            setattr(item, column.key, getattr(item, column.key))
+        make_transient_to_detached(item)
+        loaded.append(item)
+    result = Mock()
+    result.scalars.return_value.all.return_value = loaded
+    mock_db.execute.return_value = result
+
+    _, applied = asyncio.run(
+        _apply_capture(
+            db=mock_db,
+            user_id="usr_abc",
+            chat_id="12345",
+            source="telegram",
+            message="done with taxes and the car wash",
+            extraction={
+                "tasks": [
+                    {"title": "Taxes", "action": "complete", "target_task_id": "tsk_taxes"},
+                    {"title": "Car wash", "action": "complete", "target_task_id": "tsk_car"},
+                ],
+                "goals": [],
+                "problems": [],
+                "links": [],
+                "reminders": [],
+            },
+            request_id="req_bulk_complete",
+            commit=False,
+            enqueue_summary=False,
+        )
+    )
+
+    assert applied.tasks_updated == 2
+    assert all(item.status == WorkItemStatus.done for item in loaded)
+    updates = [
+        str(call.args[0])
+        for call in mock_db.execute.await_args_list
+        if str(call.args[0]).startswith("UPDATE work_items")
+    ]
+    assert len(updates) == 1
+    assert "work_items.id IN" in updates[0]
+    # The bulk UPDATE already wrote the transition, so nothing is left for the ORM to flush.
+    from sqlalchemy import inspect as sa_inspect
+
+    assert not any(attr.history.has_changes() for item in loaded for attr in sa_inspect(item).attrs)
+
+
+def test_apply_capture_batches_task_lookups_and_sees_items_created_earlier(mock_db):
+    existing = WorkItem(
+        id="tsk_known",
+        user_id="usr_abc",
+        kind=WorkItemKind.task,
+        title="Call dentist",
+        title_norm="call dentist",
+        status=WorkItemStatus.open,
+    )
+    result = Mock()
+    result.scalars.return_value.all.return_value = [existing]
+    mock_db.execute.return_value = result
+
+    _, applied = asyncio.run(
+        _apply_capture(
+            db=mock_db,
+            user_id="usr_abc",
+            chat_id="12345",
+            source="telegram",
+            message="Call dentist, buy stamps, and buy stamps again.",
+            extraction={
+                "tasks": [
+                    {"title": "Call dentist", "priority": 1},
+                    {"title": "Buy stamps"},
+                    {"title": "Buy stamps", "notes": "Forever stamps"},
+                ],
+                "goals": [],
+                "problems": [],
+                "links": [],
+                "reminders": [],
+            },
+            request_id="req_batch_lookup",
+            commit=False,
+            enqueue_summary=False,
+        )
+    )
+
+    work_item_selects = [
+        call for call in mock_db.execute.await_args_list if "FROM work_items" in str(call.args[0])
+    ]
+    assert len(work_item_selects) == 1
+    assert existing.priority == 1
+    assert applied.tasks_created == 1
+    assert applied.tasks_updated == 2
+    created = [call.args[0] for call in mock_db.add.call_args_list if call.args and isinstance(call.args[0], WorkItem)]
+    assert [item.notes for item in created] == ["Forever stamps"]
+
+
 def test_apply_capture_updates_targeted_reminder(mock_db):
     existing = Reminder(
         id="rem_payroll",
@@ -3376,7 +3709,7 @@ def test_apply_capture_updates_targeted_reminder(mock_db):
         message="Old reminder",
     )
     result = Mock()
-    result.scalar_one_or_none.return_value = existing
+    result.scalars.return_value.all.return_value = [existing]
     mock_db.execute.return_value = result
 
     _, applied = asyncio.run(
@@ -3529,7 +3862,7 @@ def test_apply_capture_promotes_existing_task_to_project(mock_db):
         status=WorkItemStatus.open,
     )
     result = Mock()
-    result.scalar_one_or_none.return_value = existing
+    result.scalars.return_value.all.return_value = [existing]
     mock_db.execute.return_value = result
 
     _, applied = asyncio.run(
@@ -4330,8 +4663,20 @@ def test_remember_recent_reminders_records_reminder_context(mock_db):
             ttl_hours=12,
         )
     )
-    added = [call.args[0] for call in mock_db.add.call_args_list if call.args]
-    context_items = [item for item in added if isinstance(item, RecentContextItem)]
+    mock_db.add.assert_not_called()
+    context_stmt, context_items = mock_db.execute.await_args.args
+    assert context_stmt.table.name == RecentContextItem.__tablename__
     assert len(context_items) == 2
-    assert {item.entity_id for item in context_items} == {"rem_1", "rem_2"}
-    assert all(item.entity_type == EntityType.reminder for item in context_items)
+    assert {item["entity_id"] for item in context_items} == {"rem_1", "rem_2"}
+    assert all(item["entity_type"] == EntityType.reminder for item in context_items)
+
+
+def test_sanitize_extraction_returns_empty_extraction_without_running_passes():
+    extraction = {"tasks": [], "goals": [], "problems": [], "links": [], "reminders": []}
+    with patch("api.main._sanitize_targeted_reminder_actions") as reminder_pass, patch(
+        "api.main._resolve_relative_due_date_overrides"
+    ) as due_pass:
+        result = _sanitize_extraction("thanks, that's all for now", extraction, {"tasks": []})
+    assert result is extraction
+    reminder_pass.assert_not_called()
+    due_pass.assert_not_called()
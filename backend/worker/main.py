@@ -1,16 +1,16 @@
 import asyncio
 import logging
-import json
-import uuid
 import time
 from datetime import datetime, timedelta, date, timezone
 
+import orjson
 import redis.asyncio as redis
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy import select, delete, update
 
 from common.config import settings
+from common.database import create_app_engine
+from common.ids import new_uuid, short_id
 from common.models import (
     Base, MemorySummary, EventLog, InboxItem, PromptRun,
     ActionDraft, Reminder, ReminderStatus, TelegramUserMap, WorkItem,
@@ -30,8 +30,8 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 # DB Setup
-engine = create_async_engine(settings.DATABASE_URL)
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+engine = create_app_engine()
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 # Redis Setup
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -39,6 +39,8 @@ redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 DEFAULT_QUEUE = "default_queue"
 DLQ = "dead_letter_queue"
 MAX_ATTEMPTS = 5
+# Nothing enqueues memory.compact on a schedule, so the loop sweeps lapsed drafts itself.
+DRAFT_SWEEP_INTERVAL_SECONDS = 600
 
 from common.planner import collect_planning_state, build_plan_payload, render_fallback_plan_explanation
 
@@ -64,7 +66,7 @@ async def _emit_worker_event(
     try:
         async with AsyncSessionLocal() as db:
             db.add(EventLog(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 request_id=f"job_{job_id}",
                 user_id=user_id,
                 event_type=event_type,
@@ -122,7 +124,7 @@ async def process_job(job_data: dict):
                 extra={"delay_seconds": wait_time, "error": str(e)},
             )
             await asyncio.sleep(wait_time)
-            await redis_client.rpush(DEFAULT_QUEUE, json.dumps(job_data))
+            await redis_client.rpush(DEFAULT_QUEUE, orjson.dumps(job_data))
         else:
             logger.error(f"Job exceeded max attempts, moving to DLQ: {job_id}")
             await _emit_worker_event(
@@ -135,7 +137,7 @@ async def process_job(job_data: dict):
                 user_id=user_id,
                 extra={"error": str(e)},
             )
-            await redis_client.rpush(DLQ, json.dumps(job_data))
+            await redis_client.rpush(DLQ, orjson.dumps(job_data))
 
 async def handle_plan_refresh(job_id: str, payload: dict):
     user_id = payload.get("user_id")
@@ -157,7 +159,7 @@ async def handle_plan_refresh(job_id: str, payload: dict):
             latency = int((time.time() - start_time) * 1000)
             
             db.add(PromptRun(
-                id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+                id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
                 operation="plan", provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL_PLAN,
                 prompt_version=settings.PROMPT_VERSION_PLAN, latency_ms=latency, status="success",
                 created_at=utc_now()
@@ -168,13 +170,13 @@ async def handle_plan_refresh(job_id: str, payload: dict):
             
             # Requirement 4: Observability for failure
             db.add(PromptRun(
-                id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+                id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
                 operation="plan", provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL_PLAN,
                 prompt_version=settings.PROMPT_VERSION_PLAN, status="error", error_code=type(e).__name__,
                 created_at=utc_now()
             ))
             db.add(EventLog(
-                id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+                id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
                 event_type="plan_rewrite_fallback", payload_json={"error": str(e)}
             ))
             
@@ -187,7 +189,7 @@ async def handle_plan_refresh(job_id: str, payload: dict):
         except Exception as e:
             logger.error(f"Generated plan failed validation: {e}")
             db.add(EventLog(
-                id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+                id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
                 event_type="plan_rewrite_fallback", payload_json={"error": str(e), "context": "worker_refresh"}
             ))
             # Fallback: cache a minimal valid deterministic version if rewrite was the cause
@@ -202,7 +204,7 @@ async def handle_plan_refresh(job_id: str, payload: dict):
         
         # 5. Log event
         db.add(EventLog(
-            id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+            id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
             event_type="plan_refresh_completed", payload_json={"job_id": job_id}
         ))
         
@@ -238,14 +240,14 @@ async def handle_memory_summarize(job_id, payload):
         
         # Record prompt run
         db.add(PromptRun(
-            id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+            id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
             operation="summarize", provider=settings.LLM_PROVIDER, model=settings.LLM_MODEL_SUMMARIZE,
             prompt_version=settings.PROMPT_VERSION_SUMMARIZE, latency_ms=latency, status="success",
             created_at=utc_now()
         ))
         
         # 3. Write MemorySummary
-        summary_id = f"sum_{uuid.uuid4().hex[:12]}"
+        summary_id = short_id("sum")
         db.add(MemorySummary(
             id=summary_id, user_id=user_id, chat_id=chat_id,
             session_id=latest_session.id if latest_session is not None else None,
@@ -257,7 +259,7 @@ async def handle_memory_summarize(job_id, payload):
         
         # 4. Log event
         db.add(EventLog(
-            id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=user_id,
+            id=new_uuid(), request_id=f"job_{job_id}", user_id=user_id,
             event_type="memory_summary_created", entity_type="memory_summary",
             entity_id=summary_id, payload_json={"job_id": job_id, "source_count": len(source_event_ids)}
         ))
@@ -282,6 +284,26 @@ async def handle_memory_summarize(job_id, payload):
         await db.commit()
         logger.info(f"Summarization complete for user {user_id}")
 
+async def expire_lapsed_drafts(db, user_id: str | None = None) -> int:
+    now = utc_now()
+    stmt = (
+        update(ActionDraft)
+        .where(ActionDraft.status == "draft", ActionDraft.expires_at < now)
+        .values(status="expired", updated_at=now)
+    )
+    if user_id:
+        stmt = stmt.where(ActionDraft.user_id == user_id)
+    return (await db.execute(stmt)).rowcount or 0
+
+
+async def sweep_lapsed_drafts():
+    async with AsyncSessionLocal() as db:
+        expired_drafts = await expire_lapsed_drafts(db)
+        await db.commit()
+    if expired_drafts:
+        logger.info(f"Draft sweep expired {expired_drafts} lapsed draft(s)")
+
+
 async def handle_memory_compact(job_id, payload):
     target_user_id = payload.get("user_id")
     scope = "user" if target_user_id else "global"
@@ -323,10 +345,13 @@ async def handle_memory_compact(job_id, payload):
                 delete_stmt = delete(InboxItem).where(InboxItem.id.in_(delete_ids))
                 result = await db.execute(delete_stmt)
                 deleted_rows = result.rowcount
+
+        # 4. Mark drafts that lapsed without being superseded (the per-turn lookup only reads)
+        expired_drafts = await expire_lapsed_drafts(db, user_id=target_user_id)
         
-        # 4. Log stats (Always execute this, Requirement 1 & 6)
+        # 5. Log stats (Always execute this, Requirement 1 & 6)
         db.add(EventLog(
-            id=str(uuid.uuid4()), request_id=f"job_{job_id}", user_id=target_user_id or "system",
+            id=new_uuid(), request_id=f"job_{job_id}", user_id=target_user_id or "system",
             event_type="memory_compaction_completed", 
             payload_json={
                 "scope": scope,
@@ -334,12 +359,16 @@ async def handle_memory_compact(job_id, payload):
                 "eligible_old_rows": eligible_old_rows,
                 "deleted_rows": deleted_rows,
                 "skipped_referenced_rows": skipped_referenced_rows,
+                "expired_drafts": expired_drafts,
                 "cutoff": retention_cutoff.isoformat()
             }
         ))
         
         await db.commit()
-        logger.info(f"Compaction complete (scope: {scope}). Deleted: {deleted_rows}, Skipped: {skipped_referenced_rows}")
+        logger.info(
+            f"Compaction complete (scope: {scope}). Deleted: {deleted_rows}, Skipped: {skipped_referenced_rows}, "
+            f"Expired drafts: {expired_drafts}"
+        )
 
 
 async def handle_reminder_dispatch(job_id: str, payload: dict):
@@ -376,7 +405,7 @@ async def handle_reminder_dispatch(job_id: str, payload: dict):
                 skipped_no_chat += 1
                 db.add(
                     EventLog(
-                        id=str(uuid.uuid4()),
+                        id=new_uuid(),
                         request_id=f"job_{job_id}",
                         user_id=reminder.user_id,
                         event_type="reminder_dispatch_skipped_no_chat",
@@ -406,7 +435,7 @@ async def handle_reminder_dispatch(job_id: str, payload: dict):
                 dispatched += 1
                 db.add(
                     ConversationEvent(
-                        id=f"cev_{uuid.uuid4().hex[:12]}",
+                        id=short_id("cev"),
                         user_id=reminder.user_id,
                         chat_id=mapping.chat_id,
                         source=ConversationSource.telegram,
@@ -431,7 +460,7 @@ async def handle_reminder_dispatch(job_id: str, payload: dict):
                 )
                 db.add(
                     EventLog(
-                        id=str(uuid.uuid4()),
+                        id=new_uuid(),
                         request_id=f"job_{job_id}",
                         user_id=reminder.user_id,
                         event_type="reminder_dispatched",
@@ -450,7 +479,7 @@ async def handle_reminder_dispatch(job_id: str, payload: dict):
                 logger.error("Failed to dispatch reminder %s: %s", reminder.id, exc)
                 db.add(
                     EventLog(
-                        id=str(uuid.uuid4()),
+                        id=new_uuid(),
                         request_id=f"job_{job_id}",
                         user_id=reminder.user_id,
                         event_type="reminder_dispatch_failed",
@@ -462,7 +491,7 @@ async def handle_reminder_dispatch(job_id: str, payload: dict):
 
         db.add(
             EventLog(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 request_id=f"job_{job_id}",
                 user_id=target_user_id or "system",
                 event_type="reminder_dispatch_completed",
@@ -480,12 +509,16 @@ async def handle_reminder_dispatch(job_id: str, payload: dict):
 
 async def worker_loop():
     logger.info("Worker started, listening for jobs...")
+    next_draft_sweep = time.monotonic()
     while True:
         try:
+            if time.monotonic() >= next_draft_sweep:
+                next_draft_sweep = time.monotonic() + DRAFT_SWEEP_INTERVAL_SECONDS
+                await sweep_lapsed_drafts()
             result = await redis_client.blpop(DEFAULT_QUEUE, timeout=5)
             if result:
                 _, raw_data = result
-                job_data = json.loads(raw_data)
+                job_data = orjson.loads(raw_data)
                 await process_job(job_data)
         except Exception as e:
             logger.error(f"Error in worker loop: {e}")